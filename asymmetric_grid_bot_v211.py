@@ -5,30 +5,99 @@ Strategy: Asymmetric dual triggers with compounding trade sizes
 Buy at -1% | Sell at +1.5% | Trade size = 5% of portfolio (grows over time!)
 """
 
-import os
 import time
+
+# Startup is measured from here when the OS can't tell us when the process started
+_MODULE_LOADED = time.perf_counter()
+
+import argparse
+import atexit
+import json
+import os
+import queue
+import re
+import sys
+import threading
 from datetime import datetime
-from typing import Optional
-from dataclasses import dataclass
-from binance.client import Client
-from binance.exceptions import BinanceAPIException
-from rich.console import Console
-from rich.table import Table
-from rich import box
-import questionary
-from questionary import Style
-import math
+from typing import TYPE_CHECKING, Mapping, Optional
+from dataclasses import dataclass, fields
+from price_stream import PriceStream, STREAM_URL
+from exchange_filters import FilterCache, SymbolFilters
+from dashboard import BotSnapshot, Dashboard, render_status
+from state_journal import StateJournal
+from metrics import Metrics, MetricsServer
+from grid_ladder import GridLadder
+from indicators import WARMUP_KLINES, VolatilityEngine, needs_rescale
+from trade_ledger import TradeLedger
+from order_pipeline import OrderPipeline
+from reconciler import RECONCILE_INTERVAL, BalanceReconciler
+from request_scheduler import KLINES_WEIGHT, ORDER_WEIGHT, PRIORITY_ORDER, TICKER_WEIGHT, RequestScheduler, backoff_delay
+
+# Imported on first use: python-binance, questionary, rich and numpy (tick recording) are slow to load,
+# and a headless start against the simulator or a mock exchange needs none of them
+if TYPE_CHECKING:
+    from binance.client import Client
+    from rich.console import Console
+    from tick_store import TickRecorder
 
 # === Constants ===
 BOT_NAME = "Asymmetric Grid Bot"
 BOT_VERSION = "2.1.1"
 LOG_DIR = "logs"
+LOG_MAX_BYTES = 50 * 1024 * 1024    # Rotate log files at 50 MB
+LOG_BATCH_SIZE = 256                # Records per background write
+LOG_FLUSH_INTERVAL = 1.0            # Max seconds a record waits in the queue
+POLL_INTERVAL = 5           # Seconds between REST price polls
+STREAM_STALE_AFTER = 15     # Seconds without a stream update before falling back to REST
+MAX_FAILURE_BACKOFF = 60    # Cap on the jittered backoff after repeated loop/price failures
+DASHBOARD_REFRESH_PER_SECOND = 1.0  # Dashboard redraws run on their own thread at this rate
+ENV_PREFIX = "AGB_"         # Headless config: AGB_<FIELD> environment variables (e.g. AGB_SYMBOL)
+
+# Bot attributes saved to the state journal (restored on restart instead of re-buying)
+STATE_FIELDS = (
+    "crypto_balance", "usdt_balance", "initial_portfolio", "reference_price", "buy_trigger", "sell_trigger",
+    "trade_count", "cumulative_profit", "last_buy_price", "last_sell_price", "last_trade_size", "initial_trade_size",
+    "account_offsets", "offset_scale",
+)
+
+# Strategy defaults
+DEFAULT_BUY_OFFSET = 0.01       # Buy 1.0% below reference
+DEFAULT_SELL_OFFSET = 0.015     # Sell 1.5% above reference (ASYMMETRIC!)
+DEFAULT_TRADE_FRACTION = 0.05   # Trade 5% of current portfolio
 
 # Rich console
-console = Console()
+class _Console:
+    """
+    The bot's console: a rich Console created on the first print, or plain lines without
+    rich when `plain` is set (headless starts). Tables and other renderables always use rich.
+    """
+    _MARKUP = re.compile(r"\[([a-z#/@][^[]*?)]")      # rich markup tags ("[green]", "[/]"), not "[SOL]"
+
+    def __init__(self):
+        self.plain = False
+        self._rich: Optional["Console"] = None
+
+    @property
+    def rich(self) -> "Console":
+        if self._rich is None:
+            from rich.console import Console
+            self._rich = Console()
+        return self._rich
+
+    def print(self, *objects, **kwargs):
+        if self.plain and all(isinstance(o, str) for o in objects):
+            print(*(self._MARKUP.sub("", o) for o in objects), flush=True)
+        else:
+            self.rich.print(*objects, **kwargs)
 
-# Questionary style
-custom_style = Style([
+    def __getattr__(self, name):
+        return getattr(self.rich, name)
+
+
+console = _Console()
+
+# Questionary style (built by the setup wizard, so headless starts never import questionary)
+WIZARD_STYLE = [
     ('qmark', 'fg:#673ab7 bold'),
     ('question', 'bold'),
     ('answer', 'fg:#f44336 bold'),
@@ -38,24 +107,126 @@ custom_style = Style([
     ('separator', 'fg:#cc5454'),
     ('instruction', ''),
     ('text', ''),
-])
+]
 
 # === Logger ===
 class TradeLogger:
-    """Handles logging to file"""
-    def __init__(self, symbol: str, paper_trading: bool):
+    """
+    Handles logging to file
+    In background mode records are queued and written in batches by a writer thread,
+    so the trading path never waits on disk I/O. Files rotate by size and/or day.
+    """
+    _STOP = object()
+    
+    def __init__(self, symbol: str, paper_trading: bool, background: bool = True, json_lines: bool = False,
+                 max_bytes: int = LOG_MAX_BYTES, rotate_daily: bool = False,
+                 batch_size: int = LOG_BATCH_SIZE, flush_interval: float = LOG_FLUSH_INTERVAL):
         os.makedirs(LOG_DIR, exist_ok=True)
-        mode = "paper" if paper_trading else "live"
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.log_file = os.path.join(LOG_DIR, f"{symbol}_{mode}_dual_{timestamp}.log")
+        self.mode = "paper" if paper_trading else "live"
+        self.symbol = symbol
+        self.json_lines = json_lines
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.background = background
+        
+        self._file = None
+        self._file_day = None
+        self._lock = threading.Lock()
+        self._open_new_file()
+        
+        self._queue: Optional[queue.SimpleQueue] = None
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._queue = queue.SimpleQueue()
+            self._thread = threading.Thread(target=self._writer_loop, name=f"log-writer-{symbol}", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+        
         self.log_info(f"=== {BOT_NAME} v{BOT_VERSION} ===")
         self.log_info(f"Mode: {'Paper Trading' if paper_trading else 'Live Trading'}")
     
-    def _write(self, level: str, message: str):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_line = f"[{timestamp}] {level}: {message}\n"
-        with open(self.log_file, 'a') as f:
-            f.write(log_line)
+    def _open_new_file(self):
+        """Start a new log file named after the current time"""
+        if self._file is not None:
+            self._file.close()
+        extension = "jsonl" if self.json_lines else "log"
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(LOG_DIR, f"{self.symbol}_{self.mode}_dual_{timestamp}.{extension}")
+        suffix = 1
+        while os.path.exists(path):
+            path = os.path.join(LOG_DIR, f"{self.symbol}_{self.mode}_dual_{timestamp}_{suffix}.{extension}")
+            suffix += 1
+        self.log_file = path
+        self._file = open(path, 'a')
+        self._file_day = datetime.now().date()
+    
+    def _format(self, record: tuple) -> str:
+        created, level, message, fields = record
+        when = datetime.fromtimestamp(created)
+        if self.json_lines:
+            entry = {"ts": when.isoformat(timespec='milliseconds'), "level": level, "message": message}
+            if fields:
+                entry.update(fields)
+            return json.dumps(entry) + "\n"
+        return f"[{when.strftime('%Y-%m-%d %H:%M:%S')}] {level}: {message}\n"
+    
+    def _write_batch(self, records: list):
+        with self._lock:
+            if self._file is None:
+                return
+            if self.rotate_daily and datetime.now().date() != self._file_day:
+                self._open_new_file()
+            self._file.write("".join(self._format(r) for r in records))
+            self._file.flush()
+            if self.max_bytes and self._file.tell() >= self.max_bytes:
+                self._open_new_file()
+    
+    def _writer_loop(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                record = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                record = None
+            if record is self._STOP:
+                break
+            if record is not None:
+                batch.append(record)
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write_batch(batch)
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+        # Drain anything queued after the stop marker, then flush
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not self._STOP:
+                batch.append(record)
+        if batch:
+            self._write_batch(batch)
+    
+    def _write(self, level: str, message: str, fields: Optional[dict] = None):
+        record = (time.time(), level, message, fields)
+        if self._queue is not None and self._thread.is_alive():
+            self._queue.put(record)
+        else:
+            self._write_batch([record])
+    
+    def close(self):
+        """Flush pending records and close the file (safe to call more than once)"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
     
     def log_info(self, message: str):
         self._write("INFO", message)
@@ -68,7 +239,7 @@ class TradeLogger:
     
     def log_trade(self, trade_type: str, price: float, amount: float, total: float):
         msg = f"{trade_type} | Price: ${price:.2f} | Amount: {amount:.6f} | Total: ${total:.2f}"
-        self._write("TRADE", msg)
+        self._write("TRADE", msg, {"side": trade_type, "price": price, "amount": amount, "total": total})
 
 # === Configuration ===
 @dataclass
@@ -82,6 +253,123 @@ class BotConfig:
     initial_investment: float
     usdt_per_trade: float
     paper_trading: bool
+    price_feed: str = "rest"            # "rest" (poll every 5s) or "stream" (WebSocket)
+    stream_type: str = "trade"          # "trade" or "bookTicker"
+    stream_url: str = STREAM_URL
+    buy_offset: float = DEFAULT_BUY_OFFSET
+    sell_offset: float = DEFAULT_SELL_OFFSET
+    trade_fraction: float = DEFAULT_TRADE_FRACTION
+    order_mode: str = "market"          # "market" (order on trigger) or "limit" (resting LIMIT orders)
+    user_stream_url: str = STREAM_URL   # User-data stream base URL (limit mode)
+    log_format: str = "text"            # "text" or "json" (JSON lines)
+    log_rotate_daily: bool = False
+    headless: bool = False              # Skip the live dashboard entirely (trades still print)
+    state_journal: bool = True          # Journal state so a restart resumes instead of re-buying
+    resume: bool = True                 # False discards any saved state (fresh 50/50 split)
+    metrics_port: int = 0               # Serve Prometheus metrics on 127.0.0.1:<port> (0 = off)
+    exchange: str = "binance"           # "binance" or "sim" (orders go to a local simulator, even in paper mode)
+    poll_interval: float = POLL_INTERVAL  # Seconds between REST price polls
+    record_ticks: bool = False          # Append every observed price to ticks/<SYMBOL>/ for replay
+    ladder_levels: int = 1              # Grid levels per side; >1 trades every level a gap crosses in one order
+    reconcile_interval: float = RECONCILE_INTERVAL  # Live: seconds between full account checks (0 = no reconciliation)
+    cost_basis: str = "fifo"            # Trade ledger lot matching: "fifo" or "average"
+    ledger_csv: str = ""                # Write the ledger's recent trades to this CSV on shutdown ("" = off)
+    instance: str = ""                  # Names one of several bots on a symbol (own state journal), e.g. under supervisor.py
+    adaptive_offsets: bool = False      # Scale buy/sell offsets by current vs. usual volatility (indicators.py)
+    volatility_measure: str = "ewma"    # Adaptive offsets follow "ewma", "atr" or "realized" volatility
+    offset_scale_min: float = 0.5       # Adaptive offsets stay within [min, max] x buy_offset/sell_offset
+    offset_scale_max: float = 2.0
+    async_orders: bool = True           # Live market orders go out from a worker thread; prices keep flowing meanwhile
+
+_TRUE = ("1", "true", "yes", "on")
+_FALSE = ("0", "false", "no", "off")
+
+
+def _parse_field(name: str, kind: type, raw):
+    """Coerce a config-file or environment value to the BotConfig field's type"""
+    if isinstance(raw, str) and kind is bool:
+        if raw.strip().lower() in _TRUE:
+            return True
+        if raw.strip().lower() in _FALSE:
+            return False
+        raise ValueError(f"{name}: expected true/false, got '{raw}'")
+    try:
+        return kind(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name}: expected {kind.__name__}, got '{raw}'") from None
+
+
+def load_config(path: Optional[str] = None, overrides: Optional[dict] = None,
+                env: Optional[Mapping[str, str]] = None) -> BotConfig:
+    """
+    Build a BotConfig without prompts. Later sources win: a JSON config file, AGB_<FIELD>
+    environment variables, then overrides (CLI flags; None values are ignored). API keys may also
+    come from BINANCE_API_KEY / BINANCE_API_SECRET. Raises ValueError on a missing or bad value.
+    """
+    env = os.environ if env is None else env
+    types = {f.name: f.type for f in fields(BotConfig)}
+    values = {}
+    if path:
+        with open(path) as f:
+            values.update(json.load(f))
+    for name in types:
+        raw = env.get(ENV_PREFIX + name.upper())
+        if raw is not None:
+            values[name] = raw
+    values.setdefault("api_key", env.get("BINANCE_API_KEY", ""))
+    values.setdefault("api_secret", env.get("BINANCE_API_SECRET", ""))
+    values.update({name: value for name, value in (overrides or {}).items() if value is not None})
+
+    unknown = sorted(set(values) - set(types))
+    if unknown:
+        raise ValueError(f"Unknown config keys: {', '.join(unknown)}")
+    for name in ("symbol", "initial_investment"):
+        if name not in values:
+            raise ValueError(f"Missing {name} (config file, {ENV_PREFIX}{name.upper()} or --{name.split('_')[-1]})")
+    values = {name: _parse_field(name, types[name], value) for name, value in values.items()}
+
+    symbol = values["symbol"] = values["symbol"].upper()
+    quote_asset = values.setdefault("quote_asset", "USDT")
+    if "base_asset" not in values:
+        if not symbol.endswith(quote_asset) or symbol == quote_asset:
+            raise ValueError(f"Can't derive base_asset from {symbol} and quote_asset {quote_asset}")
+        values["base_asset"] = symbol[:-len(quote_asset)]
+    values.setdefault("paper_trading", True)
+    values.setdefault("usdt_per_trade",
+                      values["initial_investment"] * values.get("trade_fraction", DEFAULT_TRADE_FRACTION))
+    if values["initial_investment"] <= 0:
+        raise ValueError("initial_investment must be positive")
+    if not values["paper_trading"] and not (values["api_key"] and values["api_secret"]):
+        raise ValueError("Live trading needs api_key and api_secret (or BINANCE_API_KEY / BINANCE_API_SECRET)")
+    return BotConfig(**values)
+
+# === Exchange Client ===
+def binance_client(api_key: str = "", api_secret: str = "") -> "Client":
+    """python-binance client, imported on first use; skips the constructor's ping round trip"""
+    from binance.client import Client
+    return Client(api_key, api_secret, ping=False)
+
+
+def api_errors() -> tuple:
+    """Exception types for failed exchange calls (empty until python-binance has been imported)"""
+    exceptions = sys.modules.get("binance.exceptions")
+    return (exceptions.BinanceAPIException,) if exceptions is not None else ()
+
+
+def is_binance_client(client) -> bool:
+    return type(client).__module__.startswith("binance.")
+
+
+def process_uptime() -> float:
+    """Seconds since the process started (from /proc; elsewhere, since this module started loading)"""
+    try:
+        with open("/proc/self/stat") as f:
+            started_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(uptime - started_ticks / os.sysconf("SC_CLK_TCK"), 0.0)
+    except (OSError, ValueError, IndexError):
+        return time.perf_counter() - _MODULE_LOADED
 
 # === Banner ===
 def display_banner():
@@ -111,6 +399,8 @@ class SetupWizard:
     """Interactive setup wizard"""
     
     def run(self) -> BotConfig:
+        import questionary
+        custom_style = questionary.Style(WIZARD_STYLE)
         display_banner()
         console.print("\n[dim]Strategy: Asymmetric Grid (-1% buy / +1.5% sell) with Compounding[/dim]\n")
         
@@ -147,15 +437,31 @@ class SetupWizard:
         ).ask())
         
         # Trade size (default 5% of investment)
-        default_trade_size = int(investment * 0.05)
+        default_trade_size = int(investment * DEFAULT_TRADE_FRACTION)
         usdt_per_trade = float(questionary.text(
             "Enter USDT per trade:",
             default=str(default_trade_size),
             style=custom_style
         ).ask())
         
+        # Price feed
+        feed_choice = questionary.select(
+            "Select price feed:",
+            choices=["⚡ WebSocket Stream (real-time)", "🐢 REST Polling (every 5s)"],
+            style=custom_style
+        ).ask()
+        price_feed = "stream" if "Stream" in feed_choice else "rest"
+        
         # API credentials
+        order_mode = "market"
         if not paper_trading:
+            order_choice = questionary.select(
+                "Select order mode:",
+                choices=["⚡ Market Orders on Trigger", "📌 Resting Limit Orders (maker fees)"],
+                style=custom_style
+            ).ask()
+            order_mode = "limit" if "Limit" in order_choice else "market"
+            
             console.print("\n[yellow]⚠️ API keys required for live trading[/yellow]")
             api_key = questionary.password(
                 "Enter Binance API Key:",
@@ -177,30 +483,61 @@ class SetupWizard:
             quote_asset="USDT",
             initial_investment=investment,
             usdt_per_trade=usdt_per_trade,
-            paper_trading=paper_trading
+            paper_trading=paper_trading,
+            price_feed=price_feed,
+            order_mode=order_mode
         )
 
 # === Main Bot ===
 class DualTriggerBot:
     """Dual Trigger trading bot - monitors both buy and sell triggers simultaneously"""
     
-    def __init__(self, config: BotConfig):
+    def __init__(self, config: BotConfig, client: Optional["Client"] = None, filters: Optional[SymbolFilters] = None,
+                 metrics: Optional[Metrics] = None, clock=None, scheduler: Optional[RequestScheduler] = None):
         self.config = config
-        self.logger = TradeLogger(config.symbol, config.paper_trading)
+        # Anything with sleep()/time(): the time module, or a simulator's virtual clock
+        self.clock = clock or time
+        # Paper mode fills instantly at the polled price unless a simulator does the matching
+        self.instant_fills = config.paper_trading and config.exchange != "sim"
+        # Stage latencies, order outcomes and slippage (shared when several bots run together)
+        self.metrics = metrics or Metrics()
+        self.logger = TradeLogger(
+            config.symbol,
+            config.paper_trading,
+            json_lines=config.log_format == "json",
+            rotate_daily=config.log_rotate_daily
+        )
+        if config.instance:
+            self.logger.log_info(f"Instance: {config.instance}")
         
         # Initialize Binance client (even for paper trading, to get real prices)
-        self.client = None
-        if not config.paper_trading:
-            self.client = Client(config.api_key, config.api_secret)
-        else:
-            # For paper trading, we still need price data
-            self.client = Client("", "")  # Public endpoints don't need auth
+        # A shared client can be passed in so several bots reuse one HTTP session
+        self.client = client
+        if self.client is None:
+            if not config.paper_trading:
+                self.client = binance_client(config.api_key, config.api_secret)
+            else:
+                # For paper trading, we still need price data
+                self.client = binance_client()  # Public endpoints don't need auth
+        
+        # Weight-aware admission for REST calls (shared with the client's other bots when passed in)
+        self.scheduler = scheduler
+        if self.scheduler is None:
+            self.scheduler = RequestScheduler(clock=self.clock, metrics=self.metrics, on_log=self.logger._write)
+            self.scheduler.attach(self.client)
         
-        # Get exchange info for LOT_SIZE filters
-        self.step_size = 0.0
-        self.min_qty = 0.0
-        self.max_qty = 0.0
-        self._get_lot_size_filters()
+        # Exchange filters (LOT_SIZE, PRICE_FILTER, NOTIONAL, MARKET_LOT_SIZE), cached on disk
+        self.filters = filters or self._load_filters()
+        self.step_size = self.filters.step_size
+        self.min_qty = self.filters.min_qty
+        self.max_qty = self.filters.max_qty
+        
+        # Adaptive offsets: rolling volatility updated on every price, warmed up from recent 1m klines
+        self.volatility: Optional[VolatilityEngine] = None
+        self.offset_scale = 1.0     # Multiplier applied to both offsets by the last set_triggers()
+        if config.adaptive_offsets:
+            self.volatility = VolatilityEngine(config.volatility_measure, config.offset_scale_min, config.offset_scale_max)
+            self._warm_up_volatility()
         
         # State variables
         self.crypto_balance = 0.0
@@ -209,73 +546,175 @@ class DualTriggerBot:
         
         # Dual trigger state - BOTH triggers are active simultaneously
         self.reference_price = 0.0  # Reference price for calculating triggers
-        self.buy_trigger = 0.0      # Buy trigger (reference * 0.99)
-        self.sell_trigger = 0.0     # Sell trigger (reference * 1.015) ASYMMETRIC!
+        self.buy_trigger = 0.0      # Buy trigger (reference * (1 - buy_offset))
+        self.sell_trigger = 0.0     # Sell trigger (reference * (1 + sell_offset)) ASYMMETRIC!
+        # Optional ladder of further levels beyond the triggers (market mode)
+        self.ladder: Optional[GridLadder] = None
+        if config.ladder_levels > 1:
+            self.ladder = GridLadder(config.ladder_levels, config.buy_offset, config.sell_offset)
         
         # Statistics
         self.trade_count = 0
         self.cumulative_profit = 0.0
         self.last_buy_price = 0.0
         self.last_sell_price = 0.0
+        # Cost-basis P&L, win rate, holding time and drawdown, updated per trade (journaled with the state)
+        self.ledger = TradeLedger(config.cost_basis, clock=self.clock)
         
         # Track trade size for compounding visibility
         self.last_trade_size = 0.0
-        self.initial_trade_size = config.initial_investment * 0.05
+        self.initial_trade_size = config.initial_investment * config.trade_fraction
+        
+        # Live balances are booked per exchange trade id and checked against the account
+        self.account_offsets = {}    # asset -> account total minus our balance (funds that aren't the bot's)
+        self.reconciler: Optional[BalanceReconciler] = None
+        if not config.paper_trading and config.reconcile_interval > 0:
+            self.reconciler = BalanceReconciler(self, interval=config.reconcile_interval)
+        
+        # Exchange market orders: prepared when the triggers are set, sent without blocking the loop
+        self.orders: Optional[OrderPipeline] = None
+        if not self.instant_fills and config.order_mode == "market":
+            self.orders = OrderPipeline(self, asynchronous=config.async_orders and config.exchange != "sim")
+        
+        # Latest state for the dashboard, replaced (never mutated) by the trading loop
+        self.latest_snapshot: Optional[BotSnapshot] = None
+        self.startup_seconds: Optional[float] = None   # Process start to the first price check
+        
+        # Optional tick recorder (every polled or streamed price)
+        self.recorder: Optional["TickRecorder"] = None
+        if config.record_ticks:
+            from tick_store import TickRecorder
+            self.recorder = TickRecorder(config.symbol)
+        
+        # Crash-safe state journal; a restored bot skips the initial split
+        self.journal: Optional[StateJournal] = None
+        self._journal_lock = threading.Lock()     # The reconciler thread journals corrections too
+        self.resumed = False
+        if config.state_journal:
+            mode = "paper" if config.paper_trading else "live"
+            name = f"{config.symbol}_{mode}_{config.instance}" if config.instance else f"{config.symbol}_{mode}"
+            self.journal = StateJournal(name, on_log=self.logger._write)
+            if not config.resume:
+                self.journal.clear()
+            self.resumed = self._restore_state()
+            if self.resumed and self.orders is not None:
+                self.orders.arm()
         
         self.logger.log_info(f"Bot initialized | Investment: ${config.initial_investment:,.2f}")
     
-    def _get_lot_size_filters(self):
-        """Get LOT_SIZE filter from exchange info"""
+    def _restore_state(self) -> bool:
+        """Load the last journaled state, if any"""
+        state = self.journal.load()
+        if state is None:
+            return False
+        for name in STATE_FIELDS:
+            if name in state:
+                setattr(self, name, state[name])
+        if "ledger" in state:
+            self.ledger.load(state["ledger"])
+        else:
+            # Saved before the ledger existed: treat the holdings as bought at the last reference price
+            self.ledger.seed(self.crypto_balance, self.reference_price)
+        if self.initial_portfolio != self.config.initial_investment:
+            self.logger.log_warning(f"Saved state was started with ${self.initial_portfolio:,.2f}, not ${self.config.initial_investment:,.2f}; keeping saved balances")
+        return True
+    
+    def save_state(self, event: str):
+        """Journal the current state after a transition (no-op when journaling is off)"""
+        if self.journal is not None:
+            with self._journal_lock:
+                state = {name: getattr(self, name) for name in STATE_FIELDS}
+                # The journal diffs against the last state it was given, so nothing in it may change afterwards
+                state["account_offsets"] = dict(self.account_offsets)
+                state["ledger"] = self.ledger.to_dict()
+                self.journal.append(event, state)
+    
+    def _warm_up_volatility(self):
+        """Seed the volatility engine from recent 1m klines so the first triggers are already scaled"""
+        try:
+            klines = self.scheduler.call(self.client.get_klines, weight=KLINES_WEIGHT,
+                                         symbol=self.config.symbol, interval="1m", limit=WARMUP_KLINES)
+        except Exception as e:
+            self.logger.log_warning(f"Kline warm-up failed, volatility starts cold: {e}")
+            return
+        bars = self.volatility.warm_up(klines, now_ms=int(self.clock.time() * 1000))
+        self.logger.log_info(f"Volatility warmed up from {bars} 1m klines | {self.config.volatility_measure} "
+                             f"{self.volatility.value() * 100:.4f}%/bar | offset scale {self.volatility.scale():.2f}")
+    
+    def _load_filters(self) -> SymbolFilters:
+        """Get exchange filters for this symbol (disk cache first, then a symbol-scoped request)"""
         try:
-            exchange_info = self.client.get_exchange_info()
-            for symbol_info in exchange_info['symbols']:
-                if symbol_info['symbol'] == self.config.symbol:
-                    for filter_item in symbol_info['filters']:
-                        if filter_item['filterType'] == 'LOT_SIZE':
-                            self.step_size = float(filter_item['stepSize'])
-                            self.min_qty = float(filter_item['minQty'])
-                            self.max_qty = float(filter_item['maxQty'])
-                            self.logger.log_info(f"LOT_SIZE: min={self.min_qty}, max={self.max_qty}, step={self.step_size}")
-                            return
+            filters = FilterCache(self.client).get([self.config.symbol])[self.config.symbol]
+            self.logger.log_info(
+                f"LOT_SIZE: min={filters.min_qty}, max={filters.max_qty}, step={filters.step_size} | "
+                f"PRICE_FILTER: tick={filters.tick_size} | MIN_NOTIONAL: {filters.min_notional}"
+            )
+            return filters
         except Exception as e:
             # Set defaults for common pairs
             if 'BTC' in self.config.symbol:
-                self.step_size = 0.00001
-                self.min_qty = 0.00001
+                step_size = 0.00001
             elif 'SOL' in self.config.symbol:
-                self.step_size = 0.01
-                self.min_qty = 0.01
+                step_size = 0.01
             else:  # ETH and most others
-                self.step_size = 0.0001
-                self.min_qty = 0.0001
-            self.max_qty = 9000.0
-            self.logger.log_warning(f"Could not get LOT_SIZE filters, using defaults: {e}")
+                step_size = 0.0001
+            self.logger.log_warning(f"Could not get exchange filters, using defaults: {e}")
+            return SymbolFilters(self.config.symbol, step_size=step_size, min_qty=step_size, max_qty=9000.0)
     
     def _round_quantity(self, quantity: float) -> float:
-        """Round quantity to match exchange step size"""
-        import math
-        precision = int(round(-math.log(self.step_size, 10), 0))
-        return round(quantity, precision)
+        """Round a market order quantity down to the exchange step size (precision is precomputed)"""
+        return self.filters.round_quantity(quantity, market=True)
+    
+    def _commissions(self, order: dict) -> tuple:
+        """Fees an order's fills charged in (base, quote); fees in other assets (BNB) don't touch our balances"""
+        base_fee = quote_fee = 0.0
+        for fill in order.get('fills', []):
+            asset = fill.get('commissionAsset')
+            if asset == self.config.base_asset:
+                base_fee += float(fill['commission'])
+            elif asset == self.config.quote_asset:
+                quote_fee += float(fill['commission'])
+        return base_fee, quote_fee
     
     def get_current_price(self) -> float:
         """Get current market price"""
+        started = time.perf_counter_ns()
         try:
-            ticker = self.client.get_symbol_ticker(symbol=self.config.symbol)
-            return float(ticker['price'])
+            ticker = self.scheduler.call(self.client.get_symbol_ticker, weight=TICKER_WEIGHT, symbol=self.config.symbol)
+            price = float(ticker['price'])
+            if self.recorder is not None:
+                self.recorder.append(int(self.clock.time() * 1000), price)
+            return price
         except Exception as e:
+            self.metrics.inc("price_fetch_errors_total")
             self.logger.log_error(f"Price fetch error: {e}")
             return 0.0
+        finally:
+            self.metrics.observe_ns("price_fetch", time.perf_counter_ns() - started)
     
     def set_triggers(self, reference_price: float):
-        """Set ASYMMETRIC triggers based on reference price"""
+        """Set ASYMMETRIC triggers based on reference price (offsets scaled by volatility when adaptive)"""
         self.reference_price = reference_price
-        self.buy_trigger = reference_price * 0.99   # -1.0%
-        self.sell_trigger = reference_price * 1.015  # +1.5% (ASYMMETRIC!)
-        self.logger.log_info(f"Triggers set | Ref: ${reference_price:.2f} | Buy: ${self.buy_trigger:.2f} (-1%) | Sell: ${self.sell_trigger:.2f} (+1.5%)")
+        buy_offset, sell_offset = self.config.buy_offset, self.config.sell_offset
+        if self.volatility is not None:
+            self.offset_scale = self.volatility.scale()
+            buy_offset *= self.offset_scale
+            sell_offset *= self.offset_scale
+            if self.ladder is not None:
+                self.ladder.set_offsets(buy_offset, sell_offset)
+        self.buy_trigger = reference_price * (1 - buy_offset)    # -1.0% by default
+        self.sell_trigger = reference_price * (1 + sell_offset)  # +1.5% by default (ASYMMETRIC!)
+        if self.ladder is not None:
+            self.ladder.recenter(reference_price)
+        if self.orders is not None:
+            self.orders.arm()
+        scaled = f" | Scale: {self.offset_scale:.2f}x" if self.volatility is not None else ""
+        self.logger.log_info(f"Triggers set | Ref: ${reference_price:.2f} | Buy: ${self.buy_trigger:.2f} (-{buy_offset * 100:.3g}%) | Sell: ${self.sell_trigger:.2f} (+{sell_offset * 100:.3g}%){scaled}")
     
-    def execute_initial_buy(self):
-        """Execute initial 50/50 split"""
-        current_price = self.get_current_price()
+    def execute_initial_buy(self, current_price: Optional[float] = None):
+        """Execute initial 50/50 split (at current_price if already known)"""
+        if current_price is None:
+            current_price = self.get_current_price()
         if current_price <= 0:
             console.print("[red]Cannot get price. Exiting.[/red]")
             exit(1)
@@ -286,303 +725,538 @@ class DualTriggerBot:
         
         console.print(f"\n[yellow]Executing initial 50/50 split at ${current_price:,.2f}[/yellow]")
         
-        if self.config.paper_trading:
+        if self.instant_fills:
             # Paper trading
             self.crypto_balance = crypto_amount
             self.usdt_balance = half_investment
+            self.ledger.buy(crypto_amount, current_price, half_investment, equity=self.config.initial_investment)
             self.logger.log_trade("INITIAL_BUY", current_price, crypto_amount, half_investment)
         else:
             # Live trading
             try:
-                order = self.client.order_market_buy(
+                order = self.scheduler.call(
+                    self.client.order_market_buy,
+                    priority=PRIORITY_ORDER, weight=ORDER_WEIGHT,
                     symbol=self.config.symbol,
                     quoteOrderQty=half_investment
                 )
                 actual_qty = float(order['executedQty'])
                 actual_total = sum(float(fill['price']) * float(fill['qty']) for fill in order['fills'])
+                base_fee, quote_fee = self._commissions(order)
                 
-                self.crypto_balance = actual_qty
-                self.usdt_balance = self.config.initial_investment - actual_total
+                self.crypto_balance = actual_qty - base_fee
+                self.usdt_balance = self.config.initial_investment - actual_total - quote_fee
+                self.ledger.buy(self.crypto_balance, actual_total / actual_qty, actual_total + quote_fee,
+                                quote_fee + base_fee * current_price, equity=self.calculate_portfolio_value(current_price))
                 self.logger.log_trade("INITIAL_BUY", current_price, actual_qty, actual_total)
-            except BinanceAPIException as e:
+            except api_errors() as e:
                 self.logger.log_error(f"Initial buy failed: {e}")
                 console.print(f"[red]Initial buy failed: {e}[/red]")
                 exit(1)
         
         # Set both triggers based on current price
         self.set_triggers(current_price)
+        self.save_state("INITIAL_BUY")
         
         console.print(f"[green]✓ Initial split complete[/green]")
         console.print(f"[cyan]{self.config.base_asset}:[/cyan] {self.crypto_balance:.6f}")
         console.print(f"[cyan]USDT:[/cyan] ${self.usdt_balance:,.2f}")
     
-    def execute_buy(self, current_price: float):
-        """Execute a buy order with COMPOUNDING trade size"""
+    def execute_buy(self, current_price: float, levels: int = 1):
+        """Execute a buy order with COMPOUNDING trade size (one trade size per ladder level crossed)"""
+        if self.orders is not None:
+            # Exchange order: sized and validated when the triggers were set
+            self.orders.fire("BUY", current_price, levels)
+            return
         trade_size = self.get_trade_size(current_price)  # DYNAMIC, not fixed!
+        if levels > 1:
+            trade_size *= levels
+            self.logger.log_info(f"Ladder: {levels} buy levels crossed, one order of ${trade_size:.2f}")
         crypto_amount = trade_size / current_price
         crypto_amount = self._round_quantity(crypto_amount)
         
-        # Check minimum quantity
-        if crypto_amount < self.min_qty:
-            self.logger.log_warning(f"Buy amount {crypto_amount} below minimum {self.min_qty}")
+        # Check LOT_SIZE / MARKET_LOT_SIZE / NOTIONAL filters
+        rejection = self.filters.check_order(crypto_amount, current_price)
+        if rejection:
+            self.metrics.inc("orders_skipped_total", side="BUY", reason="filter")
+            self.logger.log_warning(f"Buy skipped: {rejection}")
             return
         
-        if self.config.paper_trading:
-            # Paper trading
-            if self.usdt_balance >= trade_size:
-                self.crypto_balance += crypto_amount
-                self.usdt_balance -= trade_size
-                self.trade_count += 1
-                self.last_buy_price = current_price
-                self.logger.log_trade("BUY", current_price, crypto_amount, trade_size)
-                
-                # Update triggers based on new execution price
-                self.set_triggers(current_price)
-                
-                console.print(f"[green]✓ BUY[/green] {crypto_amount:.6f} {self.config.base_asset} @ ${current_price:,.2f} | Size: ${trade_size:.2f}")
-            else:
-                self.logger.log_warning(f"Insufficient USDT for buy (need ${trade_size:.2f})")
+        # Paper trading
+        if self.usdt_balance >= trade_size:
+            self.crypto_balance += crypto_amount
+            self.usdt_balance -= trade_size
+            self.trade_count += 1
+            self.last_buy_price = current_price
+            self.ledger.buy(crypto_amount, current_price, trade_size, equity=self.calculate_portfolio_value(current_price))
+            self.metrics.inc("orders_total", side="BUY")
+            self.logger.log_trade("BUY", current_price, crypto_amount, trade_size)
+            
+            # Update triggers based on new execution price
+            self.set_triggers(current_price)
+            self.save_state("BUY")
+            
+            console.print(f"[green]✓ BUY[/green] {crypto_amount:.6f} {self.config.base_asset} @ ${current_price:,.2f} | Size: ${trade_size:.2f}")
         else:
-            # Live trading
-            try:
-                order = self.client.order_market_buy(
-                    symbol=self.config.symbol,
-                    quantity=f"{crypto_amount:.8f}"
-                )
-                actual_qty = float(order['executedQty'])
-                actual_price = float(order['fills'][0]['price'])
-                actual_total = sum(float(fill['price']) * float(fill['qty']) for fill in order['fills'])
-                
-                self.crypto_balance += actual_qty
-                self.usdt_balance -= actual_total
-                self.trade_count += 1
-                self.last_buy_price = actual_price
-                self.logger.log_trade("BUY", actual_price, actual_qty, actual_total)
-                
-                # Update triggers based on new execution price
-                self.set_triggers(actual_price)
-                
-                console.print(f"[green]✓ BUY[/green] {actual_qty:.6f} {self.config.base_asset} @ ${actual_price:,.2f} | Size: ${actual_total:.2f}")
-            except BinanceAPIException as e:
-                self.logger.log_error(f"Buy order failed: {e}")
+            self.metrics.inc("orders_skipped_total", side="BUY", reason="balance")
+            self.logger.log_warning(f"Insufficient USDT for buy (need ${trade_size:.2f})")
     
-    def execute_sell(self, current_price: float):
-        """Execute a sell order with COMPOUNDING trade size"""
+    def execute_sell(self, current_price: float, levels: int = 1):
+        """Execute a sell order with COMPOUNDING trade size (one trade size per ladder level crossed)"""
+        if self.orders is not None:
+            # Exchange order: sized and validated when the triggers were set
+            self.orders.fire("SELL", current_price, levels)
+            return
         trade_size = self.get_trade_size(current_price)  # DYNAMIC, not fixed!
+        if levels > 1:
+            trade_size *= levels
+            self.logger.log_info(f"Ladder: {levels} sell levels crossed, one order of ${trade_size:.2f}")
         crypto_to_sell = trade_size / current_price
         crypto_to_sell = self._round_quantity(crypto_to_sell)
         
-        # Check minimum quantity
-        if crypto_to_sell < self.min_qty:
-            self.logger.log_warning(f"Sell amount {crypto_to_sell} below minimum {self.min_qty}")
+        # Check LOT_SIZE / MARKET_LOT_SIZE / NOTIONAL filters
+        rejection = self.filters.check_order(crypto_to_sell, current_price)
+        if rejection:
+            self.metrics.inc("orders_skipped_total", side="SELL", reason="filter")
+            self.logger.log_warning(f"Sell skipped: {rejection}")
             return
         
-        if self.config.paper_trading:
-            # Paper trading
-            if self.crypto_balance >= crypto_to_sell:
-                usdt_received = crypto_to_sell * current_price
-                
-                # Calculate profit (comparing to trade size)
-                profit = usdt_received - trade_size
-                
-                self.crypto_balance -= crypto_to_sell
-                self.usdt_balance += usdt_received
-                self.cumulative_profit += profit
-                self.trade_count += 1
-                self.last_sell_price = current_price
-                self.logger.log_trade("SELL", current_price, crypto_to_sell, usdt_received)
-                
-                # Update triggers based on new execution price
-                self.set_triggers(current_price)
-                
-                profit_color = "green" if profit >= 0 else "red"
-                console.print(f"[cyan]✓ SELL[/cyan] {crypto_to_sell:.6f} {self.config.base_asset} @ ${current_price:,.2f} | Size: ${trade_size:.2f} | Profit: [{profit_color}]${profit:+.2f}[/{profit_color}]")
-            else:
-                self.logger.log_warning(f"Insufficient {self.config.base_asset} for sell (need {crypto_to_sell:.6f})")
+        # Paper trading
+        if self.crypto_balance >= crypto_to_sell:
+            usdt_received = crypto_to_sell * current_price
+            
+            # Calculate profit (comparing to trade size)
+            profit = usdt_received - trade_size
+            
+            self.crypto_balance -= crypto_to_sell
+            self.usdt_balance += usdt_received
+            self.cumulative_profit += profit
+            self.trade_count += 1
+            self.last_sell_price = current_price
+            entry = self.ledger.sell(crypto_to_sell, current_price, usdt_received,
+                                     equity=self.calculate_portfolio_value(current_price))
+            self.metrics.inc("orders_total", side="SELL")
+            self.logger.log_trade("SELL", current_price, crypto_to_sell, usdt_received)
+            
+            # Update triggers based on new execution price
+            self.set_triggers(current_price)
+            self.save_state("SELL")
+            
+            profit_color = "green" if entry.realized_pnl >= 0 else "red"
+            console.print(f"[cyan]✓ SELL[/cyan] {crypto_to_sell:.6f} {self.config.base_asset} @ ${current_price:,.2f} | Size: ${trade_size:.2f} | P&L: [{profit_color}]${entry.realized_pnl:+.2f}[/{profit_color}]")
         else:
-            # Live trading
-            try:
-                order = self.client.order_market_sell(
-                    symbol=self.config.symbol,
-                    quantity=f"{crypto_to_sell:.8f}"
-                )
-                actual_qty = float(order['executedQty'])
-                actual_price = float(order['fills'][0]['price'])
-                actual_total = sum(float(fill['price']) * float(fill['qty']) for fill in order['fills'])
-                profit = actual_total - trade_size
-                
-                self.crypto_balance -= actual_qty
-                self.usdt_balance += actual_total
-                self.cumulative_profit += profit
-                self.trade_count += 1
-                self.last_sell_price = actual_price
-                self.logger.log_trade("SELL", actual_price, actual_qty, actual_total)
-                
-                # Update triggers based on new execution price
-                self.set_triggers(actual_price)
-                
-                profit_color = "green" if profit >= 0 else "red"
-                console.print(f"[cyan]✓ SELL[/cyan] {actual_qty:.6f} {self.config.base_asset} @ ${actual_price:,.2f} | Size: ${actual_total:.2f} | Profit: [{profit_color}]${profit:+.2f}[/{profit_color}]")
-            except BinanceAPIException as e:
-                self.logger.log_error(f"Sell order failed: {e}")
+            self.metrics.inc("orders_skipped_total", side="SELL", reason="balance")
+            self.logger.log_warning(f"Insufficient {self.config.base_asset} for sell (need {crypto_to_sell:.6f})")
+    
+    def book_market_order(self, side: str, order: dict, trigger_price: float, trade_size: float, recovered: bool = False):
+        """Book a filled exchange market order and re-set the triggers around it (trading thread)"""
+        fills = order.get('fills') or []
+        actual_qty = float(order['executedQty'])
+        if fills:
+            actual_price = float(fills[0]['price'])
+            actual_total = sum(float(fill['price']) * float(fill['qty']) for fill in fills)
+        else:
+            # Looked up after a retry: only totals, the fills arrive over the user-data stream
+            actual_total = float(order['cummulativeQuoteQty'])
+            actual_price = actual_total / actual_qty
+        self.metrics.inc("orders_total", side=side)
+        # Slippage of the average fill vs. the price that fired the trigger
+        self.metrics.observe_slippage(side, trigger_price, actual_total / actual_qty)
+        base_fee, quote_fee = self._commissions(order)
+        
+        if self.reconciler is not None:
+            # Booked per trade id; a looked-up order is booked from its stream events instead
+            if not recovered:
+                self.reconciler.book_order(side, order)
+        elif side == "BUY":
+            self.crypto_balance += actual_qty - base_fee
+            self.usdt_balance -= actual_total + quote_fee
+        else:
+            self.crypto_balance -= actual_qty + base_fee
+            self.usdt_balance += actual_total - quote_fee
+        if recovered:
+            self.logger.log_warning(f"{side} {order.get('clientOrderId')} recovered by lookup; fees not in the response")
+        self.trade_count += 1
+        fee = quote_fee + base_fee * actual_price
+        equity = self.calculate_portfolio_value(actual_price)
+        if side == "BUY":
+            self.last_buy_price = actual_price
+            self.ledger.buy(actual_qty - base_fee, actual_total / actual_qty, actual_total + quote_fee, fee, equity=equity)
+        else:
+            self.cumulative_profit += actual_total - quote_fee - trade_size
+            self.last_sell_price = actual_price
+            entry = self.ledger.sell(actual_qty + base_fee, actual_total / actual_qty, actual_total - quote_fee, fee, equity=equity)
+        self.logger.log_trade(side, actual_price, actual_qty, actual_total)
+        
+        # Update triggers based on new execution price
+        self.set_triggers(actual_price)
+        self.save_state(side)
+        
+        if side == "BUY":
+            console.print(f"[green]✓ BUY[/green] {actual_qty:.6f} {self.config.base_asset} @ ${actual_price:,.2f} | Size: ${actual_total:.2f}")
+        else:
+            profit_color = "green" if entry.realized_pnl >= 0 else "red"
+            console.print(f"[cyan]✓ SELL[/cyan] {actual_qty:.6f} {self.config.base_asset} @ ${actual_price:,.2f} | Size: ${actual_total:.2f} | P&L: [{profit_color}]${entry.realized_pnl:+.2f}[/{profit_color}]")
     
     def check_triggers(self, current_price: float):
         """Check BOTH buy and sell triggers simultaneously"""
+        started = time.perf_counter_ns()
+        volatility = self.volatility
+        if volatility is not None and volatility.update(int(self.clock.time() * 1000), current_price):
+            # A bar closed: re-place the triggers around the same reference if volatility moved enough
+            if needs_rescale(self.offset_scale, volatility.scale()):
+                self.set_triggers(self.reference_price)
+        orders = self.orders
+        if orders is not None and orders.in_flight is not None and orders.poll():
+            # An order is out: keep consuming prices, but fire nothing until it is booked
+            self.metrics.observe_ns("check_triggers", time.perf_counter_ns() - started)
+            return
         # Check sell trigger
         if current_price >= self.sell_trigger:
             # Verify we have enough crypto to sell
-            trade_size = self.get_trade_size(current_price)
+            trade_size = self.get_trade_size(current_price, record=False)
             crypto_needed = trade_size / current_price
             if self.crypto_balance >= crypto_needed:
-                self.execute_sell(current_price)
+                levels = 1
+                if self.ladder is not None:
+                    # Every level the price gapped through, as far as the balance covers
+                    levels = min(self.ladder.sells_crossed(current_price), int(self.crypto_balance // crypto_needed))
+                self.execute_sell(current_price, levels)
         
         # Check buy trigger
         if current_price <= self.buy_trigger:
             # Verify we have enough USDT to buy
-            trade_size = self.get_trade_size(current_price)
+            trade_size = self.get_trade_size(current_price, record=False)
             if self.usdt_balance >= trade_size:
-                self.execute_buy(current_price)
+                levels = 1
+                if self.ladder is not None:
+                    levels = min(self.ladder.buys_crossed(current_price), int(self.usdt_balance // trade_size))
+                self.execute_buy(current_price, levels)
+        self.metrics.observe_ns("check_triggers", time.perf_counter_ns() - started)
     
     def calculate_portfolio_value(self, current_price: float) -> float:
         """Calculate total portfolio value in USDT"""
         return self.usdt_balance + (self.crypto_balance * current_price)
     
-    def get_trade_size(self, current_price: float) -> float:
+    def get_trade_size(self, current_price: float, record: bool = True) -> float:
         """
         Calculate DYNAMIC trade size for COMPOUNDING
-        Trade size = 5% of CURRENT portfolio (not fixed!)
+        Trade size = trade_fraction (5% by default) of CURRENT portfolio (not fixed!)
         This enables exponential growth over time
+        Only sizes used for an order are logged and tracked (record=False for checks)
         """
         portfolio_value = self.calculate_portfolio_value(current_price)
-        trade_size = portfolio_value * 0.05
+        trade_size = portfolio_value * self.config.trade_fraction
         
-        # Log growth if we have a previous trade size
+        if record:
+            self.record_trade_size(trade_size, portfolio_value)
+        return trade_size
+    
+    def record_trade_size(self, trade_size: float, portfolio_value: float):
+        """Log the size an order uses and its growth since the last one"""
         if self.last_trade_size > 0:
             growth = ((trade_size / self.last_trade_size) - 1) * 100
             growth_vs_initial = ((trade_size / self.initial_trade_size) - 1) * 100
             self.logger.log_info(f"Trade size: ${trade_size:.2f} ({growth:+.2f}% from last, {growth_vs_initial:+.2f}% from initial)")
         else:
-            self.logger.log_info(f"Trade size: ${trade_size:.2f} (5% of ${portfolio_value:.2f} portfolio)")
+            self.logger.log_info(f"Trade size: ${trade_size:.2f} ({self.config.trade_fraction * 100:g}% of ${portfolio_value:.2f} portfolio)")
         
         self.last_trade_size = trade_size
-        return trade_size
     
-    def display_status(self, current_price: float):
-        """Display current bot status"""
-        console.clear()
+    def snapshot(self, current_price: float) -> BotSnapshot:
+        """Capture the current state for display (no logging, no state changes)"""
         portfolio = self.calculate_portfolio_value(current_price)
-        current_trade_size = self.get_trade_size(current_price)
-        
-        table = Table(title=f"📊 {BOT_NAME} v{BOT_VERSION} - Status", box=box.ROUNDED, border_style="cyan")
-        table.add_column("Metric", style="cyan")
-        table.add_column("Value", style="green")
-        
-        mode = "🧪 PAPER" if self.config.paper_trading else "🔴 LIVE"
-        
-        table.add_row("Symbol", self.config.symbol)
-        table.add_row("Mode", mode)
-        table.add_row("Current Price", f"${current_price:,.2f}")
-        table.add_row("", "")
-        
-        # Show BOTH triggers (ASYMMETRIC)
-        buy_distance_pct = ((current_price - self.buy_trigger) / self.buy_trigger) * 100
-        sell_distance_pct = ((self.sell_trigger - current_price) / current_price) * 100
-        
-        table.add_row("Reference Price", f"${self.reference_price:,.2f}")
-        table.add_row("", "")
-        table.add_row("🟢 BUY Trigger (-1.0%)", f"${self.buy_trigger:,.2f} ({buy_distance_pct:+.2f}% away)")
-        table.add_row("🔴 SELL Trigger (+1.5%)", f"${self.sell_trigger:,.2f} ({sell_distance_pct:+.2f}% away)")
-        
-        table.add_row("", "")
-        table.add_row(f"{self.config.base_asset} Balance", f"{self.crypto_balance:.6f}")
-        table.add_row("USDT Balance", f"${self.usdt_balance:,.2f}")
-        table.add_row("Portfolio Value", f"${portfolio:,.2f}")
-        table.add_row("", "")
-        
-        # P&L
-        realized_pnl = self.cumulative_profit
-        realized_color = "green" if realized_pnl >= 0 else "red"
-        unrealized_pnl = portfolio - self.initial_portfolio
-        unrealized_color = "green" if unrealized_pnl >= 0 else "red"
-        
-        table.add_row("Realized P&L", f"[{realized_color}]${realized_pnl:+,.2f}[/{realized_color}]")
-        table.add_row("Unrealized P&L", f"[{unrealized_color}]${unrealized_pnl:+,.2f}[/{unrealized_color}]")
-        table.add_row("", "")
-        
-        # Compounding trade size info
-        if self.last_trade_size > 0:
-            growth_pct = ((current_trade_size / self.initial_trade_size) - 1) * 100
-            growth_color = "green" if growth_pct >= 0 else "red"
-            table.add_row("Current Trade Size", f"${current_trade_size:.2f}")
-            table.add_row("Trade Size Growth", f"[{growth_color}]{growth_pct:+.1f}%[/{growth_color}] from initial")
-        else:
-            table.add_row("Current Trade Size", f"${current_trade_size:.2f}")
-        
-        table.add_row("Total Trades", str(self.trade_count))
-        
-        console.print(table)
-        console.print(f"\n[dim]Strategy: ASYMMETRIC GRID (-1% buy / +1.5% sell) with COMPOUNDING (5% of portfolio)[/dim]")
-        console.print("[dim]Press Ctrl+C to stop[/dim]")
+        return BotSnapshot(
+            symbol=self.config.symbol,
+            base_asset=self.config.base_asset,
+            paper_trading=self.config.paper_trading,
+            current_price=current_price,
+            reference_price=self.reference_price,
+            buy_trigger=self.buy_trigger,
+            sell_trigger=self.sell_trigger,
+            buy_offset=self.config.buy_offset * self.offset_scale,
+            sell_offset=self.config.sell_offset * self.offset_scale,
+            trade_fraction=self.config.trade_fraction,
+            crypto_balance=self.crypto_balance,
+            usdt_balance=self.usdt_balance,
+            portfolio_value=portfolio,
+            initial_portfolio=self.initial_portfolio,
+            realized_pnl=self.ledger.realized_pnl,
+            trade_size=portfolio * self.config.trade_fraction,
+            initial_trade_size=self.initial_trade_size,
+            last_trade_size=self.last_trade_size,
+            trade_count=self.trade_count,
+            cost_basis=self.ledger.average_cost,
+            open_pnl=self.ledger.unrealized_pnl(current_price),
+            win_rate=self.ledger.win_rate,
+            closed_trades=self.ledger.sells,
+            average_holding=self.ledger.average_holding,
+            max_drawdown=self.ledger.max_drawdown,
+            fees=self.ledger.fees
+        )
     
-    def run(self):
-        """Main bot loop"""
-        self.logger.log_info("Starting asymmetric grid bot with compounding...")
-        
-        # Execute initial 50/50 split
-        self.execute_initial_buy()
-        
-        console.print("\n[green]✓ Bot is now running in ASYMMETRIC GRID mode with COMPOUNDING![/green]")
-        console.print("[dim]Press Ctrl+C to stop[/dim]\n")
-        
+    def publish_snapshot(self, current_price: float):
+        """Hand the latest state to the dashboard (a single reference swap, never blocks)"""
+        snapshot = self.snapshot(current_price)
+        # Drawdown between trades too, not only at fill prices
+        self.ledger.mark(snapshot.portfolio_value)
+        self.latest_snapshot = snapshot
+        if self.startup_seconds is None:
+            # Every loop publishes right after its first trigger check
+            self.startup_seconds = process_uptime()
+            self.metrics.observe_ns("startup", int(self.startup_seconds * 1e9))
+            self.logger.log_info(f"First price check {self.startup_seconds * 1000:.0f} ms after process start")
+    
+    def render_status(self):
+        """Renderable for the latest snapshot (None before the first price)"""
+        snapshot = self.latest_snapshot
+        if snapshot is None:
+            return None
+        started = time.perf_counter_ns()
+        renderable = render_status(snapshot, f"📊 {BOT_NAME} v{BOT_VERSION} - Status")
+        self.metrics.observe_ns("render", time.perf_counter_ns() - started)
+        return renderable
+    
+    def export_ledger(self, path: str):
+        """Write the ledger's recent trades to a CSV (e.g. on shutdown)"""
+        try:
+            self.ledger.write_csv(path)
+        except OSError as e:
+            self.logger.log_error(f"Ledger export to {path} failed: {e}")
+            return
+        console.print(f"[green]✓ Ledger:[/green] {len(self.ledger.entries)} trades written to {path}")
+        self.logger.log_info(f"Ledger: {len(self.ledger.entries)} trades written to {path}")
+    
+    def display_status(self, current_price: float):
+        """Print the current bot status once"""
+        self.publish_snapshot(current_price)
+        console.print(self.render_status())
+    
+    def _run_polling(self):
+        """Poll the REST ticker every poll_interval seconds, backing off on repeated failures"""
+        consecutive_failures = 0
+        while True:
+            try:
+                current_price = self.get_current_price()
+                if current_price > 0:
+                    # Check BOTH triggers
+                    self.check_triggers(current_price)
+                    
+                    self.publish_snapshot(current_price)
+                    consecutive_failures = 0
+                    delay = self.config.poll_interval
+                else:
+                    consecutive_failures += 1
+                    delay = backoff_delay(consecutive_failures, self.config.poll_interval, MAX_FAILURE_BACKOFF)
+                    self.logger.log_warning(f"Price fetch failed ({consecutive_failures} in a row), retrying in {delay:.1f}s")
+                
+                self.clock.sleep(delay)
+                
+            except Exception as e:
+                consecutive_failures += 1
+                self.metrics.inc("loop_errors_total")
+                self.logger.log_error(f"Loop error: {e}")
+                self.clock.sleep(backoff_delay(consecutive_failures, self.config.poll_interval, MAX_FAILURE_BACKOFF))
+    
+    def _run_streaming(self):
+        """Check triggers on every stream update, falling back to REST while the stream is stale"""
+        stream = PriceStream(
+            self.config.symbol,
+            stream_type=self.config.stream_type,
+            base_url=self.config.stream_url,
+            on_log=self.logger._write,
+            on_tick=self.recorder.append if self.recorder is not None else None
+        )
+        stream.start()
+        using_fallback = False
+        consecutive_failures = 0
         try:
-            consecutive_failures = 0
             while True:
                 try:
-                    current_price = self.get_current_price()
-                    if current_price > 0:
-                        # Check BOTH triggers
-                        self.check_triggers(current_price)
-                        
-                        self.display_status(current_price)
-                        consecutive_failures = 0
+                    # Once stale, poll REST at the usual cadence until the stream delivers again
+                    prices = stream.wait_for_prices(timeout=self.config.poll_interval if using_fallback else STREAM_STALE_AFTER)
+                    if prices:
+                        if using_fallback:
+                            self.logger.log_info("Price stream recovered, leaving REST fallback")
+                            using_fallback = False
                     else:
-                        consecutive_failures += 1
-                        self.logger.log_warning(f"Price fetch failed ({consecutive_failures}/10)")
-                        if consecutive_failures >= 10:
-                            self.logger.log_error("Too many failures, pausing for 60s")
-                            time.sleep(60)
-                            consecutive_failures = 0
+                        # Stream is stale: poll REST until it comes back
+                        if not using_fallback:
+                            self.logger.log_warning(f"No stream update for {STREAM_STALE_AFTER}s, falling back to REST polling every {self.config.poll_interval:g}s")
+                            using_fallback = True
+                        price = self.get_current_price()
+                        prices = [price] if price > 0 else []
+                    
+                    for current_price in prices:
+                        self.check_triggers(current_price)
                     
-                    time.sleep(5)
+                    if prices:
+                        self.publish_snapshot(prices[-1])
+                    consecutive_failures = 0
                     
                 except Exception as e:
                     consecutive_failures += 1
+                    self.metrics.inc("loop_errors_total")
                     self.logger.log_error(f"Loop error: {e}")
-                    time.sleep(10)
+                    self.clock.sleep(backoff_delay(consecutive_failures, 1.0, MAX_FAILURE_BACKOFF))
+        finally:
+            stream.stop()
+    
+    def run(self):
+        """Main bot loop"""
+        self.logger.log_info("Starting asymmetric grid bot with compounding...")
+        
+        # Execute initial 50/50 split, unless we are resuming a journaled session
+        if self.resumed:
+            console.print(f"\n[green]✓ Resumed saved state[/green] | Ref: ${self.reference_price:,.2f} | {self.trade_count} trades so far")
+            console.print(f"[cyan]{self.config.base_asset}:[/cyan] {self.crypto_balance:.6f}")
+            console.print(f"[cyan]USDT:[/cyan] ${self.usdt_balance:,.2f}")
+            self.logger.log_info(f"Resumed saved state | Ref: ${self.reference_price:.2f} | {self.config.base_asset}: {self.crypto_balance:.6f} | USDT: ${self.usdt_balance:.2f}")
+        else:
+            self.execute_initial_buy()
+        
+        if self.reconciler is not None:
+            try:
+                # Limit mode already consumes the user-data stream and forwards its events
+                self.reconciler.start(own_stream=self.config.order_mode != "limit")
+            except Exception as e:
+                self.logger.log_warning(f"Balance reconciliation disabled, account snapshot failed: {e}")
+                self.reconciler = None
+        
+        console.print("\n[green]✓ Bot is now running in ASYMMETRIC GRID mode with COMPOUNDING![/green]")
+        console.print("[dim]Press Ctrl+C to stop[/dim]\n")
+        
+        metrics_server = None
+        if self.config.metrics_port:
+            metrics_server = MetricsServer(self.metrics, self.config.metrics_port)
+            metrics_server.start()
+            self.logger.log_info(f"Metrics at http://127.0.0.1:{metrics_server.port}/metrics")
+        
+        dashboard = None
+        if not self.config.headless:
+            dashboard = Dashboard(self.render_status, console=console.rich, refresh_per_second=DASHBOARD_REFRESH_PER_SECOND)
+            dashboard.start()
+        
+        try:
+            if self.config.order_mode == "limit":
+                if self.ladder is not None:
+                    self.logger.log_warning("Ladder levels apply to market orders; limit mode rests the nearest level only")
+                if self.config.paper_trading and is_binance_client(self.client):
+                    # Resting orders need an exchange to rest on; paper mode only has price data
+                    self.logger.log_warning("Limit mode needs a live or mock exchange, using market orders")
+                else:
+                    from limit_grid import LimitGridTrader
+                    self.logger.log_info("Order mode: resting LIMIT orders")
+                    LimitGridTrader(self, console=console, price_interval=self.config.poll_interval).run()
+                    return
+            if self.config.price_feed == "stream":
+                self.logger.log_info(f"Price feed: WebSocket {self.config.stream_type} stream")
+                self._run_streaming()
+            else:
+                self.logger.log_info(f"Price feed: REST polling every {self.config.poll_interval:g}s")
+                self._run_polling()
                     
         except KeyboardInterrupt:
+            if dashboard:
+                dashboard.stop()
+                dashboard = None
             console.print("\n[yellow]Bot stopped by user[/yellow]")
             self.logger.log_info("Bot stopped by user")
             final_price = self.get_current_price()
             if final_price > 0:
                 self.display_status(final_price)
+        finally:
+            if self.orders is not None:
+                self.orders.close()
+            if dashboard:
+                dashboard.stop()
+            if self.reconciler is not None:
+                self.reconciler.stop()
+            if metrics_server:
+                metrics_server.stop()
+            if self.metrics.has_data():
+                console.print(self.metrics.summary_table())
+            if self.config.ledger_csv:
+                self.export_ledger(self.config.ledger_csv)
+            if self.journal is not None:
+                self.journal.close()
+            if self.recorder is not None:
+                self.recorder.close()
+            self.logger.close()
 
 # === Main Entry Point ===
 def main():
-    wizard = SetupWizard()
-    config = wizard.run()
-    
-    # Confirmation before starting
-    if not config.paper_trading:
-        confirm = questionary.confirm(
-            "⚠️ You selected LIVE trading. Are you sure?",
-            default=False,
-            style=custom_style
-        ).ask()
+    parser = argparse.ArgumentParser(
+        description=f"{BOT_NAME} v{BOT_VERSION}",
+        epilog=f"Without --config, --symbol or {ENV_PREFIX}SYMBOL the interactive setup wizard runs (needs a terminal)"
+    )
+    parser.add_argument("--config", help="JSON file of BotConfig fields (starts without prompts)")
+    parser.add_argument("--symbol", help="Trading pair, e.g. SOLUSDT (starts without prompts)")
+    parser.add_argument("--investment", type=float, help="USDT investment (initial_investment)")
+    parser.add_argument("--live", action="store_true", help="Trade live (headless start; keys from the config or BINANCE_API_KEY/BINANCE_API_SECRET)")
+    parser.add_argument("--feed", choices=["rest", "stream"], help="Price feed")
+    parser.add_argument("--order-mode", choices=["market", "limit"], help="Market orders on trigger or resting limit orders")
+    parser.add_argument("--set", action="append", default=[], metavar="FIELD=VALUE", help="Any other BotConfig field (repeatable)")
+    parser.add_argument("--headless", action="store_true", help="Run without the live dashboard")
+    parser.add_argument("--fresh", action="store_true", help="Discard saved state and start with a new 50/50 split")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this local port")
+    parser.add_argument("--record", action="store_true", help="Record every observed price to ticks/<SYMBOL>/")
+    parser.add_argument("--ladder-levels", type=int, help="Grid levels per side (gaps trade every crossed level at once)")
+    parser.add_argument("--ledger-csv", metavar="PATH", help="Write the trade ledger's recent trades to a CSV on shutdown")
+    args = parser.parse_args()
+    
+    # Flags left at their defaults don't override the config file or environment
+    overrides = dict(item.split("=", 1) for item in args.set if "=" in item)
+    if len(overrides) != len(args.set):
+        parser.error("--set expects FIELD=VALUE")
+    overrides.update({
+        "symbol": args.symbol,
+        "initial_investment": args.investment,
+        "paper_trading": False if args.live else None,
+        "price_feed": args.feed,
+        "order_mode": args.order_mode,
+        "headless": True if args.headless else None,
+        "resume": False if args.fresh else None,
+        "metrics_port": args.metrics_port,
+        "record_ticks": True if args.record else None,
+        "ladder_levels": args.ladder_levels,
+        "ledger_csv": args.ledger_csv,
+    })
+    
+    if args.config or args.symbol or os.environ.get(ENV_PREFIX + "SYMBOL"):
+        try:
+            config = load_config(args.config, overrides)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        # No terminal to draw on (systemd, cron, containers): log lines only
+        if not sys.stdout.isatty():
+            config.headless = True
+        # Plain trade lines: a headless fleet start never loads rich
+        console.plain = config.headless
+    elif not sys.stdin.isatty():
+        parser.error(f"no terminal for the setup wizard; pass --config, --symbol or set {ENV_PREFIX}SYMBOL")
+    else:
+        wizard = SetupWizard()
+        config = wizard.run()
+        config.headless = args.headless
+        config.resume = not args.fresh
+        config.metrics_port = args.metrics_port or 0
+        config.record_ticks = args.record
+        config.ladder_levels = args.ladder_levels or 1
+        config.ledger_csv = args.ledger_csv or ""
         
-        if not confirm:
-            console.print("[yellow]Cancelled. Switching to paper trading.[/yellow]")
-            config.paper_trading = True
+        # Confirmation before starting
+        if not config.paper_trading:
+            import questionary
+            confirm = questionary.confirm(
+                "⚠️ You selected LIVE trading. Are you sure?",
+                default=False,
+                style=questionary.Style(WIZARD_STYLE)
+            ).ask()
+            
+            if not confirm:
+                console.print("[yellow]Cancelled. Switching to paper trading.[/yellow]")
+                config.paper_trading = True
     
     bot = DualTriggerBot(config)
     bot.run()
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Historical backtest for the Asymmetric Grid Bot
+Replays a kline or tick history through the same trigger, compounding and LOT_SIZE
+rules as paper trading. Trigger scans are NumPy-batched: between trades the triggers
+are constant, so the next crossing is found with one vectorized pass per chunk and
+only the (rare) trade ticks run scalar Python.
+"""
+
+import argparse
+import csv
+import os
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from exchange_filters import SymbolFilters
+from tick_store import TickStore, is_tick_store
+from grid_ladder import GridLadder
+from indicators import MEASURES, RESCALE_STEP, VolatilityEngine, scale_path
+
+# === Constants ===
+DEFAULT_BUY_OFFSET = 0.01       # Matches BotConfig.buy_offset (-1.0%)
+DEFAULT_SELL_OFFSET = 0.015     # Matches BotConfig.sell_offset (+1.5%)
+DEFAULT_TRADE_FRACTION = 0.05   # Matches BotConfig.trade_fraction (5% of portfolio)
+MIN_CHUNK = 256
+MAX_CHUNK = 1 << 20
+
+PRICE_COLUMNS = ("price", "close", "p", "c")
+TIME_COLUMNS = ("timestamp", "time", "open_time", "ts", "t", "T")
+
+
+# === Data Loading ===
+def _pick_column(names: List[str], candidates: Tuple[str, ...], requested: Optional[str]) -> Optional[int]:
+    if requested is not None:
+        if requested not in names:
+            raise ValueError(f"Column '{requested}' not found (have {names})")
+        return names.index(requested)
+    lowered = [n.strip().lower() for n in names]
+    for candidate in candidates:
+        if candidate.lower() in lowered:
+            return lowered.index(candidate.lower())
+    return None
+
+
+def _load_csv(path: str, price_column: Optional[str], time_column: Optional[str]):
+    with open(path, newline='') as f:
+        first_row = next(csv.reader(f))
+    try:
+        [float(v) for v in first_row]
+        has_header = False
+    except ValueError:
+        has_header = True
+
+    if has_header:
+        price_idx = _pick_column(first_row, PRICE_COLUMNS, price_column)
+        time_idx = _pick_column(first_row, TIME_COLUMNS, time_column)
+        if price_idx is None:
+            raise ValueError(f"No price column in {path} (looked for {PRICE_COLUMNS})")
+    elif len(first_row) >= 5:
+        # Binance kline dump: open_time, open, high, low, close, ...
+        time_idx, price_idx = 0, 4
+    elif len(first_row) >= 2:
+        time_idx, price_idx = 0, 1
+    else:
+        time_idx, price_idx = None, 0
+
+    usecols = [price_idx] if time_idx is None else [time_idx, price_idx]
+    try:
+        import pandas as pd
+        frame = pd.read_csv(path, header=0 if has_header else None, usecols=usecols)
+        columns = {idx: frame.iloc[:, sorted(usecols).index(idx)].to_numpy() for idx in usecols}
+    except ImportError:
+        raw = np.loadtxt(path, delimiter=',', skiprows=1 if has_header else 0, usecols=usecols, ndmin=2)
+        columns = {idx: raw[:, pos] for pos, idx in enumerate(usecols)}
+
+    prices = np.ascontiguousarray(columns[price_idx], dtype=np.float64)
+    if time_idx is None:
+        timestamps = np.arange(len(prices), dtype=np.int64)
+    else:
+        timestamps = np.ascontiguousarray(columns[time_idx], dtype=np.int64)
+    return timestamps, prices
+
+
+def _load_parquet(path: str, price_column: Optional[str], time_column: Optional[str]):
+    try:
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+        names = table.column_names
+        get = lambda idx: table.column(idx).to_numpy()
+    except ImportError:
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("Reading Parquet requires pyarrow or pandas (pip install pyarrow)")
+        frame = pd.read_parquet(path)
+        names = list(frame.columns)
+        get = lambda idx: frame.iloc[:, idx].to_numpy()
+
+    price_idx = _pick_column(names, PRICE_COLUMNS, price_column)
+    if price_idx is None:
+        raise ValueError(f"No price column in {path} (looked for {PRICE_COLUMNS})")
+    time_idx = _pick_column(names, TIME_COLUMNS, time_column)
+
+    prices = np.ascontiguousarray(get(price_idx), dtype=np.float64)
+    if time_idx is None:
+        timestamps = np.arange(len(prices), dtype=np.int64)
+    else:
+        raw_times = get(time_idx)
+        if np.issubdtype(raw_times.dtype, np.datetime64):
+            raw_times = raw_times.astype('datetime64[ms]').astype(np.int64)
+        timestamps = np.ascontiguousarray(raw_times, dtype=np.int64)
+    return timestamps, prices
+
+
+def load_prices(path: str, price_column: Optional[str] = None,
+                time_column: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Load (timestamps, prices) from a CSV or Parquet kline/tick history.
+    Klines are replayed on their close price, like the bot sees one polled price per tick.
+    A recorded tick directory (tick_store.py) is memory-mapped instead of read."""
+    if is_tick_store(path):
+        store = TickStore(path)
+        return store.timestamps, store.prices
+    if path.lower().endswith((".parquet", ".pq")):
+        return _load_parquet(path, price_column, time_column)
+    return _load_csv(path, price_column, time_column)
+
+
+# === Results ===
+@dataclass
+class BacktestTrade:
+    """One executed trade"""
+    index: int
+    timestamp: int
+    side: str
+    price: float
+    quantity: float
+    total: float
+    trade_size: float
+    profit: float
+    fee: float
+
+
+@dataclass
+class BacktestResult:
+    """Outcome of a replay"""
+    initial_investment: float
+    trades: List[BacktestTrade]
+    timestamps: np.ndarray
+    prices: np.ndarray
+    equity: np.ndarray
+    crypto_balance: float
+    usdt_balance: float
+    realized_pnl: float          # Same definition as the bot's cumulative_profit
+    fees: float
+    reference_price: float
+    last_trade_size: float
+    elapsed: float = 0.0
+
+    @property
+    def trade_count(self) -> int:
+        return len(self.trades)
+
+    @property
+    def final_equity(self) -> float:
+        return float(self.equity[-1]) if len(self.equity) else self.initial_investment
+
+    @property
+    def unrealized_pnl(self) -> float:
+        """Same definition as the dashboard: portfolio value minus initial investment"""
+        return self.final_equity - self.initial_investment
+
+    @property
+    def total_return(self) -> float:
+        return self.final_equity / self.initial_investment - 1
+
+    @property
+    def max_drawdown(self) -> float:
+        if not len(self.equity):
+            return 0.0
+        peaks = np.maximum.accumulate(self.equity)
+        return float(np.max((peaks - self.equity) / peaks))
+
+
+# === Engine ===
+def run_backtest(prices: np.ndarray, timestamps: Optional[np.ndarray] = None,
+                 initial_investment: float = 1000.0, step_size: float = 0.0001,
+                 min_qty: float = 0.0001, fee_rate: float = 0.0,
+                 buy_offset: float = DEFAULT_BUY_OFFSET, sell_offset: float = DEFAULT_SELL_OFFSET,
+                 trade_fraction: float = DEFAULT_TRADE_FRACTION, min_notional: float = 0.0,
+                 filters: Optional[SymbolFilters] = None, ladder_levels: int = 1,
+                 volatility: Optional[VolatilityEngine] = None) -> BacktestResult:
+    """
+    Replay a price sequence exactly as the paper-trading path would see it.
+    prices[0] is used for the initial 50/50 split, every later price is one check_triggers() tick.
+    With fee_rate=0 (paper mode has no fees) the trades and balances match paper trading exactly.
+    Pass the bot's SymbolFilters to apply every exchange filter; otherwise step_size/min_qty/min_notional are used.
+    ladder_levels > 1 trades every crossed ladder level in one order, like BotConfig.ladder_levels.
+    With a volatility engine (fresh or warmed up) offsets are scaled like BotConfig.adaptive_offsets;
+    without timestamps every row counts as one bar.
+    """
+    started = time.perf_counter()
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    n = len(prices)
+    if n == 0 or prices[0] <= 0:
+        raise ValueError("Price history is empty or starts with a non-positive price")
+    bar_times = timestamps
+    if timestamps is None:
+        timestamps = np.arange(n, dtype=np.int64)
+        if volatility is not None:
+            bar_times = timestamps * volatility.bar_ms
+
+    if filters is None:
+        filters = SymbolFilters("", step_size=step_size, min_qty=min_qty, min_notional=min_notional)
+    buy_multiplier = 1 - buy_offset
+    sell_multiplier = 1 + sell_offset
+    ladder = GridLadder(ladder_levels, buy_offset, sell_offset) if ladder_levels > 1 else None
+    # Adaptive offsets: the engine only depends on prices, so its bar closes and scales are known up front
+    closed = scales = None
+    scale = 1.0
+    if volatility is not None:
+        scale = volatility.scale()
+        closed, scales = scale_path(volatility, bar_times, prices)
+
+    def place_triggers(reference: float, scale: float) -> Tuple[float, float]:
+        """set_triggers(): same float expressions as the bot"""
+        if volatility is None:
+            return reference * buy_multiplier, reference * sell_multiplier
+        scaled_buy, scaled_sell = buy_offset * scale, sell_offset * scale
+        if ladder is not None:
+            ladder.set_offsets(scaled_buy, scaled_sell)
+        return reference * (1 - scaled_buy), reference * (1 + scaled_sell)
+
+    # Initial 50/50 split (execute_initial_buy, paper branch)
+    initial_price = float(prices[0])
+    half_investment = initial_investment / 2
+    crypto = half_investment / initial_price
+    usdt = half_investment
+    reference = initial_price
+    buy_trigger, sell_trigger = place_triggers(reference, scale)
+    if ladder is not None:
+        ladder.recenter(reference)
+    cumulative_profit = 0.0
+    total_fees = 0.0
+    last_trade_size = 0.0
+
+    trades: List[BacktestTrade] = []
+    state_index = [0]
+    state_usdt = [usdt]
+    state_crypto = [crypto]
+
+    i = 1
+    chunk = MIN_CHUNK
+    while i < n:
+        end = min(i + chunk, n)
+        window = prices[i:end]
+        # Same float expressions as check_triggers/get_trade_size, evaluated for a whole chunk
+        trade_size = (usdt + crypto * window) * trade_fraction
+        sell_ok = (window >= sell_trigger) & (crypto >= trade_size / window)
+        buy_ok = (window <= buy_trigger) & (usdt >= trade_size)
+        hits = np.flatnonzero(sell_ok | buy_ok)
+        rescale = n
+        if scales is not None:
+            # Bar closes where the bot's needs_rescale() would re-place the triggers
+            events = np.flatnonzero(closed[i:end] & (np.abs(scales[i:end] / scale - 1) > RESCALE_STEP))
+            if len(events):
+                rescale = i + int(events[0])
+        if not len(hits) and rescale == n:
+            i = end
+            chunk = min(chunk * 2, MAX_CHUNK)
+            continue
+
+        k = i + int(hits[0]) if len(hits) else n
+        if rescale <= k:
+            # The bot rescales before checking that tick, so re-scan from it with the new triggers
+            scale = float(scales[rescale])
+            buy_trigger, sell_trigger = place_triggers(reference, scale)
+            if ladder is not None:
+                ladder.recenter(reference)
+            i = rescale
+            chunk = MIN_CHUNK
+            continue
+        price = float(prices[k])
+        size = (usdt + crypto * price) * trade_fraction
+        last_trade_size = size
+        traded = False
+        if price >= sell_trigger:
+            if ladder is not None:
+                size *= min(ladder.sells_crossed(price), int(crypto // (last_trade_size / price)))
+            quantity = filters.round_quantity(size / price, market=True)
+            if filters.check_order(quantity, price) is None and crypto >= quantity:
+                received = quantity * price
+                fee = received * fee_rate
+                profit = received - size
+                crypto -= quantity
+                usdt += received - fee
+                cumulative_profit += profit
+                total_fees += fee
+                trades.append(BacktestTrade(k, int(timestamps[k]), "SELL", price, quantity, received, size, profit, fee))
+                traded = True
+        else:
+            if ladder is not None:
+                size *= min(ladder.buys_crossed(price), int(usdt // size))
+            quantity = filters.round_quantity(size / price, market=True)
+            if filters.check_order(quantity, price) is None and usdt >= size:
+                fee = size * fee_rate
+                crypto += quantity
+                usdt -= size + fee
+                total_fees += fee
+                trades.append(BacktestTrade(k, int(timestamps[k]), "BUY", price, quantity, size, size, 0.0, fee))
+                traded = True
+
+        if traded:
+            reference = price
+            if scales is not None:
+                scale = float(scales[k])
+            buy_trigger, sell_trigger = place_triggers(reference, scale)
+            if ladder is not None:
+                ladder.recenter(reference)
+            state_index.append(k)
+            state_usdt.append(usdt)
+            state_crypto.append(crypto)
+        i = k + 1
+        chunk = MIN_CHUNK
+
+    # Equity curve: balances are piecewise constant between trades
+    segment = np.searchsorted(np.asarray(state_index), np.arange(n), side='right') - 1
+    equity = np.asarray(state_usdt)[segment] + np.asarray(state_crypto)[segment] * prices
+
+    return BacktestResult(
+        initial_investment=initial_investment,
+        trades=trades,
+        timestamps=timestamps,
+        prices=prices,
+        equity=equity,
+        crypto_balance=crypto,
+        usdt_balance=usdt,
+        realized_pnl=cumulative_profit,
+        fees=total_fees,
+        reference_price=reference,
+        last_trade_size=last_trade_size,
+        elapsed=time.perf_counter() - started,
+    )
+
+
+# === Reporting ===
+def write_trades_csv(result: BacktestResult, path: str):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["index", "timestamp", "side", "price", "quantity", "total", "trade_size", "profit", "fee"])
+        for t in result.trades:
+            writer.writerow([t.index, t.timestamp, t.side, t.price, t.quantity, t.total, t.trade_size, t.profit, t.fee])
+
+
+def write_equity_csv(result: BacktestResult, path: str):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp", "price", "equity"])
+        writer.writerows(zip(result.timestamps.tolist(), result.prices.tolist(), result.equity.tolist()))
+
+
+def print_summary(result: BacktestResult, title: str = "Backtest"):
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+
+    buys = sum(1 for t in result.trades if t.side == "BUY")
+    table = Table(title=f"📈 {title}", box=box.ROUNDED, border_style="cyan")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green")
+    table.add_row("Bars", f"{len(result.prices):,}")
+    table.add_row("Trades", f"{result.trade_count} ({buys} buys, {result.trade_count - buys} sells)")
+    table.add_row("Initial Investment", f"${result.initial_investment:,.2f}")
+    table.add_row("Final Equity", f"${result.final_equity:,.2f}")
+    table.add_row("Return", f"{result.total_return * 100:+.2f}%")
+    table.add_row("Max Drawdown", f"{result.max_drawdown * 100:.2f}%")
+    table.add_row("Realized P&L", f"${result.realized_pnl:+,.2f}")
+    table.add_row("Unrealized P&L", f"${result.unrealized_pnl:+,.2f}")
+    table.add_row("Fees", f"${result.fees:,.2f}")
+    table.add_row("Last Trade Size", f"${result.last_trade_size:,.2f}")
+    table.add_row("Replay Time", f"{result.elapsed:.3f}s")
+    Console().print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a price history through the asymmetric grid strategy")
+    parser.add_argument("data", help="CSV or Parquet kline/tick file")
+    parser.add_argument("--investment", type=float, default=1000.0, help="Initial USDT investment")
+    parser.add_argument("--step-size", type=float, default=0.0001, help="LOT_SIZE stepSize")
+    parser.add_argument("--min-qty", type=float, default=0.0001, help="LOT_SIZE minQty")
+    parser.add_argument("--min-notional", type=float, default=0.0, help="MIN_NOTIONAL/NOTIONAL minimum order value")
+    parser.add_argument("--fee", type=float, default=0.0, help="Fee rate per trade (0.001 = 0.1%%)")
+    parser.add_argument("--buy-offset", type=float, default=DEFAULT_BUY_OFFSET, help="Buy trigger below reference (0.01 = -1%%)")
+    parser.add_argument("--sell-offset", type=float, default=DEFAULT_SELL_OFFSET, help="Sell trigger above reference (0.015 = +1.5%%)")
+    parser.add_argument("--trade-fraction", type=float, default=DEFAULT_TRADE_FRACTION, help="Trade size as a fraction of portfolio")
+    parser.add_argument("--ladder-levels", type=int, default=1, help="Grid levels per side (gaps trade every crossed level at once)")
+    parser.add_argument("--adaptive", choices=MEASURES, help="Scale offsets by this volatility measure (like BotConfig.adaptive_offsets)")
+    parser.add_argument("--scale-min", type=float, default=0.5, help="Smallest adaptive offset multiplier")
+    parser.add_argument("--scale-max", type=float, default=2.0, help="Largest adaptive offset multiplier")
+    parser.add_argument("--price-column", help="Price column name (default: price/close)")
+    parser.add_argument("--time-column", help="Timestamp column name (default: timestamp/open_time)")
+    parser.add_argument("--trades-out", help="Write executed trades to this CSV")
+    parser.add_argument("--equity-out", help="Write the equity curve to this CSV")
+    args = parser.parse_args()
+
+    timestamps, prices = load_prices(args.data, args.price_column, args.time_column)
+    volatility = VolatilityEngine(args.adaptive, args.scale_min, args.scale_max) if args.adaptive else None
+    result = run_backtest(prices, timestamps, args.investment, args.step_size, args.min_qty, args.fee,
+                          args.buy_offset, args.sell_offset, args.trade_fraction, args.min_notional,
+                          ladder_levels=args.ladder_levels, volatility=volatility)
+    print_summary(result, title=f"Backtest: {os.path.basename(args.data)}")
+    if args.trades_out:
+        write_trades_csv(result, args.trades_out)
+    if args.equity_out:
+        write_equity_csv(result, args.equity_out)
+
+
+if __name__ == "__main__":
+    main()
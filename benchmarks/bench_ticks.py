@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Per-tick overhead benchmarks for the Asymmetric Grid Bot
+Drives a paper-mode DualTriggerBot (mock exchange client, no journal, console to /dev/null)
+through its hot paths and compares the results with benchmarks/baseline.json:
+    quiet_tick       check_triggers() with the price between the triggers
+    adaptive_tick    quiet_tick with adaptive offsets (one second per tick, so a 1m bar closes every 60)
+    buy_tick         check_triggers() that executes a paper buy
+    sell_tick        check_triggers() that executes a paper sell
+    order_fire       check_triggers() handing a live market order to the order pipeline (the send isn't timed)
+    display_status   one status render printed to the console
+    log_trade        TradeLogger.log_trade(), including the writer thread draining to disk
+    replay_1m        1M synthetic random-walk ticks through check_triggers()
+    startup_import   a fresh interpreter importing the bot and loading a headless config (fails if it loads a lazy dependency)
+Time is the median ns/op over several rounds; a second, shorter run under tracemalloc gives the
+bytes allocated per op (peak) and still held afterwards (retained).
+
+Usage:
+    python3 benchmarks/bench_ticks.py                        # compare with the baseline, exit 1 on regression
+    python3 benchmarks/bench_ticks.py --threshold 0.10       # fail on >10% slowdowns
+    python3 benchmarks/bench_ticks.py --only quiet_tick,buy_tick
+    python3 benchmarks/bench_ticks.py --save-baseline        # record this machine's numbers
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import asymmetric_grid_bot_v211 as grid_bot  # noqa: E402
+from exchange_filters import SymbolFilters  # noqa: E402
+from mock_exchange import MockExchange  # noqa: E402
+
+# === Constants ===
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.20     # Allowed slowdown vs. baseline (0.20 = 20%)
+ALLOC_SLACK_BYTES = 64       # Allocation changes below this many bytes/op are noise
+TRACE_FRACTION = 0.1         # Share of the timed ops repeated under tracemalloc
+SYMBOL, BASE, QUOTE = "SOLUSDT", "SOL", "USDT"
+PRICE = 100.0
+# Only imported once a run needs them (Binance client, setup wizard, tick recording, console and dashboard)
+LAZY_MODULES = ("binance", "questionary", "numpy", "rich", "rich.console", "rich.table", "rich.live",
+                "websockets", "http.server")
+
+
+class Case(NamedTuple):
+    name: str
+    run: Callable[[int], Optional[int]]     # Executes n ops; may return its own timed ns
+    ops: int
+    rounds: int
+
+
+class Result(NamedTuple):
+    ns_per_op: float
+    peak_bytes_per_op: float
+    retained_bytes_per_op: float
+
+
+# === Fixtures ===
+class StepClock:
+    """Virtual clock the benchmark advances by hand"""
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def make_bot(clock=None, **overrides) -> "grid_bot.DualTriggerBot":
+    """Paper bot after its 50/50 split, with nothing that touches the network or the state dir"""
+    config = grid_bot.BotConfig("", "", SYMBOL, BASE, QUOTE, 1000.0, 50.0, True,
+                                headless=True, state_journal=False, **overrides)
+    client = MockExchange(SYMBOL, BASE, QUOTE, price=PRICE)
+    filters = SymbolFilters(SYMBOL, step_size=0.001, min_qty=0.001, max_qty=9000.0)
+    bot = grid_bot.DualTriggerBot(config, client=client, filters=filters, clock=clock)
+    bot.execute_initial_buy(PRICE)
+    return bot
+
+
+def quiet_tick(n: int):
+    bot = make_bot()
+    check, price = bot.check_triggers, PRICE
+    for _ in range(n):
+        check(price)
+    bot.logger.close()
+
+
+def adaptive_tick(n: int):
+    clock = StepClock()
+    bot = make_bot(clock, adaptive_offsets=True)
+    check = bot.check_triggers
+    for i in range(n):
+        clock.now += 1.0
+        # Small wiggle so bars have a range and returns, well inside the triggers
+        check(PRICE + (i % 7) * 0.01)
+    bot.logger.close()
+
+
+def buy_tick(n: int):
+    bot = make_bot()
+    price = bot.buy_trigger * 0.999
+    for _ in range(n):
+        # Same balances and trigger every time, so every tick buys the same size
+        bot.usdt_balance, bot.crypto_balance = 500.0, 5.0
+        bot.buy_trigger, bot.sell_trigger = PRICE, float("inf")
+        bot.check_triggers(price)
+    bot.logger.close()
+
+
+def sell_tick(n: int):
+    bot = make_bot()
+    price = bot.sell_trigger * 1.001
+    for _ in range(n):
+        bot.usdt_balance, bot.crypto_balance = 500.0, 5.0
+        bot.buy_trigger, bot.sell_trigger = 0.0, PRICE
+        bot.check_triggers(price)
+    bot.logger.close()
+
+
+def order_fire(n: int):
+    config = grid_bot.BotConfig("key", "secret", SYMBOL, BASE, QUOTE, 1000.0, 50.0, False,
+                                headless=True, state_journal=False, reconcile_interval=0)
+    client = MockExchange(SYMBOL, BASE, QUOTE, price=PRICE, quote_balance=1e12)
+    filters = SymbolFilters(SYMBOL, step_size=0.001, min_qty=0.001, max_qty=9000.0)
+    bot = grid_bot.DualTriggerBot(config, client=client, filters=filters)
+    bot.execute_initial_buy(PRICE)
+    orders = bot.orders
+    price = PRICE * 0.98
+    client.set_price(price)
+    elapsed = 0
+    for _ in range(n):
+        bot.usdt_balance, bot.crypto_balance = 500.0, 5.0
+        bot.buy_trigger, bot.sell_trigger = PRICE, float("inf")
+        orders.arm()
+        started = time.perf_counter_ns()
+        bot.check_triggers(price)
+        elapsed += time.perf_counter_ns() - started
+        while orders.poll():
+            time.sleep(0)
+    orders.close()
+    bot.logger.close()
+    return elapsed
+
+
+def display_status(n: int):
+    bot = make_bot()
+    for i in range(n):
+        bot.display_status(PRICE + (i % 10) * 0.01)
+    bot.logger.close()
+
+
+def log_trade(n: int):
+    logger = grid_bot.TradeLogger(SYMBOL, True)
+    for i in range(n):
+        logger.log_trade("BUY", PRICE, 0.5, 50.0)
+    logger.close()
+
+
+def replay(n: int):
+    bot = make_bot()
+    rng = np.random.default_rng(7)
+    prices = (PRICE * np.exp(np.cumsum(rng.normal(0.0, 0.0005, n)))).tolist()
+    check = bot.check_triggers
+    started = time.perf_counter_ns()
+    for price in prices:
+        check(price)
+    elapsed = time.perf_counter_ns() - started
+    bot.logger.close()
+    # Only the replay loop counts, not building the tape
+    return elapsed
+
+
+def startup_import(n: int):
+    check = ("import sys, asymmetric_grid_bot_v211 as bot; "
+             "bot.load_config(env={'AGB_SYMBOL': 'SOLUSDT', 'AGB_INITIAL_INVESTMENT': '1000'}); "
+             f"sys.exit(any(m in sys.modules for m in {LAZY_MODULES!r}))")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    for _ in range(n):
+        if subprocess.run([sys.executable, "-c", check], env=env).returncode:
+            raise RuntimeError(f"Importing the bot loaded one of {LAZY_MODULES}")
+
+
+def cases(replay_ticks: int) -> List[Case]:
+    return [
+        Case("quiet_tick", quiet_tick, 200_000, 5),
+        Case("adaptive_tick", adaptive_tick, 200_000, 5),
+        Case("buy_tick", buy_tick, 10_000, 5),
+        Case("sell_tick", sell_tick, 10_000, 5),
+        Case("order_fire", order_fire, 2_000, 5),
+        Case("display_status", display_status, 200, 5),
+        Case("log_trade", log_trade, 50_000, 5),
+        Case(f"replay_{replay_ticks // 1_000_000}m" if replay_ticks >= 1_000_000 else "replay",
+             replay, replay_ticks, 3),
+        Case("startup_import", startup_import, 10, 3),
+    ]
+
+
+# === Measurement ===
+def measure(case: Case) -> Result:
+    timings = []
+    for _ in range(case.rounds):
+        started = time.perf_counter_ns()
+        elapsed = case.run(case.ops)
+        if elapsed is None:
+            elapsed = time.perf_counter_ns() - started
+        timings.append(elapsed / case.ops)
+
+    traced_ops = max(1, int(case.ops * TRACE_FRACTION))
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        case.run(traced_ops)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(statistics.median(timings), (peak - before) / traced_ops, max(0, after - before) / traced_ops)
+
+
+def machine_info() -> Dict[str, str]:
+    return {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.machine()}
+
+
+def load_baseline(path: str) -> Optional[dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def compare(name: str, result: Result, baseline: Optional[dict], threshold: float) -> str:
+    """'ok', 'faster', 'REGRESSION' or 'new'"""
+    previous = (baseline or {}).get("cases", {}).get(name)
+    if previous is None:
+        return "new"
+    slower = result.ns_per_op > previous["ns_per_op"] * (1 + threshold)
+    more_memory = result.peak_bytes_per_op > previous["peak_bytes_per_op"] * (1 + threshold) + ALLOC_SLACK_BYTES
+    leaking = result.retained_bytes_per_op > previous["retained_bytes_per_op"] * (1 + threshold) + ALLOC_SLACK_BYTES
+    if slower or more_memory or leaking:
+        return "REGRESSION"
+    if result.ns_per_op < previous["ns_per_op"] * (1 - threshold):
+        return "faster"
+    return "ok"
+
+
+def _format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:,.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:,.2f} µs"
+    return f"{ns:,.0f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-tick overhead and compare with a stored baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (0.20 = 20%%)")
+    parser.add_argument("--only", help="Comma-separated case names")
+    parser.add_argument("--replay-ticks", type=int, default=1_000_000, help="Ticks in the replay case")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    console = Console()
+    selected = cases(args.replay_ticks)
+    if args.only:
+        wanted = set(args.only.split(','))
+        selected = [c for c in selected if c.name in wanted]
+    baseline_path = os.path.abspath(args.baseline)
+    json_path = os.path.abspath(args.json) if args.json else None
+    baseline = load_baseline(baseline_path)
+    if baseline and baseline.get("machine") != machine_info():
+        console.print(f"[yellow]Baseline was recorded on {baseline.get('machine')}; timings may not be comparable[/yellow]")
+
+    # Logs go to a scratch directory; trade and status output to /dev/null
+    workdir = tempfile.mkdtemp(prefix="agb-bench-")
+    os.chdir(workdir)
+    grid_bot.console = Console(file=open(os.devnull, "w"), width=120)
+
+    table = Table(title="⏱️ Per-tick Benchmarks", box=box.ROUNDED, border_style="cyan")
+    for column in ("Case", "Ops", "Time/op", "Baseline", "Δ", "Peak B/op", "Retained B/op", "Status"):
+        if column == "Case":
+            table.add_column(column, style="cyan", no_wrap=True)
+        else:
+            table.add_column(column, style="green", justify="right")
+    results: Dict[str, Result] = {}
+    regressions = 0
+    for case in selected:
+        console.print(f"[dim]Running {case.name} ({case.ops:,} ops x {case.rounds})...[/dim]")
+        result = results[case.name] = measure(case)
+        status = compare(case.name, result, baseline, args.threshold)
+        regressions += status == "REGRESSION"
+        previous = (baseline or {}).get("cases", {}).get(case.name)
+        delta = f"{(result.ns_per_op / previous['ns_per_op'] - 1) * 100:+.1f}%" if previous else ""
+        color = {"REGRESSION": "red", "faster": "green", "new": "yellow"}.get(status, "white")
+        table.add_row(case.name, f"{case.ops:,}", _format_ns(result.ns_per_op),
+                      _format_ns(previous["ns_per_op"]) if previous else "", delta,
+                      f"{result.peak_bytes_per_op:,.0f}", f"{result.retained_bytes_per_op:,.1f}",
+                      f"[{color}]{status}[/{color}]")
+    console.print(table)
+
+    document = {"machine": machine_info(), "cases": {name: r._asdict() for name, r in results.items()}}
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(document, f, indent=2)
+    if args.save_baseline:
+        if baseline:
+            # Keep cases that weren't run this time
+            merged = dict(baseline.get("cases", {}))
+            merged.update(document["cases"])
+            document["cases"] = merged
+        with open(baseline_path, "w") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+        console.print(f"[green]Baseline saved to {baseline_path}[/green]")
+    elif regressions:
+        console.print(f"[red]{regressions} case(s) regressed by more than {args.threshold:.0%}[/red]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
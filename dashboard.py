@@ -0,0 +1,201 @@
+"""
+Rich dashboard for the Asymmetric Grid Bot
+Rendering runs on its own refresh cadence (rich.live.Live) from immutable state snapshots
+published by the trading loop, so the trigger path never waits on terminal I/O. rich is imported
+by the renderers, so a headless bot that never draws doesn't load it.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+if TYPE_CHECKING:
+    from rich.console import Console, RenderableType
+    from rich.live import Live
+
+DEFAULT_REFRESH_PER_SECOND = 1.0
+
+
+@dataclass(frozen=True)
+class BotSnapshot:
+    """Point-in-time view of a bot's state; building one has no side effects"""
+    symbol: str
+    base_asset: str
+    paper_trading: bool
+    current_price: float
+    reference_price: float
+    buy_trigger: float
+    sell_trigger: float
+    buy_offset: float
+    sell_offset: float
+    trade_fraction: float
+    crypto_balance: float
+    usdt_balance: float
+    portfolio_value: float
+    initial_portfolio: float
+    realized_pnl: float
+    trade_size: float
+    initial_trade_size: float
+    last_trade_size: float
+    trade_count: int
+    # From the trade ledger
+    cost_basis: float = 0.0          # Average cost per unit held
+    open_pnl: float = 0.0            # Holdings at the current price minus their cost basis
+    win_rate: float = 0.0
+    closed_trades: int = 0
+    average_holding: float = 0.0     # Seconds
+    max_drawdown: float = 0.0
+    fees: float = 0.0
+
+    @property
+    def unrealized_pnl(self) -> float:
+        return self.portfolio_value - self.initial_portfolio
+
+
+def _colored(value: float, text: str) -> str:
+    color = "green" if value >= 0 else "red"
+    return f"[{color}]{text}[/{color}]"
+
+
+def format_duration(seconds: float) -> str:
+    """Compact duration: 45s, 12m, 3h 20m, 2d 5h"""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m"
+    if seconds < 86400:
+        return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+    return f"{seconds // 86400}d {seconds % 86400 // 3600}h"
+
+
+def render_status(snapshot: BotSnapshot, title: str) -> "RenderableType":
+    """Status table for one bot"""
+    from rich import box
+    from rich.console import Group
+    from rich.table import Table
+    from rich.text import Text
+
+    s = snapshot
+    table = Table(title=title, box=box.ROUNDED, border_style="cyan")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green")
+
+    table.add_row("Symbol", s.symbol)
+    table.add_row("Mode", "🧪 PAPER" if s.paper_trading else "🔴 LIVE")
+    table.add_row("Current Price", f"${s.current_price:,.2f}")
+    table.add_row("", "")
+
+    # Show BOTH triggers (ASYMMETRIC)
+    buy_distance_pct = ((s.current_price - s.buy_trigger) / s.buy_trigger) * 100 if s.buy_trigger else 0.0
+    sell_distance_pct = ((s.sell_trigger - s.current_price) / s.current_price) * 100 if s.current_price else 0.0
+    table.add_row("Reference Price", f"${s.reference_price:,.2f}")
+    table.add_row("", "")
+    table.add_row(f"🟢 BUY Trigger (-{s.buy_offset * 100:.3g}%)", f"${s.buy_trigger:,.2f} ({buy_distance_pct:+.2f}% away)")
+    table.add_row(f"🔴 SELL Trigger (+{s.sell_offset * 100:.3g}%)", f"${s.sell_trigger:,.2f} ({sell_distance_pct:+.2f}% away)")
+
+    table.add_row("", "")
+    table.add_row(f"{s.base_asset} Balance", f"{s.crypto_balance:.6f}")
+    table.add_row("USDT Balance", f"${s.usdt_balance:,.2f}")
+    table.add_row("Portfolio Value", f"${s.portfolio_value:,.2f}")
+    table.add_row("", "")
+
+    # P&L
+    table.add_row("Realized P&L", _colored(s.realized_pnl, f"${s.realized_pnl:+,.2f}"))
+    table.add_row("Unrealized P&L", _colored(s.unrealized_pnl, f"${s.unrealized_pnl:+,.2f}"))
+    if s.cost_basis > 0:
+        table.add_row("Cost Basis", f"${s.cost_basis:,.2f} per {s.base_asset}")
+        table.add_row("Open Position P&L", _colored(s.open_pnl, f"${s.open_pnl:+,.2f}"))
+    if s.closed_trades:
+        table.add_row("Win Rate", f"{s.win_rate * 100:.1f}% of {s.closed_trades} sells")
+        table.add_row("Avg Holding Time", format_duration(s.average_holding))
+    table.add_row("Max Drawdown", f"{s.max_drawdown * 100:.2f}%")
+    if s.fees > 0:
+        table.add_row("Fees", f"${s.fees:,.2f}")
+    table.add_row("", "")
+
+    # Compounding trade size info
+    table.add_row("Current Trade Size", f"${s.trade_size:.2f}")
+    if s.last_trade_size > 0:
+        growth_pct = ((s.trade_size / s.initial_trade_size) - 1) * 100
+        table.add_row("Trade Size Growth", _colored(growth_pct, f"{growth_pct:+.1f}%") + " from initial")
+    table.add_row("Total Trades", str(s.trade_count))
+
+    footer = Text.from_markup(
+        f"\n[dim]Strategy: ASYMMETRIC GRID (-{s.buy_offset * 100:.3g}% buy / +{s.sell_offset * 100:.3g}% sell) "
+        f"with COMPOUNDING ({s.trade_fraction * 100:g}% of portfolio)[/dim]\n[dim]Press Ctrl+C to stop[/dim]"
+    )
+    return Group(table, footer)
+
+
+def render_portfolio(snapshots: List[BotSnapshot], title: str) -> "RenderableType":
+    """One-row-per-symbol portfolio summary"""
+    from rich import box
+    from rich.console import Group
+    from rich.table import Table
+    from rich.text import Text
+
+    table = Table(title=title, box=box.ROUNDED, border_style="cyan")
+    for column in ("Symbol", "Price", "Buy", "Sell", "Base", "USDT", "Value", "P&L", "Trades"):
+        table.add_column(column, style="cyan" if column == "Symbol" else "green", justify="right")
+
+    total_value = 0.0
+    total_initial = 0.0
+    for s in snapshots:
+        total_value += s.portfolio_value
+        total_initial += s.initial_portfolio
+        table.add_row(
+            s.symbol, f"${s.current_price:,.4f}", f"${s.buy_trigger:,.4f}", f"${s.sell_trigger:,.4f}",
+            f"{s.crypto_balance:.6f}", f"${s.usdt_balance:,.2f}", f"${s.portfolio_value:,.2f}",
+            _colored(s.unrealized_pnl, f"${s.unrealized_pnl:+,.2f}"), str(s.trade_count),
+        )
+    total_pnl = total_value - total_initial
+    footer = Text.from_markup(
+        f"\n[bold]Total:[/bold] ${total_value:,.2f} | P&L {_colored(total_pnl, f'${total_pnl:+,.2f}')}\n"
+        "[dim]Press Ctrl+C to stop[/dim]"
+    )
+    return Group(table, footer)
+
+
+class Dashboard:
+    """Live, in-place terminal view refreshed on its own thread"""
+
+    def __init__(self, render: Callable[[], Optional["RenderableType"]], console: Optional["Console"] = None,
+                 refresh_per_second: float = DEFAULT_REFRESH_PER_SECOND):
+        if console is None:
+            from rich.console import Console
+            console = Console()
+        self.render = render
+        self.console = console
+        self.refresh_per_second = refresh_per_second
+        self._live: Optional["Live"] = None
+
+    def _renderable(self) -> "RenderableType":
+        renderable = self.render()
+        if renderable is None:
+            from rich.text import Text
+            return Text("Waiting for first price...", style="dim")
+        return renderable
+
+    def start(self):
+        # Imported here: headless runs never draw a live view
+        from rich.live import Live
+        self._live = Live(
+            get_renderable=self._renderable,
+            console=self.console,
+            refresh_per_second=self.refresh_per_second,
+            transient=False,
+        )
+        self._live.start()
+
+    def stop(self):
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
@@ -0,0 +1,202 @@
+"""
+Exchange filter cache for the Asymmetric Grid Bot
+Fetches symbol filters for just the requested symbols, persists the parsed result to disk
+with a TTL so warm restarts never touch the network, and precomputes rounding precision.
+"""
+
+import json
+import math
+import os
+import tempfile
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Dict, Iterable, List, Optional
+
+# === Constants ===
+CACHE_DIR = "cache"
+CACHE_FILE = os.path.join(CACHE_DIR, "exchange_filters.json")
+CACHE_TTL = 24 * 60 * 60    # Filters rarely change; refresh once a day
+STEP_EPSILON = 1e-9         # Steps; absorbs float error in quantity / step (0.3 / 0.1 = 2.9999999999999996)
+
+
+def step_precision(step: float) -> int:
+    """Decimal places for a step/tick size (0.001 -> 3)"""
+    if step <= 0:
+        return 8
+    return int(round(-math.log(step, 10), 0))
+
+
+def floor_to_step(quantity: float, step: float, precision: int) -> float:
+    """Largest whole number of steps not above quantity (never more than the balance it came from)"""
+    if step <= 0:
+        return quantity
+    return round(math.floor(quantity / step + STEP_EPSILON) * step, precision)
+
+
+# === Filters ===
+@dataclass
+class SymbolFilters:
+    """Parsed trading filters for one symbol"""
+    symbol: str
+    # LOT_SIZE
+    step_size: float = 0.0
+    min_qty: float = 0.0
+    max_qty: float = 0.0
+    # PRICE_FILTER
+    tick_size: float = 0.0
+    min_price: float = 0.0
+    max_price: float = 0.0
+    # MIN_NOTIONAL / NOTIONAL
+    min_notional: float = 0.0
+    max_notional: float = 0.0
+    min_notional_applies_to_market: bool = True
+    max_notional_applies_to_market: bool = False
+    # MARKET_LOT_SIZE (0 = defer to LOT_SIZE)
+    market_step_size: float = 0.0
+    market_min_qty: float = 0.0
+    market_max_qty: float = 0.0
+    # Computed once, not per order
+    quantity_precision: int = field(init=False, default=8)
+    market_quantity_precision: int = field(init=False, default=8)
+    price_precision: int = field(init=False, default=8)
+
+    def __post_init__(self):
+        self.quantity_precision = step_precision(self.step_size)
+        self.market_quantity_precision = step_precision(self.market_step_size or self.step_size)
+        self.price_precision = step_precision(self.tick_size)
+
+    def round_quantity(self, quantity: float, market: bool = False) -> float:
+        """Round quantity down to the LOT_SIZE step (MARKET_LOT_SIZE step for market orders, if set)"""
+        if market and self.market_step_size > 0:
+            return floor_to_step(quantity, self.market_step_size, self.market_quantity_precision)
+        return floor_to_step(quantity, self.step_size, self.quantity_precision)
+
+    def format_quantity(self, quantity: float, market: bool = False) -> str:
+        """Quantity as the order parameter string, at the step's precision"""
+        precision = self.market_quantity_precision if market else self.quantity_precision
+        return f"{quantity:.{precision}f}"
+
+    def round_price(self, price: float) -> float:
+        """Round price to the PRICE_FILTER tick"""
+        return round(price, self.price_precision)
+
+    def check_order(self, quantity: float, price: float, market: bool = True) -> Optional[str]:
+        """Return why an order would be rejected, or None if it passes every filter"""
+        min_qty = max(self.min_qty, self.market_min_qty) if market else self.min_qty
+        max_qty = self.max_qty
+        if market and self.market_max_qty > 0:
+            max_qty = min(max_qty, self.market_max_qty) if max_qty > 0 else self.market_max_qty
+        if quantity < min_qty:
+            return f"quantity {quantity} below minimum {min_qty}"
+        if max_qty > 0 and quantity > max_qty:
+            return f"quantity {quantity} above maximum {max_qty}"
+        if not market:
+            if self.min_price > 0 and price < self.min_price:
+                return f"price {price} below minimum {self.min_price}"
+            if self.max_price > 0 and price > self.max_price:
+                return f"price {price} above maximum {self.max_price}"
+        notional = quantity * price
+        if self.min_notional > 0 and (not market or self.min_notional_applies_to_market) and notional < self.min_notional:
+            return f"notional {notional:.2f} below minimum {self.min_notional}"
+        if self.max_notional > 0 and (not market or self.max_notional_applies_to_market) and notional > self.max_notional:
+            return f"notional {notional:.2f} above maximum {self.max_notional}"
+        return None
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data.pop('quantity_precision')
+        data.pop('market_quantity_precision')
+        data.pop('price_precision')
+        return data
+
+
+def parse_symbol_filters(symbol_info: dict) -> SymbolFilters:
+    """Build SymbolFilters from one entry of the exchangeInfo 'symbols' list"""
+    values = {}
+    for item in symbol_info.get('filters', []):
+        kind = item.get('filterType')
+        if kind == 'LOT_SIZE':
+            values.update(step_size=float(item['stepSize']), min_qty=float(item['minQty']),
+                          max_qty=float(item['maxQty']))
+        elif kind == 'PRICE_FILTER':
+            values.update(tick_size=float(item['tickSize']), min_price=float(item['minPrice']),
+                          max_price=float(item['maxPrice']))
+        elif kind == 'MARKET_LOT_SIZE':
+            values.update(market_step_size=float(item['stepSize']), market_min_qty=float(item['minQty']),
+                          market_max_qty=float(item['maxQty']))
+        elif kind == 'MIN_NOTIONAL':
+            values.update(min_notional=float(item['minNotional']),
+                          min_notional_applies_to_market=bool(item.get('applyToMarket', True)))
+        elif kind == 'NOTIONAL':
+            values.update(min_notional=float(item.get('minNotional', 0)),
+                          max_notional=float(item.get('maxNotional', 0)),
+                          min_notional_applies_to_market=bool(item.get('applyMinToMarket', True)),
+                          max_notional_applies_to_market=bool(item.get('applyMaxToMarket', False)))
+    return SymbolFilters(symbol=symbol_info['symbol'], **values)
+
+
+def fetch_exchange_info(client, symbols: List[str]) -> dict:
+    """exchangeInfo scoped to the given symbols instead of the whole exchange"""
+    if not hasattr(client, "_get"):
+        # Simulated/mock backends only implement the public method
+        return client.get_exchange_info()
+    # python-binance's get_exchange_info() takes no parameters, so pass the
+    # documented `symbols` query parameter through the client's request helper
+    return client._get("exchangeInfo", data={"symbols": json.dumps(symbols, separators=(',', ':'))})
+
+
+# === Cache ===
+class FilterCache:
+    """Disk-backed, TTL-bounded cache of parsed symbol filters"""
+
+    def __init__(self, client=None, path: str = CACHE_FILE, ttl: float = CACHE_TTL):
+        self.client = client
+        self.path = path
+        self.ttl = ttl
+        self._entries: Dict[str, dict] = self._load()
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # A temp file of our own: supervised workers may all save at once, and the last replace wins whole
+        fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=f"{os.path.basename(self.path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._entries, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _fresh(self, symbol: str) -> bool:
+        entry = self._entries.get(symbol)
+        return entry is not None and time.time() - entry['fetched_at'] < self.ttl
+
+    def get(self, symbols: Iterable[str]) -> Dict[str, SymbolFilters]:
+        """Filters for every symbol, fetching only the missing or expired ones"""
+        symbols = [s.upper() for s in symbols]
+        missing = [s for s in symbols if not self._fresh(s)]
+        if missing:
+            if self.client is None:
+                raise RuntimeError(f"No cached filters for {missing} and no client to fetch them")
+            self.update(fetch_exchange_info(self.client, missing))
+        return {s: SymbolFilters(**self._entries[s]['filters']) for s in symbols if s in self._entries}
+
+    def update(self, exchange_info: dict):
+        """Store every symbol from an exchangeInfo payload and persist the cache"""
+        now = time.time()
+        for symbol_info in exchange_info.get('symbols', []):
+            filters = parse_symbol_filters(symbol_info)
+            self._entries[filters.symbol] = {'fetched_at': now, 'filters': filters.to_dict()}
+        self._save()
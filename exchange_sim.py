@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Local exchange simulator for the Asymmetric Grid Bot
+A drop-in for the Binance Client calls the bot makes (get_symbol_ticker, get_exchange_info,
+order_market_buy/sell, ...) backed by a recorded tape instead of the network:
+- Market orders walk recorded order-book depth (or a synthetic book around a price tape)
+  level by level, consuming liquidity until the next book update
+- Maker/taker fees are charged per fill in the received asset, like Binance
+- Time is virtual: the bot's sleeps advance the tape instantly, so days replay in minutes
+
+Usage:
+    python3 exchange_sim.py SOLUSDT-1m-2026-01.csv --investment 1000 --taker-fee 0.001
+    python3 exchange_sim.py prices.csv --depth depth.jsonl --interval 1
+"""
+
+import argparse
+import json
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from mock_exchange import MockExchange, MockAPIError, MockOrder
+
+# === Constants ===
+DEFAULT_SPREAD_BPS = 2.0         # Synthetic book: best bid/ask distance from the tape price
+DEFAULT_LEVEL_STEP_BPS = 1.0     # Synthetic book: distance between levels
+DEFAULT_LEVEL_NOTIONAL = 5000.0  # Synthetic book: quote value resting on each level
+DEFAULT_DEPTH_LEVELS = 20
+MIN_EPOCH_MS = 10 ** 12          # Tape times below this are row numbers, not epoch milliseconds
+
+Level = List[float]              # [price, quantity], mutated as our orders consume it
+
+
+class SimulationFinished(BaseException):
+    """
+    Raised from the virtual clock once the tape is exhausted
+    Derives from BaseException so the bot's `except Exception` loop-error handlers let it through
+    """
+
+
+# === Virtual Clock ===
+class VirtualClock:
+    """time/sleep replacement that jumps instead of waiting and drives the exchange forward"""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+        self.exchange: Optional["SimulatedExchange"] = None
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += max(0.0, seconds)
+        if self.exchange is not None:
+            self.exchange.advance(self.now)
+
+
+# === Tape Loading ===
+def load_depth(path: str) -> Tuple[np.ndarray, List[Tuple[List[Level], List[Level]]]]:
+    """
+    Load recorded order-book snapshots from JSON lines, one book per line:
+    {"E": <ms>, "bids": [[price, qty], ...], "asks": [[price, qty], ...]}
+    ("T"/"ts" are accepted for the time, "b"/"a" for the sides, as in Binance depth payloads)
+    """
+    times, books = [], []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            ts = record.get("E", record.get("T", record.get("ts")))
+            bids = record.get("bids", record.get("b", []))
+            asks = record.get("asks", record.get("a", []))
+            times.append(int(ts))
+            books.append((
+                sorted(([float(p), float(q)] for p, q in bids if float(q) > 0), key=lambda level: -level[0]),
+                sorted(([float(p), float(q)] for p, q in asks if float(q) > 0), key=lambda level: level[0]),
+            ))
+    return np.asarray(times, dtype=np.int64), books
+
+
+def synthetic_book(price: float, spread_bps: float = DEFAULT_SPREAD_BPS,
+                   level_step_bps: float = DEFAULT_LEVEL_STEP_BPS, level_notional: float = DEFAULT_LEVEL_NOTIONAL,
+                   levels: int = DEFAULT_DEPTH_LEVELS) -> Tuple[List[Level], List[Level]]:
+    """Evenly spaced bid/ask ladder around a trade price"""
+    quantity = level_notional / price
+    half_spread = spread_bps / 2 / 10_000
+    step = level_step_bps / 10_000
+    bids = [[price * (1 - half_spread - i * step), quantity] for i in range(levels)]
+    asks = [[price * (1 + half_spread + i * step), quantity] for i in range(levels)]
+    return bids, asks
+
+
+# === Simulated Exchange ===
+class SimulatedExchange(MockExchange):
+    """MockExchange driven by a price and/or depth tape on a virtual clock"""
+
+    def __init__(self, symbol: str, base_asset: str, quote_asset: str, clock: VirtualClock,
+                 timestamps: np.ndarray, prices: Optional[np.ndarray] = None,
+                 books: Optional[Sequence[Tuple[List[Level], List[Level]]]] = None,
+                 spread_bps: float = DEFAULT_SPREAD_BPS, level_step_bps: float = DEFAULT_LEVEL_STEP_BPS,
+                 level_notional: float = DEFAULT_LEVEL_NOTIONAL, depth_levels: int = DEFAULT_DEPTH_LEVELS,
+                 **kwargs):
+        if prices is None and books is None:
+            raise ValueError("Need a price tape, a depth tape or both")
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.tape_prices = prices
+        self.books = books
+        if prices is None:
+            # Depth-only tape: trade at the mid
+            self.tape_prices = np.array([(b[0][0] + a[0][0]) / 2 for b, a in books], dtype=np.float64)
+        super().__init__(symbol, base_asset, quote_asset, price=float(self.tape_prices[0]), **kwargs)
+
+        self.clock = clock
+        clock.exchange = self
+        clock.now = self.timestamps[0] / 1000
+        self.spread_bps = spread_bps
+        self.level_step_bps = level_step_bps
+        self.level_notional = level_notional
+        self.depth_levels = depth_levels
+        self.cursor = 0
+        self._book: Optional[Tuple[List[Level], List[Level]]] = None
+        self.fees_paid = {base_asset: 0.0, quote_asset: 0.0}
+
+    def _now_ms(self) -> int:
+        return int(self.clock.now * 1000)
+
+    # --- Tape replay ---
+    def _has_resting_orders(self) -> bool:
+        return any(o.order_type == "LIMIT" and o.status in ("NEW", "PARTIALLY_FILLED") for o in self.orders.values())
+
+    def advance(self, now: float):
+        """Replay the tape up to `now` (seconds); raises SimulationFinished past its end"""
+        last = len(self.timestamps) - 1
+        target = int(np.searchsorted(self.timestamps, int(now * 1000), side='right')) - 1
+        target = min(max(target, self.cursor), last)
+        if target > self.cursor:
+            if self._has_resting_orders():
+                # Every tick can fill a resting order; step through them
+                for i in range(self.cursor + 1, target + 1):
+                    self.cursor = i
+                    self._book = None
+                    self.set_price(float(self.tape_prices[i]))
+            else:
+                self.cursor = target
+                self._book = None
+                self.price = float(self.tape_prices[target])
+        if self.cursor >= last and now * 1000 > self.timestamps[last]:
+            raise SimulationFinished()
+
+    def book(self) -> Tuple[List[Level], List[Level]]:
+        """Current (bids, asks), including liquidity our own orders already took"""
+        if self._book is None:
+            if self.books is not None:
+                bids, asks = self.books[self.cursor]
+                self._book = ([level[:] for level in bids], [level[:] for level in asks])
+            else:
+                self._book = synthetic_book(self.price, self.spread_bps, self.level_step_bps,
+                                            self.level_notional, self.depth_levels)
+        return self._book
+
+    # --- Matching ---
+    def _fill(self, order: MockOrder, quantity: float, price: float, maker: bool) -> dict:
+        event = super()._fill(order, quantity, price, maker)
+        self.fees_paid[event['N']] += float(event['n'])
+        return event
+
+    def _walk(self, levels: List[Level], quantity: Optional[float], quote: Optional[float]) -> List[Tuple[float, float]]:
+        """Take liquidity level by level until quantity (or quote value) is met"""
+        fills = []
+        for level in levels:
+            if level[1] <= 0:
+                continue
+            if quote is not None:
+                take = min(level[1], quote / level[0])
+                quote -= take * level[0]
+            else:
+                take = min(level[1], quantity)
+                quantity -= take
+            if take > 0:
+                fills.append((level[0], take))
+                level[1] -= take
+            if (quote is not None and quote <= 1e-9) or (quantity is not None and quantity <= 1e-12):
+                break
+        return fills
+
+    def _market_order(self, side: str, client_order_id: str, params: dict) -> dict:
+        with self._lock:
+            bids, asks = self.book()
+            levels = asks if side == "BUY" else bids
+            quote = float(params['quoteOrderQty']) if 'quoteOrderQty' in params else None
+            quantity = None if quote is not None else float(params['quantity'])
+
+            # Check funds against the walk before taking anything
+            preview = self._walk([level[:] for level in levels], quantity, quote)
+            if not preview:
+                raise MockAPIError(-2010, "Order book is empty.")
+            needed = sum(p * q for p, q in preview) if side == "BUY" else sum(q for _, q in preview)
+            asset = self.quote_asset if side == "BUY" else self.base_asset
+            if self.free[asset] + 1e-9 < needed:
+                raise MockAPIError(-2010, "Account has insufficient balance for requested action.")
+
+            fills = self._walk(levels, quantity, quote)
+            total_qty = sum(q for _, q in fills)
+            order = MockOrder(next(self._order_ids), client_order_id, side, "MARKET", 0.0, total_qty)
+            self.orders[order.order_id] = order
+            events, response_fills = [], []
+            for price, qty in fills:
+                event = self._fill(order, qty, price, maker=False)
+                events.append(event)
+                response_fills.append({"price": f"{price:.8f}", "qty": f"{qty:.8f}",
+                                       "commission": event['n'], "commissionAsset": event['N'],
+                                       "tradeId": event['t']})
+            if quantity is not None and total_qty < quantity - 1e-12:
+                # Book ran out: Binance fills what it can and expires the rest
+                order.status = "EXPIRED"
+            response = self._order_response(order)
+            response['fills'] = response_fills
+        for event in events:
+            self._broadcast(event)
+        self._broadcast(self._account_position())
+        return response
+
+
+# === Runner ===
+def simulate(config, exchange: SimulatedExchange, clock: VirtualClock):
+    """Run a DualTriggerBot against the simulator until the tape ends; return the bot"""
+    from asymmetric_grid_bot_v211 import DualTriggerBot
+    from exchange_filters import parse_symbol_filters
+
+    filters = parse_symbol_filters(exchange.get_exchange_info()['symbols'][0])
+    bot = DualTriggerBot(config, client=exchange, filters=filters, clock=clock)
+    try:
+        bot.run()
+    except SimulationFinished:
+        pass
+    return bot
+
+
+def print_report(bot, exchange: SimulatedExchange, virtual_seconds: float, wall_seconds: float):
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+
+    price = exchange.price
+    value = bot.calculate_portfolio_value(price)
+    table = Table(title=f"Simulation: {exchange.symbol}", box=box.ROUNDED, border_style="cyan")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green", justify="right")
+    table.add_row("Virtual Time", f"{virtual_seconds / 86400:,.2f} days")
+    table.add_row("Wall Time", f"{wall_seconds:,.2f}s ({virtual_seconds / max(wall_seconds, 1e-9):,.0f}x)")
+    table.add_row("Ticks Replayed", f"{exchange.cursor + 1:,}")
+    table.add_row("Trades", str(bot.trade_count))
+    table.add_row("Final Price", f"${price:,.4f}")
+    table.add_row("Portfolio Value", f"${value:,.2f}")
+    table.add_row("Return", f"{(value / bot.initial_portfolio - 1) * 100:+.2f}%")
+    table.add_row("Realized P&L", f"${bot.ledger.realized_pnl:+,.2f}")
+    table.add_row("Win Rate", f"{bot.ledger.win_rate * 100:.1f}% of {bot.ledger.sells} sells")
+    table.add_row("Max Drawdown", f"{bot.ledger.max_drawdown * 100:.2f}%")
+    table.add_row("Open Position P&L", f"${bot.ledger.unrealized_pnl(price):+,.2f}")
+    table.add_row(f"Fees ({exchange.quote_asset})", f"${exchange.fees_paid[exchange.quote_asset]:,.4f}")
+    table.add_row(f"Fees ({exchange.base_asset})", f"{exchange.fees_paid[exchange.base_asset]:.8f}")
+    table.add_row("Bot vs Exchange Balance",
+                  f"{bot.crypto_balance - exchange.free[exchange.base_asset]:+.8f} {exchange.base_asset} / "
+                  f"{bot.usdt_balance - exchange.free[exchange.quote_asset]:+.4f} {exchange.quote_asset}")
+    Console().print(table)
+
+
+def main():
+    from backtest import load_prices
+    from asymmetric_grid_bot_v211 import BotConfig, DEFAULT_BUY_OFFSET, DEFAULT_SELL_OFFSET, DEFAULT_TRADE_FRACTION, POLL_INTERVAL
+    from portfolio_runner import split_symbol
+
+    parser = argparse.ArgumentParser(description="Run the bot offline against a simulated exchange on a virtual clock")
+    parser.add_argument("data", nargs="?", help="CSV or Parquet price tape (klines or ticks)")
+    parser.add_argument("--depth", help="JSON-lines order-book tape; market orders walk these levels")
+    parser.add_argument("--symbol", default="SOLUSDT", help="Symbol to simulate (USDT pairs)")
+    parser.add_argument("--investment", type=float, default=1000.0, help="Initial USDT investment")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="Virtual seconds between price polls")
+    parser.add_argument("--tick-ms", type=int, default=1000, help="Milliseconds per row for tapes without epoch timestamps")
+    parser.add_argument("--maker-fee", type=float, default=0.001, help="Maker fee rate")
+    parser.add_argument("--taker-fee", type=float, default=0.001, help="Taker fee rate")
+    parser.add_argument("--spread-bps", type=float, default=DEFAULT_SPREAD_BPS, help="Synthetic book spread (price tapes)")
+    parser.add_argument("--level-notional", type=float, default=DEFAULT_LEVEL_NOTIONAL, help="Synthetic book depth per level")
+    parser.add_argument("--step-size", type=float, default=0.001, help="LOT_SIZE stepSize")
+    parser.add_argument("--tick-size", type=float, default=0.01, help="PRICE_FILTER tickSize")
+    parser.add_argument("--min-notional", type=float, default=5.0, help="NOTIONAL minimum")
+    parser.add_argument("--buy-offset", type=float, default=DEFAULT_BUY_OFFSET)
+    parser.add_argument("--sell-offset", type=float, default=DEFAULT_SELL_OFFSET)
+    parser.add_argument("--trade-fraction", type=float, default=DEFAULT_TRADE_FRACTION)
+    parser.add_argument("--ledger-csv", metavar="PATH", help="Write the bot's trade ledger to a CSV")
+    args = parser.parse_args()
+    if not args.data and not args.depth:
+        parser.error("need a price tape, --depth, or both")
+
+    timestamps, prices, books = None, None, None
+    if args.data:
+        timestamps, prices = load_prices(args.data)
+        if timestamps[0] < MIN_EPOCH_MS:
+            timestamps = np.arange(len(prices), dtype=np.int64) * args.tick_ms
+    if args.depth:
+        depth_times, books = load_depth(args.depth)
+        if prices is not None:
+            # Pair every price with the latest book recorded at or before it
+            indices = np.searchsorted(depth_times, timestamps, side='right') - 1
+            books = [books[max(int(i), 0)] for i in indices]
+        else:
+            timestamps = depth_times
+
+    symbol = args.symbol.upper()
+    base_asset = split_symbol(symbol)
+    clock = VirtualClock()
+    exchange = SimulatedExchange(
+        symbol, base_asset, "USDT", clock, timestamps, prices, books,
+        spread_bps=args.spread_bps, level_notional=args.level_notional,
+        quote_balance=args.investment, maker_fee=args.maker_fee, taker_fee=args.taker_fee,
+        step_size=args.step_size, tick_size=args.tick_size, min_notional=args.min_notional,
+    )
+    config = BotConfig(
+        api_key="", api_secret="", symbol=symbol, base_asset=base_asset, quote_asset="USDT",
+        initial_investment=args.investment, usdt_per_trade=args.investment * args.trade_fraction,
+        paper_trading=True, exchange="sim", headless=True, state_journal=False, poll_interval=args.interval,
+        buy_offset=args.buy_offset, sell_offset=args.sell_offset, trade_fraction=args.trade_fraction,
+        ledger_csv=args.ledger_csv or "",
+    )
+
+    started_virtual = clock.now
+    started = time.perf_counter()
+    bot = simulate(config, exchange, clock)
+    print_report(bot, exchange, clock.now - started_virtual, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Multi-level grid ladder for the Asymmetric Grid Bot
+N buy levels below and N sell levels above the reference price, kept as sorted lists so a tick
+finds every level it crossed with one bisect. Levels are geometric: level k sits where k
+back-to-back trades of the single-trigger grid would have put its trigger,
+    buy_k  = reference * (1 - buy_offset) ** k
+    sell_k = reference * (1 + sell_offset) ** k
+so a gap through k levels is traded as one order of k trade sizes instead of one trade and a lost move.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import List
+
+
+class GridLadder:
+    """Sorted buy/sell levels around a reference price"""
+    __slots__ = ("levels", "buy_multipliers", "sell_multipliers", "buy_levels", "sell_levels")
+
+    def __init__(self, levels: int, buy_offset: float, sell_offset: float):
+        if levels < 1:
+            raise ValueError("A ladder needs at least one level per side")
+        self.levels = levels
+        self.set_offsets(buy_offset, sell_offset)
+        self.buy_levels: List[float] = []
+        self.sell_levels: List[float] = []
+
+    def set_offsets(self, buy_offset: float, sell_offset: float):
+        """Change the level spacing (adaptive offsets); takes effect at the next recenter()"""
+        # Ascending like the price axis: deepest buy first, nearest sell first
+        self.buy_multipliers = [(1 - buy_offset) ** k for k in range(self.levels, 0, -1)]
+        self.sell_multipliers = [(1 + sell_offset) ** k for k in range(1, self.levels + 1)]
+
+    def recenter(self, reference_price: float):
+        """Rebuild both sides around a new reference (after every trade)"""
+        self.buy_levels = [reference_price * m for m in self.buy_multipliers]
+        self.sell_levels = [reference_price * m for m in self.sell_multipliers]
+
+    def buys_crossed(self, price: float) -> int:
+        """Buy levels at or above price (0 if none)"""
+        return len(self.buy_levels) - bisect_left(self.buy_levels, price)
+
+    def sells_crossed(self, price: float) -> int:
+        """Sell levels at or below price (0 if none)"""
+        return bisect_right(self.sell_levels, price)
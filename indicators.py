@@ -0,0 +1,201 @@
+"""
+Incremental volatility indicators for the Asymmetric Grid Bot
+Ticks are folded into fixed-length bars (1 minute, like 1m klines). A tick inside the current bar
+only updates its high/low/close; each bar close updates, in O(1) with fixed-size buffers:
+    ATR           Wilder's average true range (14 bars), as a fraction of the close
+    EWMA          exponentially weighted variance of bar log returns (RiskMetrics lambda 0.94)
+    realized vol  root mean square of bar log returns over 15, 60 and 240 bars
+Adaptive offsets scale the configured buy/sell offsets by one of these measures relative to its own
+slow average (so 1.0 means "as volatile as usual"), clamped to [min_scale, max_scale]. The bot and
+the backtest run this same engine on the same ticks, so adaptive runs replay identically.
+"""
+
+import math
+from typing import List, Optional, Sequence, Tuple
+
+# === Constants ===
+BAR_SECONDS = 60
+ATR_PERIOD = 14
+EWMA_LAMBDA = 0.94
+REALIZED_WINDOWS = (15, 60, 240)    # Bars; the middle window drives the "realized" measure
+BASELINE_HALF_LIFE = 720            # Bars for the slow average each measure is compared with
+MIN_BARS = 15                       # Bars before the scale moves off 1.0
+MEASURES = ("ewma", "atr", "realized")
+RESCALE_STEP = 0.10                 # Triggers are re-placed when the scale moves this much (10%)
+WARMUP_KLINES = 500                 # 1m klines fetched at startup (one request)
+
+
+class VolatilityEngine:
+    """Rolling volatility for one symbol; update() per tick, scale() for the trigger offsets"""
+    __slots__ = ("bar_ms", "measure", "min_scale", "max_scale", "atr_period", "ewma_lambda", "windows",
+                 "baseline_alpha", "bars", "atr", "ewma_var", "baseline", "_tr_sum", "_squares", "_sums",
+                 "_cursor", "_prev_close", "_bar_end", "_high", "_low", "_close")
+
+    def __init__(self, measure: str = "ewma", min_scale: float = 0.5, max_scale: float = 2.0,
+                 bar_seconds: int = BAR_SECONDS, atr_period: int = ATR_PERIOD, ewma_lambda: float = EWMA_LAMBDA,
+                 windows: Sequence[int] = REALIZED_WINDOWS, baseline_half_life: int = BASELINE_HALF_LIFE):
+        if measure not in MEASURES:
+            raise ValueError(f"Unknown volatility measure '{measure}' (expected one of {MEASURES})")
+        if not 0 < min_scale <= 1 <= max_scale:
+            raise ValueError("Offset scale bounds must satisfy 0 < min <= 1 <= max")
+        self.bar_ms = bar_seconds * 1000
+        self.measure = measure
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.atr_period = atr_period
+        self.ewma_lambda = ewma_lambda
+        self.windows = tuple(sorted(windows))
+        self.baseline_alpha = 1 - 0.5 ** (1 / baseline_half_life)
+        self.bars = 0               # Bar returns seen
+        self.atr = 0.0
+        self.ewma_var = 0.0
+        self.baseline = 0.0         # Slow average of the selected measure
+        self._tr_sum = 0.0
+        # Squared returns of the last max(windows) bars and one running sum per window
+        self._squares = [0.0] * self.windows[-1]
+        self._sums = [0.0] * len(self.windows)
+        self._cursor = 0
+        self._prev_close = 0.0
+        # Bar being built from ticks
+        self._bar_end = 0
+        self._high = self._low = self._close = 0.0
+
+    # === Input ===
+    def update(self, timestamp_ms: int, price: float) -> bool:
+        """Fold one tick in; True if it closed the previous bar (the indicators changed)"""
+        if timestamp_ms < self._bar_end:
+            if price > self._high:
+                self._high = price
+            elif price < self._low:
+                self._low = price
+            self._close = price
+            return False
+        closed = self._bar_end > 0
+        if closed:
+            self.add_bar(self._high, self._low, self._close)
+        self._bar_end = timestamp_ms - timestamp_ms % self.bar_ms + self.bar_ms
+        self._high = self._low = self._close = price
+        return closed
+
+    def add_bar(self, high: float, low: float, close: float):
+        """Fold one completed bar in (ticks via update(), or klines when warming up)"""
+        previous = self._prev_close
+        self._prev_close = close
+        if previous <= 0:
+            return
+        true_range = max(high - low, abs(high - previous), abs(low - previous))
+        log_return = math.log(close / previous)
+        square = log_return * log_return
+        bars = self.bars + 1
+        self.bars = bars
+
+        # Wilder: a plain average over the first period, then 1/period smoothing
+        if bars <= self.atr_period:
+            self._tr_sum += true_range
+            self.atr = self._tr_sum / bars
+        else:
+            self.atr += (true_range - self.atr) / self.atr_period
+        self.ewma_var = square if bars == 1 else self.ewma_lambda * self.ewma_var + (1 - self.ewma_lambda) * square
+
+        squares, sums, cursor = self._squares, self._sums, self._cursor
+        size = len(squares)
+        for i, window in enumerate(self.windows):
+            # The square leaving this window (zero until the buffer has filled that far)
+            sums[i] += square - squares[(cursor - window) % size]
+        squares[cursor] = square
+        cursor = (cursor + 1) % size
+        self._cursor = cursor
+        if cursor == 0:
+            # Once per buffer length: resum so add/subtract rounding never accumulates
+            for i, window in enumerate(self.windows):
+                sums[i] = math.fsum(squares[size - window:])
+
+        value = self.value()
+        self.baseline = value if bars == 1 else self.baseline + self.baseline_alpha * (value - self.baseline)
+
+    def warm_up(self, klines: Sequence[Sequence], now_ms: Optional[int] = None) -> int:
+        """Seed from Binance klines ([open_time, open, high, low, close, volume, close_time, ...]).
+        The still-open kline is skipped: live ticks continue that bar. Returns the bars used."""
+        used = 0
+        for kline in klines:
+            if now_ms is not None and int(kline[6]) >= now_ms:
+                break
+            self.add_bar(float(kline[2]), float(kline[3]), float(kline[4]))
+            used += 1
+        return used
+
+    # === Measures ===
+    def realized_vol(self, window: int) -> float:
+        """Per-bar realized volatility over one of the configured windows"""
+        index = self.windows.index(window)
+        count = min(self.bars, window)
+        return math.sqrt(max(self._sums[index], 0.0) / count) if count else 0.0
+
+    @property
+    def ewma_vol(self) -> float:
+        return math.sqrt(self.ewma_var)
+
+    @property
+    def atr_fraction(self) -> float:
+        return self.atr / self._prev_close if self._prev_close > 0 else 0.0
+
+    def value(self) -> float:
+        """The selected measure"""
+        if self.measure == "ewma":
+            return math.sqrt(self.ewma_var)
+        if self.measure == "atr":
+            return self.atr_fraction
+        return self.realized_vol(self.windows[len(self.windows) // 2])
+
+    def scale(self) -> float:
+        """Offset multiplier: current volatility / its slow average, clamped (1.0 until warm)"""
+        if self.bars < MIN_BARS or self.baseline <= 0:
+            return 1.0
+        return min(max(self.value() / self.baseline, self.min_scale), self.max_scale)
+
+
+def needs_rescale(scale_in_use: float, scale: float, step: float = RESCALE_STEP) -> bool:
+    """True when the triggers should be re-placed at the new scale"""
+    return abs(scale / scale_in_use - 1) > step
+
+
+def scale_path(engine: VolatilityEngine, timestamps, prices, start: int = 1) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Replay a tape through the engine as the bot would see it from tick `start` on.
+    Returns per-tick arrays: whether the tick closed a bar, and the scale after it.
+    Bars are cut with NumPy and only bar closes run Python, with the same add_bar() as the bot.
+    """
+    import numpy as np
+
+    n = len(prices)
+    closed = np.zeros(n, dtype=bool)
+    scales = np.ones(n, dtype=np.float64)
+    if start >= n:
+        return closed, scales
+    ticks = np.asarray(prices[start:], dtype=np.float64)
+    bar_ids = np.asarray(timestamps[start:], dtype=np.int64) // engine.bar_ms
+    # First tick of every bar; the bar before it closes on that tick
+    firsts = np.flatnonzero(np.r_[True, bar_ids[1:] != bar_ids[:-1]])
+    highs = np.maximum.reduceat(ticks, firsts)
+    lows = np.minimum.reduceat(ticks, firsts)
+    closes = ticks[np.r_[firsts[1:] - 1, len(ticks) - 1]]
+
+    scale = engine.scale()
+    boundaries: List[int] = []
+    values: List[float] = []
+    for b in range(len(firsts) - 1):
+        engine.add_bar(float(highs[b]), float(lows[b]), float(closes[b]))
+        boundaries.append(start + int(firsts[b + 1]))
+        values.append(engine.scale())
+    scales[start:] = scale
+    if boundaries:
+        closed[boundaries] = True
+        # Piecewise constant between bar closes
+        segment = np.searchsorted(np.asarray(boundaries), np.arange(start, n), side='right') - 1
+        scales[start:] = np.where(segment >= 0, np.asarray(values)[np.maximum(segment, 0)], scale)
+
+    # Leave the engine mid-bar exactly where update() would have
+    last = len(firsts) - 1
+    engine._bar_end = int(bar_ids[-1]) * engine.bar_ms + engine.bar_ms
+    engine._high, engine._low, engine._close = float(highs[last]), float(lows[last]), float(closes[last])
+    return closed, scales
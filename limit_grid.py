@@ -0,0 +1,278 @@
+"""
+Resting limit-order grid mode for the Asymmetric Grid Bot
+Instead of polling the price and sending a market order once a trigger is crossed, keep LIMIT
+orders resting at buy_trigger and sell_trigger. Fills arrive over the user-data stream; when an
+order fills completely the opposite order is cancelled and both are re-placed around the fill.
+"""
+
+import itertools
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional
+
+from request_scheduler import OPEN_ORDERS_WEIGHT, ORDER_WEIGHT, PRIORITY_ORDER
+from user_stream import UserDataStream
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+ACTIVE_STATUSES = ("NEW", "PARTIALLY_FILLED")
+CLIENT_ORDER_PREFIX = "agb"
+
+
+@dataclass
+class RestingOrder:
+    """One of our grid orders and what has filled so far"""
+    client_order_id: str
+    side: str
+    price: float
+    quantity: float
+    trade_size: float
+    order_id: Optional[int] = None
+    filled_qty: float = 0.0
+    filled_quote: float = 0.0
+    base_fee: float = 0.0
+    quote_fee: float = 0.0
+    status: str = "NEW"
+
+
+class LimitGridTrader:
+    """Maintains the resting buy/sell pair for a DualTriggerBot"""
+
+    def __init__(self, bot, stream: Optional[UserDataStream] = None, console: Optional["Console"] = None,
+                 price_interval: float = 5.0):
+        if console is None:
+            from rich.console import Console
+            console = Console()
+        self.bot = bot
+        self.console = console
+        self.config = bot.config
+        self.client = bot.client
+        self.filters = bot.filters
+        self.logger = bot.logger
+        self.metrics = bot.metrics
+        self.stream = stream or UserDataStream(self.client, base_url=self.config.user_stream_url, on_log=self.logger._write)
+        self.price_interval = price_interval
+
+        self.orders: Dict[str, RestingOrder] = {}     # client order id -> order (active and recently retired)
+        self.active: Dict[str, str] = {}              # side -> client order id
+        self._ids = itertools.count(1)
+        self._session = int(time.time())
+
+    # === Order placement ===
+    def _next_client_order_id(self, side: str) -> str:
+        return f"{CLIENT_ORDER_PREFIX}{side[0]}{self._session}x{next(self._ids)}"
+
+    def _format(self, value: float, precision: int) -> str:
+        return f"{value:.{precision}f}"
+
+    def _place(self, side: str, price: float, trade_size: float) -> Optional[RestingOrder]:
+        price = self.filters.round_price(price)
+        quantity = self.filters.round_quantity(trade_size / price)
+        rejection = self.filters.check_order(quantity, price, market=False)
+        if rejection:
+            self.logger.log_warning(f"{side} limit skipped: {rejection}")
+            return None
+        if side == "BUY" and self.bot.usdt_balance < quantity * price:
+            self.logger.log_warning(f"Insufficient USDT for resting buy (need ${quantity * price:.2f})")
+            return None
+        if side == "SELL" and self.bot.crypto_balance < quantity:
+            self.logger.log_warning(f"Insufficient {self.config.base_asset} for resting sell (need {quantity:.6f})")
+            return None
+
+        order = RestingOrder(self._next_client_order_id(side), side, price, quantity, trade_size)
+        # Register before sending: fill events can arrive before the REST response
+        self.orders[order.client_order_id] = order
+        self.active[side] = order.client_order_id
+        place = self.client.order_limit_buy if side == "BUY" else self.client.order_limit_sell
+        started = time.perf_counter_ns()
+        try:
+            response = self.bot.scheduler.call(
+                place, priority=PRIORITY_ORDER, weight=ORDER_WEIGHT,
+                symbol=self.config.symbol,
+                quantity=self.filters.format_quantity(quantity),
+                price=self._format(price, self.filters.price_precision),
+                newClientOrderId=order.client_order_id
+            )
+            order.order_id = response.get('orderId')
+            self.metrics.observe_ns("order_round_trip", time.perf_counter_ns() - started, side=side)
+        except Exception as e:
+            self.orders.pop(order.client_order_id, None)
+            self.active.pop(side, None)
+            self.metrics.inc("order_errors_total", side=side)
+            self.logger.log_error(f"{side} limit order failed: {e}")
+            return None
+        self.logger.log_info(f"Resting {side} {quantity} @ ${price:,.2f} (id {order.client_order_id})")
+        return order
+
+    def place_orders(self):
+        """Place the buy/sell pair at the bot's current triggers"""
+        trade_size = self.bot.get_trade_size(self.bot.reference_price)
+        if "BUY" not in self.active:
+            self._place("BUY", self.bot.buy_trigger, trade_size)
+        if "SELL" not in self.active:
+            self._place("SELL", self.bot.sell_trigger, trade_size)
+
+    def cancel(self, side: str):
+        """Cancel our resting order on one side (fills already received are kept)"""
+        client_order_id = self.active.pop(side, None)
+        if client_order_id is None:
+            return
+        try:
+            self.bot.scheduler.call(self.client.cancel_order, priority=PRIORITY_ORDER, weight=ORDER_WEIGHT,
+                                    symbol=self.config.symbol, origClientOrderId=client_order_id)
+        except Exception as e:
+            # Usually "unknown order": it filled or was cancelled in the meantime
+            self.logger.log_warning(f"Cancel {side} {client_order_id} failed: {e}")
+
+    def cancel_all(self):
+        for side in list(self.active):
+            self.cancel(side)
+
+    def cancel_stale(self):
+        """Cancel grid orders left resting by a previous session that did not shut down cleanly"""
+        try:
+            open_orders = self.bot.scheduler.call(self.client.get_open_orders, priority=PRIORITY_ORDER,
+                                                  weight=OPEN_ORDERS_WEIGHT, symbol=self.config.symbol)
+        except Exception as e:
+            self.logger.log_warning(f"Could not list open orders: {e}")
+            return
+        for order in open_orders:
+            client_order_id = order.get('clientOrderId', '')
+            if client_order_id.startswith(CLIENT_ORDER_PREFIX) and client_order_id not in self.orders:
+                try:
+                    self.bot.scheduler.call(self.client.cancel_order, priority=PRIORITY_ORDER, weight=ORDER_WEIGHT,
+                                            symbol=self.config.symbol, origClientOrderId=client_order_id)
+                    self.logger.log_info(f"Cancelled stale grid order {client_order_id}")
+                except Exception as e:
+                    self.logger.log_warning(f"Cancel stale {client_order_id} failed: {e}")
+
+    # === Fill handling ===
+    def handle_event(self, event: dict):
+        """Apply one user-data stream event"""
+        if event.get('e') != 'executionReport' or event.get('s') != self.config.symbol:
+            return
+        client_order_id = event.get('C') or event.get('c')
+        order = self.orders.get(client_order_id)
+        if order is None:
+            return
+        if order.order_id is None:
+            order.order_id = event.get('i')
+        order.status = event['X']
+
+        if event['x'] == 'TRADE':
+            self._apply_fill(order, float(event['l']), float(event['L']), float(event['n'] or 0), event.get('N'),
+                             event.get('t'))
+
+        if order.status == 'FILLED':
+            self._on_filled(order)
+        elif order.status not in ACTIVE_STATUSES:
+            # Cancelled, expired or rejected: what did fill is a trade (e.g. the opposite order cancelled after a fill)
+            if order.filled_qty > 0:
+                self._book(order)
+                self.bot.save_state(order.side)
+            if self.active.get(order.side) == client_order_id:
+                self.active.pop(order.side)
+                self.logger.log_warning(f"{order.side} order {client_order_id} ended as {order.status}, re-placing")
+                self.place_orders()
+            self.orders.pop(client_order_id, None)
+
+    def _apply_fill(self, order: RestingOrder, quantity: float, price: float, commission: float,
+                    commission_asset: Optional[str], trade_id: Optional[int] = None):
+        bot = self.bot
+        quote = quantity * price
+        if bot.reconciler is not None:
+            # Booked once per trade id (the reconciler may have seen this event already)
+            bot.reconciler.book_fill(trade_id, order.side, quantity, quote, commission, commission_asset)
+        else:
+            if order.side == "BUY":
+                bot.crypto_balance += quantity
+                bot.usdt_balance -= quote
+            else:
+                bot.crypto_balance -= quantity
+                bot.usdt_balance += quote
+            if commission_asset == self.config.base_asset:
+                bot.crypto_balance -= commission
+            elif commission_asset == self.config.quote_asset:
+                bot.usdt_balance -= commission
+        if commission_asset == self.config.base_asset:
+            order.base_fee += commission
+        elif commission_asset == self.config.quote_asset:
+            order.quote_fee += commission
+        order.filled_qty += quantity
+        order.filled_quote += quote
+        if order.filled_qty < order.quantity:
+            self.logger.log_info(f"Partial {order.side} fill {quantity} @ ${price:,.2f} ({order.filled_qty}/{order.quantity})")
+            bot.save_state("PARTIAL_FILL")
+
+    def _book(self, order: RestingOrder):
+        """Count, log and ledger what the order filled (all of it, or the part filled before it ended)"""
+        bot = self.bot
+        average_price = order.filled_quote / order.filled_qty
+        partial = "" if order.status == "FILLED" else f", partial {order.status.lower()}"
+        bot.trade_count += 1
+        self.metrics.inc("orders_total", side=order.side)
+        self.metrics.observe_slippage(order.side, order.price, average_price)
+        bot.logger.log_trade(order.side, average_price, order.filled_qty, order.filled_quote)
+        fee = order.quote_fee + order.base_fee * average_price
+        equity = bot.calculate_portfolio_value(average_price)
+        if order.side == "BUY":
+            bot.last_buy_price = average_price
+            bot.ledger.buy(order.filled_qty - order.base_fee, average_price, order.filled_quote + order.quote_fee, fee, equity=equity)
+            self.console.print(f"[green]✓ BUY[/green] {order.filled_qty:.6f} {self.config.base_asset} @ ${average_price:,.2f} (limit{partial}) | Size: ${order.filled_quote:.2f}")
+        else:
+            # Against the share of the trade size that filled
+            profit = order.filled_quote - order.trade_size * order.filled_qty / order.quantity
+            bot.cumulative_profit += profit
+            bot.last_sell_price = average_price
+            entry = bot.ledger.sell(order.filled_qty + order.base_fee, average_price, order.filled_quote - order.quote_fee, fee, equity=equity)
+            profit_color = "green" if entry.realized_pnl >= 0 else "red"
+            self.console.print(f"[cyan]✓ SELL[/cyan] {order.filled_qty:.6f} {self.config.base_asset} @ ${average_price:,.2f} (limit{partial}) | Size: ${order.filled_quote:.2f} | P&L: [{profit_color}]${entry.realized_pnl:+.2f}[/{profit_color}]")
+
+    def _on_filled(self, order: RestingOrder):
+        bot = self.bot
+        self._book(order)
+        self.orders.pop(order.client_order_id, None)
+        if self.active.get(order.side) == order.client_order_id:
+            self.active.pop(order.side)
+        # Re-center the grid on the fill: cancel the opposite order and place a fresh pair
+        self.cancel_all()
+        bot.set_triggers(order.price)
+        bot.save_state(order.side)
+        self.place_orders()
+
+    # === Main loop ===
+    def run(self):
+        """Keep the grid resting and react to fills until interrupted"""
+        self.stream.start()
+        # Don't rest orders before we can hear about their fills
+        if not self.stream.connected.wait(timeout=30):
+            self.logger.log_warning("User-data stream not connected yet, placing orders anyway")
+        self.cancel_stale()
+        self.place_orders()
+        last_price_check = 0.0
+        try:
+            while True:
+                reconciler = self.bot.reconciler
+                for event in self.stream.wait_for_events(timeout=self.price_interval):
+                    started = time.perf_counter_ns()
+                    self.handle_event(event)
+                    if reconciler is not None:
+                        reconciler.handle_event(event)
+                    self.metrics.observe_ns("handle_event", time.perf_counter_ns() - started)
+                if reconciler is not None:
+                    reconciler.maybe_check()
+                # Fills don't carry the market price; refresh it for the dashboard snapshot
+                now = time.monotonic()
+                if now - last_price_check >= self.price_interval:
+                    current_price = self.bot.get_current_price()
+                    if current_price > 0:
+                        if self.bot.volatility is not None:
+                            # Resting orders keep their prices; the next fill re-places them at the new scale
+                            self.bot.volatility.update(int(self.bot.clock.time() * 1000), current_price)
+                        self.bot.publish_snapshot(current_price)
+                    last_price_check = now
+        finally:
+            self.cancel_all()
+            self.stream.stop()
+            self.logger.log_info("Resting orders cancelled")
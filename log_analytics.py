@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Log analytics for the Asymmetric Grid Bot
+Streams every logs/*.log and logs/*.jsonl file through a generator pipeline
+    files -> complete lines after the indexed byte offset -> parsed records -> per-run aggregates
+and keeps a persistent index in cache/log_index/ (byte offset, identity and aggregates per file,
+plus each file's parsed trades), so a rerun reads only bytes appended since the last one.
+Memory stays bounded by the number of runs, not the size of the logs.
+
+Realized P&L uses the average-cost method over the logged fills (before fees, which the logs
+don't carry). An INITIAL_BUY starts a new position; resumed and rotated files continue the
+previous file's position.
+
+Usage:
+    python3 log_analytics.py                                  # per-symbol summary
+    python3 log_analytics.py --symbol SOLUSDT --runs          # one row per run
+    python3 log_analytics.py --trades-out trades.csv          # full trade history (or .parquet)
+    python3 log_analytics.py --rebuild                        # forget the index and re-read everything
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import zlib
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+# === Constants ===
+LOG_DIR = "logs"
+INDEX_DIR = os.path.join("cache", "log_index")
+INDEX_VERSION = 1
+READ_CHUNK = 1 << 20              # Bytes per read
+HEAD_BYTES = 256                  # Leading bytes hashed to recognise a replaced file
+PARQUET_BATCH = 65536             # Rows per Parquet row group
+
+FILE_PATTERN = re.compile(
+    r"^(?P<symbol>[A-Z0-9]+)_(?P<mode>paper|live)_dual_(?P<stamp>\d{8}_\d{6})(?:_(?P<n>\d+))?\.(?P<ext>log|jsonl)$")
+TEXT_LINE = re.compile(r"^\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] (\w+): (.*)$")
+TRADE_MESSAGE = re.compile(r"^(\w+) \| Price: \$([\d.,]+) \| Amount: ([\d.]+) \| Total: \$([\d.,]+)")
+TRADE_COLUMNS = ("time", "symbol", "mode", "run", "side", "price", "amount", "total",
+                 "realized_pnl", "position", "avg_cost")
+console = Console()
+
+
+# === Parsing ===
+def read_new_lines(path: str, offset: int) -> Iterator[Tuple[int, bytes]]:
+    """(end offset, line) for every complete line after `offset`; a partial last line is left for later"""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        pending = b""
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                return
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                offset += len(line) + 1
+                yield offset, line
+
+
+def parse_line(line: bytes, json_lines: bool) -> Optional[tuple]:
+    """(time, level, side, price, amount, total) with trade fields None for non-trade lines"""
+    try:
+        if json_lines:
+            entry = json.loads(line)
+            level = entry.get("level", "")
+            when = entry.get("ts", "").replace("T", " ")[:19]
+            if level == "TRADE":
+                return when, level, entry["side"], float(entry["price"]), float(entry["amount"]), float(entry["total"])
+            return when, level, None, None, None, None
+        match = TEXT_LINE.match(line.decode("utf-8", "replace"))
+        if match is None:
+            return None
+        when, level, message = match.groups()
+        if level == "TRADE":
+            trade = TRADE_MESSAGE.match(message)
+            if trade is None:
+                return None
+            side, price, amount, total = trade.groups()
+            return when, level, side, float(price.replace(",", "")), float(amount), float(total.replace(",", ""))
+        return when, level, None, None, None, None
+    except (ValueError, KeyError):
+        return None
+
+
+# === Aggregation ===
+def new_stats(symbol: str, mode: str, run: str) -> dict:
+    return {
+        "symbol": symbol, "mode": mode, "run": run, "first_time": None, "last_time": None,
+        "lines": 0, "errors": 0, "warnings": 0, "buys": 0, "sells": 0, "initial_buys": 0,
+        "buy_volume": 0.0, "sell_volume": 0.0, "realized_pnl": 0.0,
+        "first_size": None, "last_size": None, "max_size": 0.0,
+        # Average-cost position at the end of what has been read
+        "position": 0.0, "cost": 0.0,
+    }
+
+
+def apply_record(stats: dict, record: tuple) -> Optional[tuple]:
+    """Fold one parsed line into a file's stats; returns the trade row for trade lines"""
+    when, level, side, price, amount, total = record
+    stats["lines"] += 1
+    if stats["first_time"] is None:
+        stats["first_time"] = when
+    stats["last_time"] = when
+    if level == "ERROR":
+        stats["errors"] += 1
+        return None
+    if level == "WARNING":
+        stats["warnings"] += 1
+        return None
+    if level != "TRADE":
+        return None
+
+    realized = 0.0
+    if side == "INITIAL_BUY":
+        # A fresh 50/50 split: the bot forgets whatever an earlier run held
+        stats["initial_buys"] += 1
+        stats["position"], stats["cost"] = amount, total
+    elif side == "BUY":
+        stats["buys"] += 1
+        stats["buy_volume"] += total
+        stats["position"] += amount
+        stats["cost"] += total
+    else:
+        stats["sells"] += 1
+        stats["sell_volume"] += total
+        average = stats["cost"] / stats["position"] if stats["position"] > 0 else price
+        sold = min(amount, stats["position"])
+        realized = total - average * amount
+        stats["realized_pnl"] += realized
+        stats["position"] -= sold
+        stats["cost"] -= average * sold
+    if side != "INITIAL_BUY":
+        if stats["first_size"] is None:
+            stats["first_size"] = total
+        stats["last_size"] = total
+        stats["max_size"] = max(stats["max_size"], total)
+    average = stats["cost"] / stats["position"] if stats["position"] > 0 else 0.0
+    return (when, stats["symbol"], stats["mode"], stats["run"], side, price, amount, total,
+            round(realized, 8), round(stats["position"], 8), round(average, 8))
+
+
+# === Index ===
+def _file_head(path: str, length: int = HEAD_BYTES) -> Tuple[int, int]:
+    """(crc32, length) of a file's first bytes"""
+    with open(path, "rb") as f:
+        head = f.read(length)
+    return zlib.crc32(head), len(head)
+
+
+class LogIndex:
+    """Per-file byte offsets, identities and aggregates, plus each file's parsed trades (CSV)"""
+
+    def __init__(self, log_dir: str = LOG_DIR, index_dir: str = INDEX_DIR):
+        self.log_dir = log_dir
+        self.index_dir = index_dir
+        self.trades_dir = os.path.join(index_dir, "trades")
+        self.index_path = os.path.join(index_dir, "index.json")
+        os.makedirs(self.trades_dir, exist_ok=True)
+        self.files: Dict[str, dict] = {}
+        try:
+            with open(self.index_path) as f:
+                document = json.load(f)
+            if document.get("version") == INDEX_VERSION and document.get("log_dir") == os.path.abspath(log_dir):
+                self.files = document["files"]
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+
+    def save(self):
+        tmp = f"{self.index_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": INDEX_VERSION, "log_dir": os.path.abspath(self.log_dir), "files": self.files}, f)
+        os.replace(tmp, self.index_path)
+
+    def clear(self):
+        for name in list(self.files):
+            self._drop(name)
+        self.save()
+
+    def _drop(self, name: str):
+        self.files.pop(name, None)
+        try:
+            os.remove(self._trades_path(name))
+        except FileNotFoundError:
+            pass
+
+    def _trades_path(self, name: str) -> str:
+        return os.path.join(self.trades_dir, name + ".csv")
+
+    def _log_files(self) -> List[Tuple[tuple, str, re.Match]]:
+        found = []
+        for name in os.listdir(self.log_dir):
+            match = FILE_PATTERN.match(name)
+            if match:
+                order = (match["symbol"], match["mode"], match["stamp"], int(match["n"] or 0))
+                found.append((order, name, match))
+        return sorted(found)
+
+    def update(self) -> Tuple[int, int]:
+        """Read new bytes from every log file; returns (files read, bytes read)"""
+        present = self._log_files()
+        names = {name for _, name, _ in present}
+        invalidated = set()       # (symbol, mode) chains whose later files must be re-read
+        for name in [n for n in self.files if n not in names]:
+            stats = self.files[name]["stats"]
+            invalidated.add((stats["symbol"], stats["mode"]))
+            self._drop(name)
+
+        files_read = bytes_read = 0
+        previous: Dict[Tuple[str, str], Optional[dict]] = {}
+        for order, name, match in present:
+            chain = (match["symbol"], match["mode"])
+            path = os.path.join(self.log_dir, name)
+            size = os.path.getsize(path)
+            entry = self.files.get(name)
+            stale = (entry is None or chain in invalidated or size < entry["offset"]
+                     or (entry["offset"] and list(_file_head(path, entry["head"][1])) != entry["head"]))
+            if stale:
+                if entry is not None:
+                    invalidated.add(chain)
+                self._drop(name)
+                # Carry the previous file's open position into this one (resumed/rotated runs)
+                stats = new_stats(match["symbol"], match["mode"], match["stamp"])
+                before = previous.get(chain)
+                if before is not None:
+                    stats["position"], stats["cost"] = before["position"], before["cost"]
+                entry = self.files[name] = {"offset": 0, "head": None, "stats": stats}
+            if size > entry["offset"]:
+                start = entry["offset"]
+                entry["offset"] = self._consume(path, name, entry, match["ext"] == "jsonl")
+                if entry["head"] is None or entry["head"][1] < HEAD_BYTES:
+                    entry["head"] = list(_file_head(path))
+                if entry["offset"] > start:
+                    files_read += 1
+                    bytes_read += entry["offset"] - start
+                    # Positions carried into this chain's later files are now out of date
+                    invalidated.add(chain)
+            previous[chain] = entry["stats"]
+        self.save()
+        return files_read, bytes_read
+
+    def _consume(self, path: str, name: str, entry: dict, json_lines: bool) -> int:
+        stats = entry["stats"]
+        offset = entry["offset"]
+        with open(self._trades_path(name), "a", newline="") as out:
+            # Drop rows written after the last saved index (a run interrupted before save())
+            out.truncate(entry.get("trades_bytes", 0))
+            out.seek(0, os.SEEK_END)
+            writer = csv.writer(out)
+            for offset, line in read_new_lines(path, offset):
+                record = parse_line(line, json_lines)
+                if record is None:
+                    continue
+                row = apply_record(stats, record)
+                if row is not None:
+                    writer.writerow(row)
+            entry["trades_bytes"] = out.tell()
+        return offset
+
+    # === Queries ===
+    def runs(self, symbol: Optional[str] = None) -> List[dict]:
+        """Per-file stats in chronological order"""
+        entries = [e["stats"] for _, e in sorted(self.files.items(), key=lambda item: (
+            item[1]["stats"]["symbol"], item[1]["stats"]["mode"], item[0]))]
+        return [s for s in entries if symbol is None or s["symbol"] == symbol]
+
+    def trades(self, symbol: Optional[str] = None) -> Iterator[tuple]:
+        """Every parsed trade, file by file in chronological order (streamed from the index)"""
+        for stats_name in sorted(self.files, key=lambda n: (self.files[n]["stats"]["symbol"],
+                                                           self.files[n]["stats"]["mode"], n)):
+            stats = self.files[stats_name]["stats"]
+            if symbol is not None and stats["symbol"] != symbol:
+                continue
+            try:
+                with open(self._trades_path(stats_name), newline="") as f:
+                    for row in csv.reader(f):
+                        yield (row[0], row[1], row[2], row[3], row[4], float(row[5]), float(row[6]),
+                               float(row[7]), float(row[8]), float(row[9]), float(row[10]))
+            except FileNotFoundError:
+                continue
+
+
+def summarize(runs: List[dict]) -> List[dict]:
+    """Merge per-file stats into one row per symbol and mode"""
+    merged: Dict[Tuple[str, str], dict] = {}
+    for stats in runs:
+        key = (stats["symbol"], stats["mode"])
+        row = merged.get(key)
+        if row is None:
+            row = merged[key] = dict(stats, runs=0, hours=0.0)
+            for field in ("lines", "errors", "warnings", "buys", "sells", "initial_buys",
+                          "buy_volume", "sell_volume", "realized_pnl", "max_size"):
+                row[field] = 0
+        row["runs"] += 1
+        for field in ("lines", "errors", "warnings", "buys", "sells", "initial_buys",
+                      "buy_volume", "sell_volume", "realized_pnl"):
+            row[field] += stats[field]
+        row["max_size"] = max(row["max_size"], stats["max_size"])
+        if stats["first_size"] is not None:
+            if row["first_size"] is None:
+                row["first_size"] = stats["first_size"]
+            row["last_size"] = stats["last_size"]
+        row["hours"] += _hours(stats)
+        row["last_time"] = stats["last_time"] or row["last_time"]
+    return list(merged.values())
+
+
+def _hours(stats: dict) -> float:
+    if not stats["first_time"] or not stats["last_time"]:
+        return 0.0
+    start = datetime.fromisoformat(stats["first_time"])
+    end = datetime.fromisoformat(stats["last_time"])
+    return max(0.0, (end - start).total_seconds() / 3600)
+
+
+# === Output ===
+def print_table(rows: List[dict], title: str, per_run: bool = False):
+    table = Table(title=title, box=box.ROUNDED, border_style="cyan")
+    columns = ["Symbol", "Run" if per_run else "Runs", "Trades", "Realized P&L", "Volume (Buy/Sell)",
+               "Trade Size", "Growth", "Errors", "Warnings", "Last Entry"]
+    for column in columns:
+        if column == "Symbol":
+            table.add_column(column, style="cyan", no_wrap=True)
+        else:
+            table.add_column(column, style="green", justify="right")
+    for row in rows:
+        hours = row["hours"] if "hours" in row else _hours(row)
+        first, last = row["first_size"], row["last_size"]
+        pnl_color = "green" if row["realized_pnl"] >= 0 else "red"
+        errors = str(row["errors"])
+        if hours > 0:
+            errors += f" ({row['errors'] / hours:.2f}/h)"
+        table.add_row(
+            f"{row['symbol']} ({row['mode']})",
+            row["run"] if per_run else str(row["runs"]),
+            f"{row['buys'] + row['sells']} ({row['buys']}B/{row['sells']}S)",
+            f"[{pnl_color}]${row['realized_pnl']:+,.2f}[/{pnl_color}]",
+            f"${row['buy_volume']:,.0f} / ${row['sell_volume']:,.0f}",
+            f"${first:,.2f} → ${last:,.2f}" if first else "",
+            f"{(last / first - 1) * 100:+.1f}%" if first else "",
+            errors,
+            str(row["warnings"]),
+            row["last_time"] or "",
+        )
+    console.print(table)
+
+
+def write_trades(trades: Iterator[tuple], path: str) -> int:
+    """Stream the trade history to CSV or Parquet (by extension); returns rows written"""
+    count = 0
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Writing Parquet requires pyarrow (pip install pyarrow)")
+        schema = pa.schema([(c, pa.string()) for c in TRADE_COLUMNS[:5]] +
+                           [(c, pa.float64()) for c in TRADE_COLUMNS[5:]])
+        with pq.ParquetWriter(path, schema) as writer:
+            batch: List[tuple] = []
+            for row in trades:
+                batch.append(row)
+                if len(batch) >= PARQUET_BATCH:
+                    writer.write_table(pa.Table.from_pylist([dict(zip(TRADE_COLUMNS, r)) for r in batch], schema))
+                    count += len(batch)
+                    batch = []
+            if batch:
+                writer.write_table(pa.Table.from_pylist([dict(zip(TRADE_COLUMNS, r)) for r in batch], schema))
+                count += len(batch)
+        return count
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(TRADE_COLUMNS)
+        for row in trades:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trade history, P&L and error rates from the bot's log files")
+    parser.add_argument("--logs", default=LOG_DIR, help="Log directory")
+    parser.add_argument("--index-dir", default=INDEX_DIR, help="Where the byte-offset index is kept")
+    parser.add_argument("--symbol", help="Only this symbol (e.g. SOLUSDT)")
+    parser.add_argument("--runs", action="store_true", help="One row per log file instead of per symbol")
+    parser.add_argument("--trades-out", help="Write the trade history to this .csv or .parquet file")
+    parser.add_argument("--rebuild", action="store_true", help="Discard the index and re-read every log")
+    args = parser.parse_args()
+
+    symbol = args.symbol.upper() if args.symbol else None
+    index = LogIndex(args.logs, args.index_dir)
+    if args.rebuild:
+        index.clear()
+    files_read, bytes_read = index.update()
+    console.print(f"[dim]{len(index.files)} log files indexed, {bytes_read / 1e6:,.2f} MB new in {files_read} file(s)[/dim]")
+
+    runs = index.runs(symbol)
+    if not runs:
+        console.print("[yellow]No matching log files[/yellow]")
+        return
+    if args.runs:
+        print_table(runs, "📜 Log Analytics - Runs", per_run=True)
+    else:
+        print_table(summarize(runs), "📜 Log Analytics")
+    if args.trades_out:
+        count = write_trades(index.trades(symbol), args.trades_out)
+        console.print(f"[green]Wrote {count:,} trades to {args.trades_out}[/green]")
+
+
+if __name__ == "__main__":
+    main()
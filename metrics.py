@@ -0,0 +1,210 @@
+"""
+Latency and event metrics for the Asymmetric Grid Bot
+Fixed-bucket histograms and counters cheap enough for the trading path (one bisect and a few
+adds per observation, no allocation), a Prometheus text endpoint and a shutdown summary.
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# === Constants ===
+METRIC_PREFIX = "grid_bot"
+METRICS_HOST = "127.0.0.1"
+# 1µs .. ~30s, four buckets per decade
+LATENCY_BUCKETS = tuple(m * 10.0 ** e for e in range(-6, 2) for m in (1.0, 1.8, 3.2, 5.6))
+# Signed slippage in basis points (positive = worse than the price that fired the trigger)
+SLIPPAGE_BUCKETS = (-50, -20, -10, -5, -2, -1, 0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """
+    Cumulative-on-export histogram over fixed upper bounds
+    observe() takes no lock: a lock would double its cost, and the only race (two threads
+    updating the same histogram within a few bytecodes) can at worst drop one sample
+    """
+    __slots__ = ("bounds", "counts", "count", "total", "min", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)    # Last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                upper = min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+                lower = max(self.bounds[i - 1], self.min) if i > 0 else self.min
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.max
+
+
+class Metrics:
+    """Named histograms and counters, optionally labelled (e.g. side="BUY")"""
+
+    def __init__(self, prefix: str = METRIC_PREFIX):
+        self.prefix = prefix
+        self.histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self.counters: Dict[Tuple[str, Tuple], int] = {}
+        self._stages: Dict[Tuple, Histogram] = {}    # (stage, side) -> histogram, skips the label sort
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, bounds: Sequence[float] = LATENCY_BUCKETS, **labels) -> Histogram:
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, Histogram(bounds))
+        return histogram
+
+    def observe_ns(self, stage: str, elapsed_ns: int, side: Optional[str] = None):
+        """Record a stage duration measured with time.perf_counter_ns()"""
+        histogram = self._stages.get((stage, side))
+        if histogram is None:
+            labels = {"stage": stage} if side is None else {"stage": stage, "side": side}
+            histogram = self._stages[(stage, side)] = self.histogram("latency_seconds", **labels)
+        histogram.observe(elapsed_ns / 1e9)
+
+    def observe_slippage(self, side: str, expected: float, actual: float):
+        """Record fill price vs. the price that fired the trigger, in basis points"""
+        if expected <= 0:
+            return
+        bps = (actual - expected) / expected * 10_000
+        if side == "SELL":
+            bps = -bps
+        self.histogram("slippage_bps", SLIPPAGE_BUCKETS, side=side).observe(bps)
+
+    def inc(self, name: str, amount: int = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    # === Export ===
+    def _series(self, name: str, labels: Tuple, extra: str = "") -> str:
+        parts = [f'{k}="{v}"' for k, v in labels]
+        if extra:
+            parts.append(extra)
+        return f"{self.prefix}_{name}{{{','.join(parts)}}}" if parts else f"{self.prefix}_{name}"
+
+    def prometheus_text(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items(), key=lambda item: item[0])
+        lines: List[str] = []
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {self.prefix}_{name} counter")
+                typed.add(name)
+            lines.append(f"{self._series(name, labels)} {value}")
+        for (name, labels), h in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {self.prefix}_{name} histogram")
+                typed.add(name)
+            cumulative = 0
+            bounds = [f"{b:g}" for b in h.bounds] + ["+Inf"]
+            for bound, n in zip(bounds, h.counts):
+                cumulative += n
+                series = self._series(name + "_bucket", labels, 'le="%s"' % bound)
+                lines.append(f"{series} {cumulative}")
+            lines.append(f"{self._series(name + '_sum', labels)} {h.total}")
+            lines.append(f"{self._series(name + '_count', labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def has_data(self) -> bool:
+        return bool(self.counters) or any(h.count for h in self.histograms.values())
+
+    def summary_table(self, title: str = "Latency & Execution Metrics"):
+        """Rich table of per-stage percentiles, slippage and counters"""
+        from rich.table import Table
+        from rich import box
+
+        table = Table(title=title, box=box.ROUNDED, border_style="cyan")
+        for column in ("Metric", "Count", "p50", "p90", "p99", "Max", "Mean"):
+            if column == "Metric":
+                table.add_column(column, style="cyan", no_wrap=True)
+            else:
+                table.add_column(column, style="green", justify="right")
+        for (name, labels), h in sorted(self.histograms.items(), key=lambda item: item[0]):
+            if not h.count:
+                continue
+            values = dict(labels)
+            if name == "latency_seconds":
+                label = values.pop("stage")
+                fmt = _format_seconds
+            else:
+                label = "slippage"
+                fmt = lambda v: f"{v:+.2f} bps"
+            if values:
+                label += f" ({','.join(str(v) for v in values.values())})"
+            table.add_row(label, str(h.count), fmt(h.quantile(0.5)), fmt(h.quantile(0.9)),
+                          fmt(h.quantile(0.99)), fmt(h.max), fmt(h.total / h.count))
+        for (name, labels), value in sorted(self.counters.items()):
+            label = name + (f"{{{','.join(f'{k}={v}' for k, v in labels)}}}" if labels else "")
+            table.add_row(label, str(value), "", "", "", "", "")
+        return table
+
+
+def _format_seconds(value: float) -> str:
+    if value < 1e-3:
+        return f"{value * 1e6:.1f} µs"
+    if value < 1:
+        return f"{value * 1e3:.2f} ms"
+    return f"{value:.2f} s"
+
+
+# === HTTP endpoint ===
+class MetricsServer:
+    """Serves GET /metrics on a local port from a daemon thread"""
+
+    def __init__(self, metrics: Metrics, port: int, host: str = METRICS_HOST):
+        # Imported here: most runs never serve metrics
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,349 @@
+"""
+Local mock exchange for the Asymmetric Grid Bot
+Implements the subset of the python-binance Client API the bot uses, matches resting LIMIT
+orders against prices you feed it (with optional partial fills), and pushes executionReport /
+outboundAccountPosition events over a local user-data WebSocket, like Binance does.
+"""
+
+import itertools
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from websockets.sync.server import serve
+
+
+class MockAPIError(Exception):
+    """Raised where Binance would answer with an API error"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"APIError(code={code}): {message}")
+        self.code = code
+        self.message = message
+
+
+@dataclass
+class MockOrder:
+    """One order on the mock book"""
+    order_id: int
+    client_order_id: str
+    side: str
+    order_type: str
+    price: float
+    quantity: float
+    filled: float = 0.0
+    filled_quote: float = 0.0
+    status: str = "NEW"
+
+    @property
+    def remaining(self) -> float:
+        return self.quantity - self.filled
+
+
+class MockExchange:
+    """In-process stand-in for Binance spot: one symbol, resting orders, user-data events"""
+
+    def __init__(self, symbol: str, base_asset: str, quote_asset: str = "USDT", price: float = 100.0,
+                 base_balance: float = 0.0, quote_balance: float = 10000.0,
+                 maker_fee: float = 0.001, taker_fee: float = 0.001,
+                 step_size: float = 0.001, tick_size: float = 0.01, min_notional: float = 5.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.symbol = symbol
+        self.base_asset = base_asset
+        self.quote_asset = quote_asset
+        self.price = price
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.step_size = step_size
+        self.tick_size = tick_size
+        self.min_notional = min_notional
+        self.free = {base_asset: base_balance, quote_asset: quote_balance}
+        self.locked = {base_asset: 0.0, quote_asset: 0.0}
+
+        self.orders: Dict[int, MockOrder] = {}
+        self._order_ids = itertools.count(1)
+        self._trade_ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._clients = set()
+        self._server = None
+        self._server_thread: Optional[threading.Thread] = None
+        self._host = host
+        self._port = port
+
+    # --- WebSocket user-data stream ---
+    def start(self):
+        """Start the local user-data WebSocket server"""
+        self._server = serve(self._handle_client, self._host, self._port)
+        self._port = self._server.socket.getsockname()[1]
+        self._server_thread = threading.Thread(target=self._server.serve_forever, name="mock-exchange", daemon=True)
+        self._server_thread.start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server_thread.join(5)
+            self._server = None
+
+    @property
+    def stream_url(self) -> str:
+        """Base URL to hand to UserDataStream / PriceStream"""
+        return f"ws://{self._host}:{self._port}/ws"
+
+    def _handle_client(self, ws):
+        path = ws.request.path
+        with self._lock:
+            self._clients.add((ws, path))
+        try:
+            for _ in ws:
+                pass
+        finally:
+            with self._lock:
+                self._clients.discard((ws, path))
+
+    def _broadcast(self, event: dict, stream: Optional[str] = None):
+        with self._lock:
+            clients = list(self._clients)
+        if not clients:
+            return
+        payload = json.dumps(event)
+        for ws, path in clients:
+            if stream is not None and not path.endswith(stream):
+                continue
+            try:
+                ws.send(payload)
+            except Exception:
+                pass
+
+    def wait_for_subscribers(self, count: int = 1, timeout: float = 5.0) -> bool:
+        """Block until `count` stream clients are connected (handy in tests)"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if len(self._clients) >= count:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    # --- Events ---
+    def _now_ms(self) -> int:
+        """Event timestamp (wall clock here; simulators substitute their own clock)"""
+        return int(time.time() * 1000)
+
+    def _execution_report(self, order: MockOrder, exec_type: str, last_qty: float = 0.0,
+                          last_price: float = 0.0, commission: float = 0.0, commission_asset: str = "",
+                          maker: bool = False, trade_id: int = -1) -> dict:
+        now = self._now_ms()
+        return {
+            "e": "executionReport", "E": now, "s": self.symbol,
+            "c": order.client_order_id, "C": order.client_order_id if exec_type == "CANCELED" else "",
+            "S": order.side, "o": order.order_type, "f": "GTC",
+            "q": f"{order.quantity:.8f}", "p": f"{order.price:.8f}",
+            "x": exec_type, "X": order.status, "r": "NONE", "i": order.order_id,
+            "l": f"{last_qty:.8f}", "z": f"{order.filled:.8f}", "L": f"{last_price:.8f}",
+            "n": f"{commission:.8f}", "N": commission_asset or None,
+            "T": now, "t": trade_id, "w": order.status in ("NEW", "PARTIALLY_FILLED"), "m": maker,
+            "Z": f"{order.filled_quote:.8f}", "Y": f"{last_qty * last_price:.8f}",
+        }
+
+    def _account_position(self) -> dict:
+        return {
+            "e": "outboundAccountPosition", "E": self._now_ms(), "u": self._now_ms(),
+            "B": [{"a": asset, "f": f"{self.free[asset]:.8f}", "l": f"{self.locked[asset]:.8f}"}
+                  for asset in (self.base_asset, self.quote_asset)],
+        }
+
+    def _fill(self, order: MockOrder, quantity: float, price: float, maker: bool) -> dict:
+        """Apply a fill to balances and the order; return the executionReport"""
+        fee_rate = self.maker_fee if maker else self.taker_fee
+        quote = quantity * price
+        if order.side == "BUY":
+            if order.order_type == "LIMIT":
+                self.locked[self.quote_asset] -= quantity * order.price
+                self.free[self.quote_asset] += quantity * order.price - quote
+            else:
+                self.free[self.quote_asset] -= quote
+            commission, commission_asset = quantity * fee_rate, self.base_asset
+            self.free[self.base_asset] += quantity - commission
+        else:
+            if order.order_type == "LIMIT":
+                self.locked[self.base_asset] -= quantity
+            else:
+                self.free[self.base_asset] -= quantity
+            commission, commission_asset = quote * fee_rate, self.quote_asset
+            self.free[self.quote_asset] += quote - commission
+        order.filled += quantity
+        order.filled_quote += quote
+        order.status = "FILLED" if order.remaining <= 1e-12 else "PARTIALLY_FILLED"
+        return self._execution_report(order, "TRADE", quantity, price, commission, commission_asset, maker,
+                                      next(self._trade_ids))
+
+    # --- Simulation controls ---
+    def set_price(self, price: float, liquidity: Optional[float] = None):
+        """
+        Move the market to `price` and fill every resting order it crosses at the order's price.
+        `liquidity` caps the total base quantity filled by this move (partial fills).
+        """
+        events = []
+        with self._lock:
+            self.price = price
+            available = float('inf') if liquidity is None else liquidity
+            for order in sorted(self.orders.values(), key=lambda o: o.order_id):
+                if order.status not in ("NEW", "PARTIALLY_FILLED") or available <= 0:
+                    continue
+                crossed = price <= order.price if order.side == "BUY" else price >= order.price
+                if not crossed:
+                    continue
+                quantity = min(order.remaining, available)
+                available -= quantity
+                events.append(self._fill(order, quantity, order.price, maker=True))
+            if events:
+                events.append(self._account_position())
+        self._broadcast({"e": "trade", "s": self.symbol, "p": f"{price:.8f}", "T": self._now_ms()},
+                        stream=f"{self.symbol.lower()}@trade")
+        for event in events:
+            self._broadcast(event)
+
+    # --- Client API subset ---
+    def ping(self) -> dict:
+        return {}
+
+    def get_symbol_ticker(self, symbol: str) -> dict:
+        return {"symbol": symbol, "price": f"{self.price:.8f}"}
+
+    def get_exchange_info(self) -> dict:
+        return {"symbols": [{
+            "symbol": self.symbol, "status": "TRADING",
+            "baseAsset": self.base_asset, "quoteAsset": self.quote_asset,
+            "filters": [
+                {"filterType": "PRICE_FILTER", "minPrice": f"{self.tick_size}", "maxPrice": "1000000", "tickSize": f"{self.tick_size}"},
+                {"filterType": "LOT_SIZE", "minQty": f"{self.step_size}", "maxQty": "9000000", "stepSize": f"{self.step_size}"},
+                {"filterType": "NOTIONAL", "minNotional": f"{self.min_notional}", "applyMinToMarket": True,
+                 "maxNotional": "9000000", "applyMaxToMarket": False, "avgPriceMins": 5},
+            ],
+        }]}
+
+    def get_account(self, **params) -> dict:
+        with self._lock:
+            return {"balances": [{"asset": a, "free": f"{self.free[a]:.8f}", "locked": f"{self.locked[a]:.8f}"}
+                                 for a in (self.base_asset, self.quote_asset)]}
+
+    def stream_get_listen_key(self) -> str:
+        return "mock-listen-key"
+
+    def stream_keepalive(self, listenKey: str) -> dict:
+        return {}
+
+    def create_order(self, **params) -> dict:
+        side = params['side']
+        order_type = params['type']
+        client_order_id = params.get('newClientOrderId') or f"mock{next(self._order_ids)}"
+        if order_type == "MARKET":
+            return self._market_order(side, client_order_id, params)
+        if order_type != "LIMIT":
+            raise MockAPIError(-1116, f"Unsupported order type {order_type}")
+
+        price = float(params['price'])
+        quantity = float(params['quantity'])
+        with self._lock:
+            if any(o.client_order_id == client_order_id for o in self.orders.values()):
+                raise MockAPIError(-2010, "Duplicate order sent.")
+            if side == "BUY":
+                self._lock_funds(self.quote_asset, quantity * price)
+            else:
+                self._lock_funds(self.base_asset, quantity)
+            order = MockOrder(next(self._order_ids), client_order_id, side, "LIMIT", price, quantity)
+            self.orders[order.order_id] = order
+            new_event = self._execution_report(order, "NEW")
+        self._broadcast(new_event)
+        # A marketable limit order fills immediately as taker
+        if (side == "BUY" and self.price <= price) or (side == "SELL" and self.price >= price):
+            with self._lock:
+                event = self._fill(order, order.remaining, self.price, maker=False)
+            self._broadcast(event)
+            self._broadcast(self._account_position())
+        return self._order_response(order)
+
+    def _lock_funds(self, asset: str, amount: float):
+        if self.free[asset] + 1e-12 < amount:
+            raise MockAPIError(-2010, "Account has insufficient balance for requested action.")
+        self.free[asset] -= amount
+        self.locked[asset] += amount
+
+    def _market_order(self, side: str, client_order_id: str, params: dict) -> dict:
+        with self._lock:
+            if 'quoteOrderQty' in params:
+                quantity = float(params['quoteOrderQty']) / self.price
+            else:
+                quantity = float(params['quantity'])
+            needed = quantity * self.price if side == "BUY" else quantity
+            asset = self.quote_asset if side == "BUY" else self.base_asset
+            if self.free[asset] + 1e-12 < needed:
+                raise MockAPIError(-2010, "Account has insufficient balance for requested action.")
+            order = MockOrder(next(self._order_ids), client_order_id, side, "MARKET", 0.0, quantity)
+            self.orders[order.order_id] = order
+            event = self._fill(order, quantity, self.price, maker=False)
+            response = self._order_response(order)
+            response['fills'] = [{"price": f"{self.price:.8f}", "qty": f"{quantity:.8f}",
+                                  "commission": event['n'], "commissionAsset": event['N'], "tradeId": event['t']}]
+        self._broadcast(event)
+        self._broadcast(self._account_position())
+        return response
+
+    def _order_response(self, order: MockOrder) -> dict:
+        return {
+            "symbol": self.symbol, "orderId": order.order_id, "clientOrderId": order.client_order_id,
+            "price": f"{order.price:.8f}", "origQty": f"{order.quantity:.8f}",
+            "executedQty": f"{order.filled:.8f}", "cummulativeQuoteQty": f"{order.filled_quote:.8f}",
+            "status": order.status, "type": order.order_type, "side": order.side, "fills": [],
+        }
+
+    def order_limit_buy(self, **params) -> dict:
+        return self.create_order(side="BUY", type="LIMIT", **params)
+
+    def order_limit_sell(self, **params) -> dict:
+        return self.create_order(side="SELL", type="LIMIT", **params)
+
+    def order_market_buy(self, **params) -> dict:
+        return self.create_order(side="BUY", type="MARKET", **params)
+
+    def order_market_sell(self, **params) -> dict:
+        return self.create_order(side="SELL", type="MARKET", **params)
+
+    def _find_order(self, params: dict) -> MockOrder:
+        if 'orderId' in params:
+            order = self.orders.get(int(params['orderId']))
+        else:
+            order = next((o for o in self.orders.values() if o.client_order_id == params.get('origClientOrderId')), None)
+        if order is None:
+            raise MockAPIError(-2013, "Order does not exist.")
+        return order
+
+    def get_order(self, **params) -> dict:
+        with self._lock:
+            return self._order_response(self._find_order(params))
+
+    def get_open_orders(self, **params) -> List[dict]:
+        with self._lock:
+            return [self._order_response(o) for o in self.orders.values()
+                    if o.status in ("NEW", "PARTIALLY_FILLED")]
+
+    def cancel_order(self, **params) -> dict:
+        with self._lock:
+            order = self._find_order(params)
+            if order.status not in ("NEW", "PARTIALLY_FILLED"):
+                raise MockAPIError(-2011, "Unknown order sent.")
+            if order.side == "BUY":
+                refund = order.remaining * order.price
+                self.locked[self.quote_asset] -= refund
+                self.free[self.quote_asset] += refund
+            else:
+                self.locked[self.base_asset] -= order.remaining
+                self.free[self.base_asset] += order.remaining
+            order.status = "CANCELED"
+            event = self._execution_report(order, "CANCELED")
+            response = self._order_response(order)
+        self._broadcast(event)
+        self._broadcast(self._account_position())
+        return response
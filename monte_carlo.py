@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo simulation of the Asymmetric Grid Bot
+Runs the paper-trading rules (triggers around the last trade price, trade size = trade_fraction of
+the current portfolio, LOT_SIZE rounding) over thousands of synthetic price paths at once. Paths are
+array lanes: prices are generated one block of steps at a time as a (steps, paths) array, and each
+tick updates every lane's balances and triggers with NumPy masks instead of a per-path Python loop.
+Path models:
+    gbm        geometric Brownian motion with constant drift and volatility
+    bootstrap  blocks of historical log returns resampled with replacement
+    regime     calm/volatile volatility regimes with random (geometric) durations
+The output is the distribution over paths of final equity, max drawdown and inventory imbalance.
+"""
+
+import argparse
+import csv
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from backtest import DEFAULT_BUY_OFFSET, DEFAULT_SELL_OFFSET, DEFAULT_TRADE_FRACTION, load_prices
+from exchange_filters import STEP_EPSILON, step_precision
+
+# === Constants ===
+MINUTES_PER_YEAR = 365 * 24 * 60
+BLOCK_STEPS = 1440              # Steps generated per block (one day of minutes)
+LANES_PER_TASK = 2048           # Paths per worker task; fixes the random streams whatever --workers is
+MODELS = ("gbm", "bootstrap", "regime")
+PERCENTILES = (1, 5, 50, 95, 99)
+
+# Worker-side state (set by _init_worker)
+_options: dict = {}
+_returns: Optional[np.ndarray] = None
+
+
+# === Path Models ===
+# Each generator yields time-major price blocks of shape (steps, lanes), continuing from s0.
+def _to_prices(log_returns: np.ndarray, log_price: np.ndarray) -> np.ndarray:
+    """Cumulate a block of log returns in place onto each lane's last log price"""
+    # Row by row: np.cumsum(axis=0) walks the time axis with a stride and is ~10x slower
+    np.add(log_returns[0], log_price, out=log_returns[0])
+    for i in range(1, len(log_returns)):
+        np.add(log_returns[i - 1], log_returns[i], out=log_returns[i])
+    log_price[:] = log_returns[-1]
+    return np.exp(log_returns, out=log_returns)
+
+
+def gbm_blocks(lanes: int, steps: int, s0: float, mu: float, sigma: float, dt: float,
+               rng: np.random.Generator, block: int = BLOCK_STEPS) -> Iterator[np.ndarray]:
+    """Geometric Brownian motion; mu and sigma are annualized, dt is one step in years"""
+    log_price = np.full(lanes, math.log(s0))
+    drift = (mu - 0.5 * sigma ** 2) * dt
+    scale = sigma * math.sqrt(dt)
+    for start in range(0, steps, block):
+        returns = rng.standard_normal((min(block, steps - start), lanes))
+        returns *= scale
+        returns += drift
+        yield _to_prices(returns, log_price)
+
+
+def regime_blocks(lanes: int, steps: int, s0: float, mu: float, sigma_calm: float, sigma_volatile: float,
+                  calm_steps: float, volatile_steps: float, dt: float, rng: np.random.Generator,
+                  block: int = BLOCK_STEPS) -> Iterator[np.ndarray]:
+    """
+    GBM whose volatility switches between a calm and a volatile regime (a two-state Markov chain).
+    Regime durations are geometric with means calm_steps/volatile_steps; the first regime is drawn
+    from the chain's stationary distribution.
+    """
+    log_price = np.full(lanes, math.log(s0))
+    volatile = rng.random(lanes) < volatile_steps / (calm_steps + volatile_steps)
+    remaining = np.where(volatile, rng.geometric(1 / volatile_steps, lanes), rng.geometric(1 / calm_steps, lanes))
+    sigmas = np.array([sigma_calm, sigma_volatile])
+    for start in range(0, steps, block):
+        n = min(block, steps - start)
+        step_index = np.arange(n)[:, None]
+        state = np.empty((n, lanes), dtype=np.intp)
+        filled = np.zeros(lanes, dtype=np.int64)
+        # One pass per regime change inside the block (a few at most)
+        while True:
+            end = filled + remaining
+            np.copyto(state, volatile[None, :], where=(step_index >= filled) & (step_index < end))
+            switching = end <= n
+            remaining = np.where(switching, 0, remaining - (n - filled))
+            filled = np.where(switching, end, n)
+            if not switching.any():
+                break
+            volatile = np.where(switching, ~volatile, volatile)
+            durations = np.where(volatile, rng.geometric(1 / volatile_steps, lanes), rng.geometric(1 / calm_steps, lanes))
+            remaining = np.where(switching, durations, remaining)
+        sigma = sigmas[state]
+        returns = rng.standard_normal((n, lanes))
+        returns *= sigma * math.sqrt(dt)
+        returns += (mu - 0.5 * sigma ** 2) * dt
+        yield _to_prices(returns, log_price)
+
+
+def bootstrap_blocks(log_returns: np.ndarray, lanes: int, steps: int, s0: float, block_length: int,
+                     rng: np.random.Generator, block: int = BLOCK_STEPS) -> Iterator[np.ndarray]:
+    """
+    Moving-block bootstrap: each lane strings together runs of block_length consecutive historical
+    returns from random starting points, which keeps volatility clustering within a run.
+    """
+    block_length = max(1, min(block_length, len(log_returns)))
+    log_price = np.full(lanes, math.log(s0))
+    high = len(log_returns) - block_length + 1
+    current_run, current_starts = -1, None
+    for start in range(0, steps, block):
+        t = np.arange(start, min(start + block, steps))
+        runs = t // block_length
+        first = int(runs[0])
+        starts = rng.integers(0, high, (int(runs[-1]) - first + 1, lanes))
+        if current_run == first:
+            # The run in progress at the end of the last block carries on
+            starts[0] = current_starts
+        current_run, current_starts = int(runs[-1]), starts[-1]
+        index = starts[runs - first] + (t % block_length)[:, None]
+        yield _to_prices(log_returns[index], log_price)
+
+
+# === Simulation ===
+@dataclass
+class MonteCarloResult:
+    """Per-path outcomes, one array element per path"""
+    initial_investment: float
+    final_equity: np.ndarray
+    max_drawdown: np.ndarray
+    crypto_share: np.ndarray         # Final crypto value / equity (0.5 right after the initial split)
+    trades: np.ndarray
+    blocked: np.ndarray              # Trigger crossings skipped for lack of USDT or crypto
+    realized_pnl: np.ndarray         # Same definition as the bot's cumulative_profit
+    fees: np.ndarray
+    steps: int
+    elapsed: float = 0.0
+
+    @property
+    def paths(self) -> int:
+        return len(self.final_equity)
+
+    @property
+    def total_return(self) -> np.ndarray:
+        return self.final_equity / self.initial_investment - 1
+
+    @staticmethod
+    def concatenate(results: List["MonteCarloResult"]) -> "MonteCarloResult":
+        first = results[0]
+        arrays = {name: np.concatenate([getattr(r, name) for r in results])
+                  for name in ("final_equity", "max_drawdown", "crypto_share", "trades", "blocked", "realized_pnl", "fees")}
+        return MonteCarloResult(first.initial_investment, steps=first.steps, **arrays)
+
+
+def simulate(blocks: Iterable[np.ndarray], s0: float, lanes: int, initial_investment: float = 1000.0,
+             step_size: float = 0.0001, min_qty: float = 0.0001, min_notional: float = 0.0,
+             fee_rate: float = 0.0, buy_offset: float = DEFAULT_BUY_OFFSET,
+             sell_offset: float = DEFAULT_SELL_OFFSET,
+             trade_fraction: float = DEFAULT_TRADE_FRACTION) -> MonteCarloResult:
+    """
+    Run every lane through the paper-trading rules, one tick (block row) at a time.
+    All lanes start with the 50/50 split at s0. Per lane this is the same arithmetic as
+    run_backtest(np.r_[s0, path]), so a single historical path reproduces the backtest.
+    """
+    started = time.perf_counter()
+    precision = step_precision(step_size)
+    buy_multiplier = 1 - buy_offset
+    sell_multiplier = 1 + sell_offset
+
+    usdt = np.full(lanes, initial_investment / 2)
+    crypto = np.full(lanes, initial_investment / 2 / s0)
+    buy_trigger = np.full(lanes, s0 * buy_multiplier)
+    sell_trigger = np.full(lanes, s0 * sell_multiplier)
+    trades = np.zeros(lanes, dtype=np.int64)
+    blocked = np.zeros(lanes, dtype=np.int64)
+    realized = np.zeros(lanes)
+    fees = np.zeros(lanes)
+    peak = usdt + crypto * s0
+    worst = np.ones(lanes)                 # Lowest equity / running peak
+    # Scratch buffers reused every tick
+    sell_hit = np.empty(lanes, dtype=bool)
+    hit = np.empty(lanes, dtype=bool)
+    equity = np.empty(lanes)
+    ratio = np.empty(lanes)
+
+    steps = 0
+    price = np.full(lanes, s0)
+    for prices in blocks:
+        steps += len(prices)
+        for price in prices:
+            np.greater_equal(price, sell_trigger, out=sell_hit)
+            np.less_equal(price, buy_trigger, out=hit)
+            np.logical_or(hit, sell_hit, out=hit)
+            if hit.any():
+                # Crossings are rare per lane; only those lanes take the scalar-path arithmetic
+                idx = np.flatnonzero(hit)
+                p = price[idx]
+                u = usdt[idx]
+                c = crypto[idx]
+                size = (u + c * p) * trade_fraction
+                selling = sell_hit[idx]
+                ok = np.where(selling, c >= size / p, u >= size)
+                blocked[idx[~ok]] += 1
+                # Whole steps, rounded down like SymbolFilters.round_quantity()
+                quantity = np.round(np.floor(size / p / step_size + STEP_EPSILON) * step_size, precision)
+                ok &= quantity >= min_qty
+                if min_notional > 0:
+                    ok &= quantity * p >= min_notional
+                ok &= ~selling | (c >= quantity)
+                if ok.any():
+                    # Buys and sells in one pass: a sell receives quantity * price, a buy spends size
+                    lane, q, s, p, u, c, selling = idx[ok], quantity[ok], size[ok], p[ok], u[ok], c[ok], selling[ok]
+                    notional = np.where(selling, q * p, s)
+                    fee = notional * fee_rate
+                    crypto[lane] = c + np.where(selling, -q, q)
+                    usdt[lane] = u + np.where(selling, notional - fee, -(notional + fee))
+                    realized[lane] += np.where(selling, notional - s, 0.0)
+                    fees[lane] += fee
+                    buy_trigger[lane] = p * buy_multiplier
+                    sell_trigger[lane] = p * sell_multiplier
+                    trades[lane] += 1
+
+            np.multiply(crypto, price, out=equity)
+            equity += usdt
+            np.maximum(peak, equity, out=peak)
+            np.divide(equity, peak, out=ratio)
+            np.minimum(worst, ratio, out=worst)
+
+    final_equity = usdt + crypto * price
+    return MonteCarloResult(
+        initial_investment=initial_investment,
+        final_equity=final_equity,
+        max_drawdown=1 - worst,
+        crypto_share=crypto * price / final_equity,
+        trades=trades,
+        blocked=blocked,
+        realized_pnl=realized,
+        fees=fees,
+        steps=steps,
+        elapsed=time.perf_counter() - started,
+    )
+
+
+# === Workers ===
+def _init_worker(options: dict, returns: Optional[np.ndarray]):
+    global _options, _returns
+    _options = options
+    _returns = returns
+
+
+def _path_blocks(lanes: int, rng: np.random.Generator) -> Iterator[np.ndarray]:
+    o = _options
+    dt = o['step_minutes'] / MINUTES_PER_YEAR
+    if o['model'] == "gbm":
+        return gbm_blocks(lanes, o['steps'], o['s0'], o['mu'], o['sigma'], dt, rng)
+    if o['model'] == "regime":
+        steps_per_day = 24 * 60 / o['step_minutes']
+        return regime_blocks(lanes, o['steps'], o['s0'], o['mu'], o['sigma'], o['sigma_high'],
+                             o['calm_days'] * steps_per_day, o['volatile_days'] * steps_per_day, dt, rng)
+    return bootstrap_blocks(_returns, lanes, o['steps'], o['s0'], o['block_length'], rng)
+
+
+def _simulate_task(task) -> MonteCarloResult:
+    lanes, seed = task
+    rng = np.random.default_rng(seed)
+    o = _options
+    return simulate(_path_blocks(lanes, rng), o['s0'], lanes, o['investment'], o['step_size'], o['min_qty'],
+                    o['min_notional'], o['fee_rate'], o['buy_offset'], o['sell_offset'], o['trade_fraction'])
+
+
+def run_monte_carlo(options: dict, paths: int, seed: Optional[int] = None, workers: Optional[int] = None,
+                    returns: Optional[np.ndarray] = None) -> MonteCarloResult:
+    """Split the paths into fixed-size lane groups with independent seeds and simulate them across a process pool"""
+    started = time.perf_counter()
+    sizes = [min(LANES_PER_TASK, paths - start) for start in range(0, paths, LANES_PER_TASK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+    if workers == 1:
+        _init_worker(options, returns)
+        results = [_simulate_task(task) for task in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(options, returns)) as pool:
+            results = list(pool.map(_simulate_task, zip(sizes, seeds)))
+    result = MonteCarloResult.concatenate(results)
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+# === Reporting ===
+def write_paths_csv(result: MonteCarloResult, path: str):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["path", "final_equity", "total_return", "max_drawdown", "crypto_share",
+                         "trades", "blocked", "realized_pnl", "fees"])
+        writer.writerows(zip(range(result.paths), result.final_equity.tolist(), result.total_return.tolist(),
+                             result.max_drawdown.tolist(), result.crypto_share.tolist(), result.trades.tolist(),
+                             result.blocked.tolist(), result.realized_pnl.tolist(), result.fees.tolist()))
+
+
+def print_summary(result: MonteCarloResult, title: str = "Monte Carlo"):
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+
+    console = Console()
+    table = Table(title=f"🎲 {title}", box=box.ROUNDED, border_style="cyan")
+    table.add_column("Metric", style="cyan", no_wrap=True)
+    for column in ["Mean"] + [f"P{p}" for p in PERCENTILES]:
+        table.add_column(column, style="green", justify="right")
+    rows = [
+        ("Return", result.total_return * 100, "{:+.1f}%"),
+        ("Final Equity", result.final_equity, "${:,.0f}"),
+        ("Max Drawdown", result.max_drawdown * 100, "{:.1f}%"),
+        ("Crypto Share", result.crypto_share * 100, "{:.1f}%"),
+        ("Trades", result.trades, "{:,.0f}"),
+        ("Blocked Triggers", result.blocked, "{:,.0f}"),
+        ("Realized P&L", result.realized_pnl, "${:+,.2f}"),
+        ("Fees", result.fees, "${:,.2f}"),
+    ]
+    for name, values, fmt in rows:
+        cells = [values.mean()] + np.percentile(values, PERCENTILES).tolist()
+        table.add_row(name, *(fmt.format(v) for v in cells))
+    console.print(table)
+
+    returns = result.total_return
+    tail = np.sort(returns)[:max(1, result.paths // 20)]
+    console.print(
+        f"P(loss) {np.mean(returns < 0) * 100:.1f}% | P(drawdown > 25%) {np.mean(result.max_drawdown > 0.25) * 100:.1f}% | "
+        f"P(drawdown > 50%) {np.mean(result.max_drawdown > 0.5) * 100:.1f}% | Mean of worst 5% {tail.mean() * 100:+.1f}%")
+    ticks = result.paths * result.steps
+    console.print(f"[dim]{result.paths:,} paths x {result.steps:,} steps in {result.elapsed:.1f}s "
+                  f"({ticks / max(result.elapsed, 1e-9) / 1e6:,.1f}M path-ticks/s)[/dim]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the asymmetric grid strategy over synthetic price paths")
+    parser.add_argument("--model", choices=MODELS, default="gbm", help="Price path model")
+    parser.add_argument("--paths", type=int, default=10_000, help="Number of paths")
+    parser.add_argument("--days", type=float, default=365, help="Path length in days")
+    parser.add_argument("--step-minutes", type=float, default=1.0, help="Minutes per tick (bars of the --data history for bootstrap)")
+    parser.add_argument("--price", type=float, default=100.0, help="Start price (bootstrap: last price of --data)")
+    parser.add_argument("--mu", type=float, default=0.0, help="Annual drift (gbm/regime)")
+    parser.add_argument("--sigma", type=float, default=0.8, help="Annual volatility (gbm; calm regime for regime)")
+    parser.add_argument("--sigma-high", type=float, default=2.0, help="Annual volatility of the volatile regime")
+    parser.add_argument("--calm-days", type=float, default=30, help="Mean duration of a calm regime")
+    parser.add_argument("--volatile-days", type=float, default=7, help="Mean duration of a volatile regime")
+    parser.add_argument("--data", help="CSV/Parquet/tick-store history to bootstrap returns from")
+    parser.add_argument("--block-length", type=int, default=1440, help="Bootstrap run length in bars")
+    parser.add_argument("--demean", action="store_true", help="Remove the history's drift before bootstrapping")
+    parser.add_argument("--investment", type=float, default=1000.0, help="Initial USDT investment")
+    parser.add_argument("--step-size", type=float, default=0.0001, help="LOT_SIZE stepSize")
+    parser.add_argument("--min-qty", type=float, default=0.0001, help="LOT_SIZE minQty")
+    parser.add_argument("--min-notional", type=float, default=0.0, help="MIN_NOTIONAL/NOTIONAL minimum order value")
+    parser.add_argument("--fee", type=float, default=0.001, help="Fee rate per trade (0.001 = 0.1%%)")
+    parser.add_argument("--buy-offset", type=float, default=DEFAULT_BUY_OFFSET, help="Buy trigger below reference (0.01 = -1%%)")
+    parser.add_argument("--sell-offset", type=float, default=DEFAULT_SELL_OFFSET, help="Sell trigger above reference (0.015 = +1.5%%)")
+    parser.add_argument("--trade-fraction", type=float, default=DEFAULT_TRADE_FRACTION, help="Trade size as a fraction of portfolio")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--out", help="Write per-path results to this CSV")
+    args = parser.parse_args()
+
+    returns = None
+    s0 = args.price
+    if args.model == "bootstrap":
+        if not args.data:
+            parser.error("--model bootstrap needs --data")
+        _, prices = load_prices(args.data)
+        returns = np.diff(np.log(prices[prices > 0]))
+        if args.demean:
+            returns = returns - returns.mean()
+        s0 = float(prices[-1])
+
+    options = {
+        'model': args.model, 'steps': int(args.days * 24 * 60 / args.step_minutes), 'step_minutes': args.step_minutes,
+        's0': s0, 'mu': args.mu, 'sigma': args.sigma, 'sigma_high': args.sigma_high,
+        'calm_days': args.calm_days, 'volatile_days': args.volatile_days, 'block_length': args.block_length,
+        'investment': args.investment, 'step_size': args.step_size, 'min_qty': args.min_qty,
+        'min_notional': args.min_notional, 'fee_rate': args.fee, 'buy_offset': args.buy_offset,
+        'sell_offset': args.sell_offset, 'trade_fraction': args.trade_fraction,
+    }
+    result = run_monte_carlo(options, args.paths, args.seed, args.workers, returns)
+    print_summary(result, title=f"Monte Carlo: {args.model}, {args.paths:,} paths x {args.days:g} days")
+    if args.out:
+        write_paths_csv(result, args.out)
+
+
+if __name__ == "__main__":
+    main()
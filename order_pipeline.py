@@ -0,0 +1,304 @@
+"""
+Market-order execution pipeline for the Asymmetric Grid Bot
+Everything about the next order that does not depend on the exchange is worked out when the
+triggers are set: the compounded trade size at the trigger price, the quantity rounded to
+LOT_SIZE and formatted, and the filter check. A crossed trigger then only hands its template
+to a worker thread, which sends the order while the trading loop keeps consuming prices.
+- Every order carries a newClientOrderId. If a request fails without an exchange answer (timeout,
+  dropped connection, -1007 "send status unknown") the order is looked up by that id first and
+  only re-sent once the exchange says it does not exist, so a retry can never trade twice
+- If even the lookups get no answer, the order stays in flight with its trigger disarmed and is
+  looked up again every UNRESOLVED_RECHECK seconds; the trigger re-arms only once the exchange
+  says the order does not exist, and a fill it reports is booked then
+- One order is in flight at a time and each template fires once: no further triggers are checked
+  until the result has been booked and the triggers re-set around the fill
+- Results are booked on the trading thread (poll()), never from the worker
+"""
+
+import itertools
+import queue
+import secrets
+import threading
+import time
+from typing import Dict, Optional
+
+from request_scheduler import ORDER_MAX_WAIT, ORDER_WEIGHT, PRIORITY_ORDER, RequestThrottled, backoff_delay
+
+# === Constants ===
+CLIENT_ORDER_PREFIX = "agm"          # Market orders (limit_grid.py rests "agb" orders)
+SEND_ATTEMPTS = 3                    # Sends of one order (same client order id) before giving up
+LOOKUP_ATTEMPTS = 5                  # Order lookups after a send whose outcome is unknown
+RETRY_BASE = 0.25                    # Seconds, doubled per attempt (jittered)
+RETRY_MAX = 5.0
+FAILED_COOLDOWN = 5.0                # Seconds before a rejected trigger may fire again
+UNRESOLVED_RECHECK = 5.0             # Seconds between lookups of an order whose outcome is still unknown
+CLOSE_TIMEOUT = 30.0                 # Seconds to wait for an in-flight order on shutdown
+# Binance errors after which the order may or may not have been placed
+UNKNOWN_OUTCOME_CODES = (-1000, -1001, -1006, -1007)
+ORDER_NOT_FOUND = -2013
+OPEN_STATUSES = ("NEW", "PARTIALLY_FILLED")
+
+
+class OrderTemplate:
+    """A validated market order, ready to send"""
+    __slots__ = ("side", "price", "trade_size", "quantity", "quantity_text", "rejection")
+
+    def __init__(self, side: str, price: float, trade_size: float, quantity: float, quantity_text: str,
+                 rejection: Optional[str]):
+        self.side = side
+        self.price = price                  # Trigger price the size was computed at
+        self.trade_size = trade_size
+        self.quantity = quantity
+        self.quantity_text = quantity_text
+        self.rejection = rejection          # Filter violation, if any (the template never fires)
+
+
+class OrderOutcomeUnknown(Exception):
+    """The exchange could not say whether an order was placed"""
+
+
+class OrderNotPlaced(Exception):
+    """The exchange confirmed that an order whose outcome was unknown does not exist"""
+
+
+def outcome_unknown(error: Exception) -> bool:
+    """True if the request may have reached the exchange (no definitive API answer)"""
+    code = getattr(error, "code", None)
+    return code is None or code in UNKNOWN_OUTCOME_CODES
+
+
+class InFlightOrder:
+    """An order handed to the worker, and what came back"""
+    __slots__ = ("template", "trigger_price", "client_order_id", "fired_ns", "response", "error", "recovered",
+                 "check_at")
+
+    def __init__(self, template: OrderTemplate, trigger_price: float, client_order_id: str):
+        self.template = template
+        self.trigger_price = trigger_price  # Price that crossed the trigger (slippage reference)
+        self.client_order_id = client_order_id
+        self.fired_ns = time.perf_counter_ns()
+        self.response: Optional[dict] = None
+        self.error: Optional[Exception] = None
+        self.recovered = False              # Response came from a lookup (no fills detail)
+        self.check_at = 0.0                 # Outcome unknown: clock time of the next lookup (0 = none due)
+
+
+class OrderPipeline:
+    """Prepares, sends and books a live bot's market orders"""
+
+    def __init__(self, bot, asynchronous: bool = True):
+        self.bot = bot
+        self.config = bot.config
+        self.client = bot.client
+        self.filters = bot.filters
+        self.logger = bot.logger
+        self.metrics = bot.metrics
+        # A simulator's virtual clock must not move while an order is out, so it runs inline
+        self.asynchronous = asynchronous
+        self.templates: Dict[str, OrderTemplate] = {}   # side -> armed template
+        self.in_flight: Optional[InFlightOrder] = None
+        self.retry_after = 0.0
+        self._ids = itertools.count(1)
+        # Unique across restarts and across bots started in the same second
+        self._session = f"{int(time.time())}{secrets.token_hex(2)}"
+        self._jobs: "queue.SimpleQueue[Optional[InFlightOrder]]" = queue.SimpleQueue()
+        self._done: "queue.SimpleQueue[InFlightOrder]" = queue.SimpleQueue()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread: Optional[threading.Thread] = None
+        if asynchronous:
+            self._thread = threading.Thread(target=self._worker, name=f"orders-{self.config.symbol}", daemon=True)
+            self._thread.start()
+
+    # === Templates ===
+    def prepare(self, side: str, price: float, levels: int = 1) -> OrderTemplate:
+        """Size, round, format and filter-check an order at price"""
+        trade_size = self.bot.get_trade_size(price, record=False) * levels
+        quantity = self.filters.round_quantity(trade_size / price, market=True)
+        return OrderTemplate(side, price, trade_size, quantity, self.filters.format_quantity(quantity, market=True),
+                             self.filters.check_order(quantity, price))
+
+    def arm(self):
+        """Prepare both sides at the current triggers (after every set_triggers)"""
+        bot = self.bot
+        self.templates = {"BUY": self.prepare("BUY", bot.buy_trigger), "SELL": self.prepare("SELL", bot.sell_trigger)}
+
+    # === Firing ===
+    def _next_client_order_id(self, side: str) -> str:
+        return f"{CLIENT_ORDER_PREFIX}{side[0]}{self._session}x{next(self._ids)}"
+
+    def fire(self, side: str, price: float, levels: int = 1) -> bool:
+        """Send the armed order for side (a fresh one for a ladder gap); False if nothing was sent"""
+        if self.in_flight is not None or self.bot.clock.time() < self.retry_after:
+            return False
+        # Taking the template disarms the trigger until the next arm()
+        template = self.templates.pop(side, None)
+        if template is None:
+            return False
+        if levels > 1:
+            template = self.prepare(side, template.price, levels)
+            self.logger.log_info(f"Ladder: {levels} {side.lower()} levels crossed, one order of ${template.trade_size:.2f}")
+        if template.rejection:
+            self.metrics.inc("orders_skipped_total", side=side, reason="filter")
+            self.logger.log_warning(f"{side.capitalize()} skipped: {template.rejection}")
+            return False
+
+        order = InFlightOrder(template, price, self._next_client_order_id(side))
+        self.in_flight = order
+        if self.asynchronous:
+            self._idle.clear()
+            self._jobs.put(order)
+        else:
+            self._execute(order)
+            self._done.put(order)
+        # Bookkeeping after the hand-off, off the trigger-to-send path
+        self.bot.record_trade_size(template.trade_size, self.bot.calculate_portfolio_value(template.price))
+        if not self.asynchronous:
+            self.poll()
+        return True
+
+    # === Worker ===
+    def _worker(self):
+        while True:
+            order = self._jobs.get()
+            if order is None:
+                return
+            self._execute(order)
+            self._done.put(order)
+            self._idle.set()
+
+    def _execute(self, order: InFlightOrder):
+        """Send with retries (or, for an unresolved order, look it up); sets order.response or order.error"""
+        if order.check_at:
+            order.check_at = 0.0
+            try:
+                order.response = self._resolve(order)
+            except Exception as e:
+                order.error = e
+            return
+        self.metrics.observe_ns("order_dispatch", time.perf_counter_ns() - order.fired_ns, side=order.template.side)
+        started = time.perf_counter_ns()
+        try:
+            order.response = self._submit(order)
+            self.metrics.observe_ns("order_round_trip", time.perf_counter_ns() - started, side=order.template.side)
+        except Exception as e:
+            order.error = e
+
+    def _send(self, order: InFlightOrder) -> dict:
+        template = order.template
+        place = self.client.order_market_buy if template.side == "BUY" else self.client.order_market_sell
+        return self.bot.scheduler.call(
+            place, priority=PRIORITY_ORDER, weight=ORDER_WEIGHT, max_wait=ORDER_MAX_WAIT,
+            symbol=self.config.symbol, quantity=template.quantity_text, newClientOrderId=order.client_order_id
+        )
+
+    def _submit(self, order: InFlightOrder) -> dict:
+        """Send; after an unknown outcome, look the order up and re-send only if it was never placed"""
+        error: Optional[Exception] = None
+        for attempt in range(1, SEND_ATTEMPTS + 1):
+            try:
+                return self._send(order)
+            except RequestThrottled:
+                raise
+            except Exception as e:
+                if not outcome_unknown(e):
+                    raise
+                error = e
+            self.metrics.inc("order_retries_total", side=order.template.side)
+            self.logger.log_warning(f"{order.template.side} {order.client_order_id} outcome unknown ({error}), checking")
+            existing = self._lookup(order)
+            if existing is not None:
+                order.recovered = True
+                return existing
+            self.bot.clock.sleep(backoff_delay(attempt, RETRY_BASE, RETRY_MAX))
+        raise error
+
+    def _lookup(self, order: InFlightOrder) -> Optional[dict]:
+        """The order as the exchange has it; None if it was never placed"""
+        for attempt in range(1, LOOKUP_ATTEMPTS + 1):
+            try:
+                return self.bot.scheduler.call(self.client.get_order, priority=PRIORITY_ORDER, weight=ORDER_WEIGHT,
+                                               symbol=self.config.symbol, origClientOrderId=order.client_order_id)
+            except Exception as e:
+                if getattr(e, "code", None) == ORDER_NOT_FOUND:
+                    return None
+                self.bot.clock.sleep(backoff_delay(attempt, RETRY_BASE, RETRY_MAX))
+        raise OrderOutcomeUnknown(f"could not confirm whether {order.client_order_id} was placed")
+
+    def _resolve(self, order: InFlightOrder) -> dict:
+        """Final state of an order whose outcome was unknown; OrderNotPlaced if it never existed"""
+        existing = self._lookup(order)
+        if existing is None:
+            raise OrderNotPlaced(f"{order.client_order_id} was never placed")
+        if existing.get('status') in OPEN_STATUSES:
+            raise OrderOutcomeUnknown(f"{order.client_order_id} is still {existing.get('status')}")
+        order.recovered = True
+        return existing
+
+    # === Booking (trading thread) ===
+    def poll(self) -> bool:
+        """Book a finished order, if any; True while one is still in flight"""
+        try:
+            order = self._done.get_nowait()
+        except queue.Empty:
+            order = self.in_flight
+            if order is not None and order.check_at and self.bot.clock.time() >= order.check_at:
+                self._recheck(order)
+                if not self.asynchronous:
+                    return self.poll()
+            return self.in_flight is not None
+        self.in_flight = None
+        self._book(order)
+        return self.in_flight is not None
+
+    def _recheck(self, order: InFlightOrder):
+        """Hand an unresolved order back to the worker for another lookup"""
+        order.error = None
+        if self.asynchronous:
+            self._idle.clear()
+            self._jobs.put(order)
+        else:
+            self._execute(order)
+            self._done.put(order)
+
+    def _book(self, order: InFlightOrder):
+        template, bot = order.template, self.bot
+        side = template.side
+        response = order.response
+        if response is not None and float(response.get('executedQty') or 0) > 0:
+            bot.book_market_order(side, response, order.trigger_price, template.trade_size, recovered=order.recovered)
+            return
+        error = order.error
+        if isinstance(error, OrderOutcomeUnknown):
+            # It may have traded: a new order could double it, so stay disarmed and keep asking by client id
+            order.check_at = bot.clock.time() + UNRESOLVED_RECHECK
+            self.in_flight = order
+            self.metrics.inc("orders_unresolved_total", side=side)
+            self.logger.log_warning(f"{side.capitalize()} order {order.client_order_id} unresolved ({error}), "
+                                    f"checking again in {UNRESOLVED_RECHECK:g}s")
+            return
+        # Nothing traded: re-arm the trigger after a pause so a persistent rejection doesn't repeat every tick
+        self.templates[side] = template
+        self.retry_after = bot.clock.time() + FAILED_COOLDOWN
+        if isinstance(error, RequestThrottled):
+            self.metrics.inc("orders_skipped_total", side=side, reason="rate_limit")
+            self.logger.log_warning(f"{side.capitalize()} skipped: {error}")
+        elif error is not None:
+            self.metrics.inc("order_errors_total", side=side)
+            self.logger.log_error(f"{side.capitalize()} order {order.client_order_id} failed: {error}")
+        else:
+            self.metrics.inc("order_errors_total", side=side)
+            self.logger.log_warning(f"{side.capitalize()} order {order.client_order_id} ended {response.get('status')} with nothing filled")
+
+    def close(self, timeout: float = CLOSE_TIMEOUT):
+        """Wait for (and book) the order in flight, then stop the worker (an unresolved order is left to the reconciler)"""
+        if self._thread is not None:
+            if not self._idle.wait(timeout):
+                self.logger.log_warning(f"Order {self.in_flight.client_order_id} still in flight at shutdown")
+            self._jobs.put(None)
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.poll()
+        if self.in_flight is not None and self.in_flight.check_at:
+            self.logger.log_warning(f"Order {self.in_flight.client_order_id} still unresolved at shutdown "
+                                    f"(balance reconciliation picks up a fill)")
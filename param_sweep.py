@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Parallel parameter sweep for the Asymmetric Grid Bot
+Evaluates (buy offset, sell offset, trade fraction) combinations over a price history
+with the backtest engine. The price array lives in one shared-memory block that every
+worker process maps read-only, so it is never pickled or copied per task.
+"""
+
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backtest import load_prices, run_backtest
+
+SORT_KEYS = ("total_return", "max_drawdown", "trade_count", "fee_drag", "final_equity")
+
+# Worker-side state (set by _init_worker)
+_shared_block: Optional[shared_memory.SharedMemory] = None
+_shared_prices: Optional[np.ndarray] = None
+_options: dict = {}
+
+
+@dataclass
+class SweepResult:
+    """Metrics for one parameter combination"""
+    buy_offset: float
+    sell_offset: float
+    trade_fraction: float
+    total_return: float
+    max_drawdown: float
+    trade_count: int
+    fees: float
+    fee_drag: float             # Fees as a fraction of the initial investment
+    final_equity: float
+
+
+# === Sampling ===
+def parse_range(spec: str) -> List[float]:
+    """Parse 'start:stop:step' (inclusive) or 'a,b,c' into a list of values"""
+    if ':' in spec:
+        start, stop, step = (float(v) for v in spec.split(':'))
+        count = int(round((stop - start) / step)) + 1
+        return [round(start + i * step, 10) for i in range(count)]
+    return [float(v) for v in spec.split(',')]
+
+
+def grid_samples(buy: Sequence[float], sell: Sequence[float], fraction: Sequence[float]) -> np.ndarray:
+    """Full Cartesian grid, one (buy, sell, fraction) row per combination"""
+    mesh = np.meshgrid(buy, sell, fraction, indexing='ij')
+    return np.column_stack([axis.ravel() for axis in mesh])
+
+
+def random_samples(bounds: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Uniform random samples within [low, high] per column"""
+    return bounds[:, 0] + rng.random((count, len(bounds))) * (bounds[:, 1] - bounds[:, 0])
+
+
+def latin_hypercube_samples(bounds: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Latin hypercube: each column hits every one of `count` equal strata exactly once"""
+    dims = len(bounds)
+    strata = (np.arange(count)[:, None] + rng.random((count, dims))) / count
+    for d in range(dims):
+        strata[:, d] = strata[rng.permutation(count), d]
+    return bounds[:, 0] + strata * (bounds[:, 1] - bounds[:, 0])
+
+
+# === Workers ===
+def _init_worker(block_name: str, length: int, options: dict):
+    """Pool initializer: map the parent's shared price block without copying it"""
+    global _shared_block, _shared_prices, _options
+    _options = options
+    _shared_block = shared_memory.SharedMemory(name=block_name)
+    _shared_prices = np.ndarray((length,), dtype=np.float64, buffer=_shared_block.buf)
+    _shared_prices.flags.writeable = False
+
+
+def _evaluate(params: Tuple[float, float, float]) -> SweepResult:
+    buy_offset, sell_offset, trade_fraction = params
+    result = run_backtest(
+        _shared_prices,
+        initial_investment=_options['investment'],
+        step_size=_options['step_size'],
+        min_qty=_options['min_qty'],
+        fee_rate=_options['fee_rate'],
+        buy_offset=buy_offset,
+        sell_offset=sell_offset,
+        trade_fraction=trade_fraction,
+    )
+    return SweepResult(
+        buy_offset=buy_offset,
+        sell_offset=sell_offset,
+        trade_fraction=trade_fraction,
+        total_return=result.total_return,
+        max_drawdown=result.max_drawdown,
+        trade_count=result.trade_count,
+        fees=result.fees,
+        fee_drag=result.fees / result.initial_investment,
+        final_equity=result.final_equity,
+    )
+
+
+def run_sweep(prices: np.ndarray, samples: np.ndarray, investment: float = 1000.0,
+              step_size: float = 0.0001, min_qty: float = 0.0001, fee_rate: float = 0.001,
+              workers: Optional[int] = None, sort_by: str = "total_return") -> List[SweepResult]:
+    """Evaluate every sample row across a process pool and return results ranked by sort_by"""
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key '{sort_by}' (expected one of {SORT_KEYS})")
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    workers = workers or os.cpu_count() or 1
+    options = {'investment': investment, 'step_size': step_size, 'min_qty': min_qty, 'fee_rate': fee_rate}
+    tasks = [(float(b), float(s), float(f)) for b, s, f in samples]
+
+    block = shared_memory.SharedMemory(create=True, size=max(prices.nbytes, 1))
+    try:
+        np.ndarray(prices.shape, dtype=np.float64, buffer=block.buf)[:] = prices
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(block.name, len(prices), options)) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            results = list(pool.map(_evaluate, tasks, chunksize=chunksize))
+    finally:
+        block.close()
+        block.unlink()
+
+    # Lower is better for drawdown and fee drag, higher for everything else
+    reverse = sort_by not in ("max_drawdown", "fee_drag")
+    results.sort(key=lambda r: getattr(r, sort_by), reverse=reverse)
+    return results
+
+
+# === Reporting ===
+def write_results_csv(results: List[SweepResult], path: str):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(SweepResult.__dataclass_fields__))
+        writer.writeheader()
+        for r in results:
+            writer.writerow(asdict(r))
+
+
+def print_results(results: List[SweepResult], top: int, elapsed: float):
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+
+    table = Table(title=f"🔬 Parameter Sweep ({len(results)} runs in {elapsed:.1f}s)", box=box.ROUNDED, border_style="cyan")
+    for column in ("#", "Buy", "Sell", "Fraction", "Return", "Max DD", "Trades", "Fee Drag"):
+        table.add_column(column, style="cyan" if column == "#" else "green", justify="right")
+    for rank, r in enumerate(results[:top], 1):
+        table.add_row(
+            str(rank),
+            f"-{r.buy_offset * 100:.2f}%",
+            f"+{r.sell_offset * 100:.2f}%",
+            f"{r.trade_fraction * 100:.1f}%",
+            f"{r.total_return * 100:+.2f}%",
+            f"{r.max_drawdown * 100:.2f}%",
+            str(r.trade_count),
+            f"{r.fee_drag * 100:.2f}%",
+        )
+    Console().print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep buy/sell offsets and trade fraction over a price history")
+    parser.add_argument("data", help="CSV or Parquet kline/tick file")
+    parser.add_argument("--buy", default="0.005:0.02:0.0025", help="Buy offsets, 'start:stop:step' or 'a,b,c'")
+    parser.add_argument("--sell", default="0.01:0.03:0.0025", help="Sell offsets, 'start:stop:step' or 'a,b,c'")
+    parser.add_argument("--fraction", default="0.03:0.1:0.01", help="Trade fractions, 'start:stop:step' or 'a,b,c'")
+    parser.add_argument("--sampler", choices=["grid", "random", "lhs"], default="grid",
+                        help="grid = every combination; random/lhs = --samples draws within the ranges' bounds")
+    parser.add_argument("--samples", type=int, default=200, help="Number of draws for random/lhs")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for random/lhs")
+    parser.add_argument("--investment", type=float, default=1000.0, help="Initial USDT investment")
+    parser.add_argument("--step-size", type=float, default=0.0001, help="LOT_SIZE stepSize")
+    parser.add_argument("--min-qty", type=float, default=0.0001, help="LOT_SIZE minQty")
+    parser.add_argument("--fee", type=float, default=0.001, help="Fee rate per trade (0.001 = 0.1%%)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--sort", choices=SORT_KEYS, default="total_return", help="Ranking metric")
+    parser.add_argument("--top", type=int, default=20, help="Rows to display")
+    parser.add_argument("--out", help="Write the full ranked table to this CSV")
+    args = parser.parse_args()
+
+    buy, sell, fraction = parse_range(args.buy), parse_range(args.sell), parse_range(args.fraction)
+    if args.sampler == "grid":
+        samples = grid_samples(buy, sell, fraction)
+    else:
+        bounds = np.array([[min(buy), max(buy)], [min(sell), max(sell)], [min(fraction), max(fraction)]])
+        rng = np.random.default_rng(args.seed)
+        sampler = random_samples if args.sampler == "random" else latin_hypercube_samples
+        samples = sampler(bounds, args.samples, rng)
+
+    _, prices = load_prices(args.data)
+    started = time.perf_counter()
+    results = run_sweep(prices, samples, args.investment, args.step_size, args.min_qty,
+                        args.fee, args.workers, args.sort)
+    print_results(results, args.top, time.perf_counter() - started)
+    if args.out:
+        write_results_csv(results, args.out)
+
+
+if __name__ == "__main__":
+    main()
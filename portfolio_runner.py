@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Multi-symbol portfolio runner for the Asymmetric Grid Bot
+Drives one DualTriggerBot per symbol inside a single asyncio process:
+- One shared Client (one keep-alive HTTP session) and one cached exchange-filter lookup
+- One request scheduler for the shared IP weight budget (orders before price polls)
+- One batched ticker request per tick for every symbol
+- Per-symbol trigger checks dispatched concurrently; each symbol keeps its own allocation and state
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from dashboard import Dashboard, render_portfolio
+from exchange_filters import FilterCache
+from metrics import Metrics, MetricsServer
+from request_scheduler import TICKER_BATCH_WEIGHT, RequestScheduler, backoff_delay
+from asymmetric_grid_bot_v211 import (
+    BOT_NAME, BOT_VERSION, DASHBOARD_REFRESH_PER_SECOND, DEFAULT_TRADE_FRACTION, MAX_FAILURE_BACKOFF, POLL_INTERVAL,
+    BotConfig, DualTriggerBot, TradeLogger, binance_client, console,
+)
+
+QUOTE_ASSET = "USDT"
+MAX_ORDER_THREADS = 8
+
+
+def split_symbol(symbol: str, quote_asset: str = QUOTE_ASSET) -> str:
+    """Base asset of a spot symbol, e.g. SOLUSDT -> SOL"""
+    if not symbol.endswith(quote_asset):
+        raise ValueError(f"Only {quote_asset} pairs are supported (got {symbol})")
+    return symbol[:-len(quote_asset)]
+
+
+# === Portfolio ===
+class PortfolioRunner:
+    """Runs many symbol bots on one event loop with one pooled connection"""
+
+    def __init__(self, configs: List[BotConfig], paper_trading: bool, interval: float = POLL_INTERVAL,
+                 api_key: str = "", api_secret: str = ""):
+        self.interval = interval
+        self.paper_trading = paper_trading
+        self.logger = TradeLogger("PORTFOLIO", paper_trading)
+        self.symbols = [c.symbol for c in configs]
+        self._symbols_param = json.dumps(self.symbols, separators=(',', ':'))
+
+        # One client, one session, one connection pool and one weight budget shared by every bot
+        self.client = binance_client(api_key, api_secret) if not paper_trading else binance_client()
+        self.executor = ThreadPoolExecutor(max_workers=MAX_ORDER_THREADS, thread_name_prefix="portfolio")
+        self.metrics = Metrics()
+        self.scheduler = RequestScheduler(metrics=self.metrics, on_log=self.logger._write)
+        self.scheduler.attach(self.client, pool_size=MAX_ORDER_THREADS + 1)
+
+        # One symbol-scoped exchange-info request (or none on a warm cache) for all symbols
+        filters = FilterCache(self.client).get(self.symbols)
+        self.bots: Dict[str, DualTriggerBot] = {
+            c.symbol: DualTriggerBot(c, client=self.client, filters=filters.get(c.symbol), metrics=self.metrics,
+                                     scheduler=self.scheduler)
+            for c in configs
+        }
+        self.last_prices: Dict[str, float] = {}
+        self._in_flight: set = set()
+        self._tasks: set = set()
+        self.logger.log_info(f"Portfolio initialized | {len(self.bots)} symbols: {', '.join(self.symbols)}")
+
+    async def _call(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: func(*args, **kwargs))
+
+    async def fetch_prices(self) -> Dict[str, float]:
+        """Latest price for every symbol in one request"""
+        started = time.perf_counter_ns()
+        try:
+            tickers = await self._call(self.scheduler.call, self.client.get_symbol_ticker,
+                                       weight=TICKER_BATCH_WEIGHT, symbols=self._symbols_param)
+            return {t['symbol']: float(t['price']) for t in tickers if t['symbol'] in self.bots}
+        except Exception as e:
+            self.metrics.inc("price_fetch_errors_total")
+            self.logger.log_error(f"Batched price fetch error: {e}")
+            return {}
+        finally:
+            self.metrics.observe_ns("price_fetch", time.perf_counter_ns() - started)
+
+    async def _check(self, symbol: str, price: float):
+        bot = self.bots[symbol]
+        try:
+            await self._call(bot.check_triggers, price)
+        except Exception as e:
+            bot.logger.log_error(f"Trigger check error: {e}")
+        finally:
+            bot.publish_snapshot(price)
+            self._in_flight.discard(symbol)
+
+    def dispatch(self, symbol: str, price: float):
+        """Hand a crossed trigger to the order pool without blocking the other symbols"""
+        bot = self.bots[symbol]
+        if symbol in self._in_flight:
+            return
+        orders = bot.orders
+        # A sent order is booked by the bot's next check, whether or not the price crosses again;
+        # adaptive offsets fold every price into their volatility bars
+        if (price >= bot.sell_trigger or price <= bot.buy_trigger or bot.volatility is not None
+                or (orders is not None and orders.in_flight is not None)):
+            self._in_flight.add(symbol)
+            task = asyncio.create_task(self._check(symbol, price))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def initialize(self):
+        """Initial 50/50 split for every symbol from one batched price fetch"""
+        prices = await self.fetch_prices()
+        for symbol in list(self.bots):
+            if self.bots[symbol].resumed:
+                self.logger.log_info(f"{symbol}: resumed saved state, skipping initial split")
+                continue
+            price = prices.get(symbol, 0.0)
+            try:
+                await self._call(self.bots[symbol].execute_initial_buy, price)
+            except SystemExit:
+                # execute_initial_buy exits on failure; drop just this symbol
+                self.logger.log_error(f"{symbol}: initial split failed, symbol disabled")
+                del self.bots[symbol]
+        self.symbols = list(self.bots)
+        self._symbols_param = json.dumps(self.symbols, separators=(',', ':'))
+
+    def render_status(self):
+        """Portfolio table from each bot's latest snapshot (None before the first prices)"""
+        snapshots = [bot.latest_snapshot for bot in self.bots.values() if bot.latest_snapshot is not None]
+        if not snapshots:
+            return None
+        return render_portfolio(snapshots, f"📊 {BOT_NAME} v{BOT_VERSION} - Portfolio ({len(self.bots)} symbols)")
+
+    async def run(self):
+        """Main portfolio loop"""
+        self.logger.log_info("Starting portfolio runner...")
+        await self.initialize()
+        consecutive_failures = 0
+        while True:
+            started = time.monotonic()
+            delay = self.interval
+            prices = await self.fetch_prices()
+            if prices:
+                consecutive_failures = 0
+                self.last_prices.update(prices)
+                now_ms = int(time.time() * 1000)
+                for symbol, price in prices.items():
+                    if price > 0:
+                        recorder = self.bots[symbol].recorder
+                        if recorder is not None:
+                            recorder.append(now_ms, price)
+                        self.dispatch(symbol, price)
+                        if symbol not in self._in_flight:
+                            self.bots[symbol].publish_snapshot(price)
+            else:
+                consecutive_failures += 1
+                delay = backoff_delay(consecutive_failures, self.interval, MAX_FAILURE_BACKOFF)
+                self.logger.log_warning(f"Price fetch failed ({consecutive_failures} in a row), retrying in {delay:.1f}s")
+            await asyncio.sleep(max(0.0, delay - (time.monotonic() - started)))
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        self.logger.log_info("Portfolio runner stopped")
+        for bot in self.bots.values():
+            if bot.orders is not None:
+                bot.orders.close()
+            if bot.journal is not None:
+                bot.journal.close()
+            if bot.recorder is not None:
+                bot.recorder.close()
+            bot.logger.close()
+        self.logger.close()
+
+
+# === Configuration ===
+def load_portfolio(path: Optional[str], pairs: List[str], paper_trading: bool) -> List[BotConfig]:
+    """
+    Build one BotConfig per symbol from a JSON file and/or --pair SYMBOL:USDT arguments.
+    JSON format: {"symbols": [{"symbol": "SOLUSDT", "investment": 500, "buy_offset": 0.01, ...}]}
+    """
+    entries = []
+    if path:
+        with open(path) as f:
+            entries.extend(json.load(f).get("symbols", []))
+    for pair in pairs:
+        symbol, investment = pair.split(':')
+        entries.append({"symbol": symbol, "investment": float(investment)})
+    if not entries:
+        raise ValueError("No symbols configured (use --config or --pair)")
+
+    api_key = os.environ.get("BINANCE_API_KEY", "")
+    api_secret = os.environ.get("BINANCE_API_SECRET", "")
+    configs = []
+    for entry in entries:
+        symbol = entry["symbol"].upper()
+        investment = float(entry["investment"])
+        options = {k: entry[k] for k in ("buy_offset", "sell_offset", "trade_fraction", "ladder_levels") if k in entry}
+        configs.append(BotConfig(
+            api_key=api_key,
+            api_secret=api_secret,
+            symbol=symbol,
+            base_asset=split_symbol(symbol),
+            quote_asset=QUOTE_ASSET,
+            initial_investment=investment,
+            usdt_per_trade=investment * options.get("trade_fraction", DEFAULT_TRADE_FRACTION),
+            paper_trading=paper_trading,
+            # Bots share one quote balance, which a per-bot account check can't attribute
+            reconcile_interval=0.0,
+            **options
+        ))
+    return configs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the asymmetric grid strategy on many symbols in one process")
+    parser.add_argument("--config", help="JSON portfolio file")
+    parser.add_argument("--pair", action="append", default=[], help="SYMBOL:USDT_ALLOCATION, e.g. SOLUSDT:500 (repeatable)")
+    parser.add_argument("--live", action="store_true", help="Live trading (keys from BINANCE_API_KEY / BINANCE_API_SECRET)")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="Seconds between batched price fetches")
+    parser.add_argument("--headless", action="store_true", help="Run without the live dashboard")
+    parser.add_argument("--fresh", action="store_true", help="Discard saved per-symbol state and re-split")
+    parser.add_argument("--metrics-port", type=int, default=0, help="Serve Prometheus metrics on this local port")
+    parser.add_argument("--record", action="store_true", help="Record every fetched price to ticks/<SYMBOL>/")
+    args = parser.parse_args()
+
+    paper_trading = not args.live
+    configs = load_portfolio(args.config, args.pair, paper_trading)
+    for config in configs:
+        config.resume = not args.fresh
+        config.record_ticks = args.record
+    runner = PortfolioRunner(configs, paper_trading, args.interval,
+                             os.environ.get("BINANCE_API_KEY", ""), os.environ.get("BINANCE_API_SECRET", ""))
+    metrics_server = None
+    if args.metrics_port:
+        metrics_server = MetricsServer(runner.metrics, args.metrics_port)
+        metrics_server.start()
+    dashboard = None
+    if not args.headless:
+        dashboard = Dashboard(runner.render_status, console=console.rich, refresh_per_second=DASHBOARD_REFRESH_PER_SECOND)
+        dashboard.start()
+    try:
+        asyncio.run(runner.run())
+    except KeyboardInterrupt:
+        if dashboard:
+            dashboard.stop()
+            dashboard = None
+        console.print("\n[yellow]Portfolio stopped by user[/yellow]")
+    finally:
+        if dashboard:
+            dashboard.stop()
+        if metrics_server:
+            metrics_server.stop()
+        runner.shutdown()
+        if runner.metrics.has_data():
+            console.print(runner.metrics.summary_table())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Real-time price feed for the Asymmetric Grid Bot
+Subscribes to a Binance trade or bookTicker stream and hands every update to the bot
+"""
+
+import json
+import random
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+# === Constants ===
+STREAM_URL = "wss://stream.binance.com:9443/ws"
+STREAM_TYPES = ("trade", "bookTicker")
+MAX_PENDING_UPDATES = 10000
+
+
+def parse_price(message: dict) -> float:
+    """Extract a price from a trade or bookTicker payload (0.0 if none)"""
+    if 'p' in message:
+        # Trade stream: last traded price
+        return float(message['p'])
+    if 'b' in message and 'a' in message:
+        # bookTicker stream: mid of best bid / best ask
+        return (float(message['b']) + float(message['a'])) / 2
+    return 0.0
+
+
+# === Reconnecting Stream ===
+class ReconnectingStream(ABC):
+    """
+    Background WebSocket subscription with automatic reconnect and jittered backoff
+    Subclasses provide the URL and turn messages into queued items via _publish()
+    """
+    idle_interval: Optional[float] = None    # Seconds between _on_idle() calls while connected
+
+    def __init__(self, name: str, on_log: Optional[Callable[[str, str], None]] = None,
+                 initial_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.name = name
+        self.on_log = on_log
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+        self.last_update = 0.0    # time.monotonic() of the last update
+        self.update_count = 0
+        self.reconnect_count = 0
+
+        self.connected = threading.Event()
+        self._pending = deque(maxlen=MAX_PENDING_UPDATES)
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._ws = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _log(self, level: str, message: str):
+        if self.on_log:
+            self.on_log(level, message)
+
+    @abstractmethod
+    def _connect_url(self) -> str:
+        """URL to (re)connect to"""
+
+    @abstractmethod
+    def _on_message(self, message: dict):
+        """Handle one decoded message (call _publish() for anything the consumer should see)"""
+
+    def _on_idle(self):
+        """Called every idle_interval seconds while connected (e.g. keepalives)"""
+
+    def start(self):
+        """Start the background receive thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Close the connection and wait for the receive thread to exit"""
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def is_stale(self, max_age: float) -> bool:
+        """True if no update has been received within max_age seconds"""
+        return self.last_update == 0.0 or (time.monotonic() - self.last_update) > max_age
+
+    def wait(self, timeout: float) -> list:
+        """Block until at least one item arrives; return all pending items in order ([] on timeout)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not self._pending and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            items = list(self._pending)
+            self._pending.clear()
+        return items
+
+    def _publish(self, item):
+        with self._cond:
+            self.last_update = time.monotonic()
+            self.update_count += 1
+            self._pending.append(item)
+            self._cond.notify_all()
+
+    def _receive(self, ws):
+        if self.idle_interval is None:
+            yield from ws
+            return
+        next_idle = time.monotonic() + self.idle_interval
+        while not self._stop.is_set():
+            try:
+                yield ws.recv(timeout=max(0.0, next_idle - time.monotonic()))
+            except TimeoutError:
+                pass
+            if time.monotonic() >= next_idle:
+                self._on_idle()
+                next_idle = time.monotonic() + self.idle_interval
+
+    def _run(self):
+        # Imported on the stream thread: REST-only and simulated runs never load websockets
+        from websockets.sync.client import connect
+        backoff = self.initial_backoff
+        while not self._stop.is_set():
+            try:
+                url = self._connect_url()
+                with connect(url, open_timeout=10) as ws:
+                    self._ws = ws
+                    self.connected.set()
+                    self._log("INFO", f"{self.name} connected")
+                    for raw in self._receive(ws):
+                        if self._stop.is_set():
+                            break
+                        self._on_message(json.loads(raw))
+                        backoff = self.initial_backoff
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                self._log("WARNING", f"{self.name} error: {e}")
+            finally:
+                self._ws = None
+                self.connected.clear()
+
+            if self._stop.is_set():
+                break
+            # Jittered exponential backoff before reconnecting
+            delay = backoff * random.uniform(0.5, 1.0)
+            self.reconnect_count += 1
+            self._log("WARNING", f"{self.name} disconnected, reconnecting in {delay:.1f}s")
+            self._stop.wait(delay)
+            backoff = min(backoff * 2, self.max_backoff)
+
+
+# === Price Stream ===
+class PriceStream(ReconnectingStream):
+    """Trade or bookTicker price updates for one symbol"""
+
+    def __init__(self, symbol: str, stream_type: str = "trade", base_url: str = STREAM_URL,
+                 on_log: Optional[Callable[[str, str], None]] = None,
+                 initial_backoff: float = 1.0, max_backoff: float = 60.0,
+                 on_tick: Optional[Callable[[int, float], None]] = None):
+        if stream_type not in STREAM_TYPES:
+            raise ValueError(f"Unknown stream type '{stream_type}' (expected one of {STREAM_TYPES})")
+        super().__init__(f"price-stream-{symbol}", on_log, initial_backoff, max_backoff)
+        self.symbol = symbol
+        self.stream_type = stream_type
+        self.url = f"{base_url.rstrip('/')}/{symbol.lower()}@{stream_type}"
+        self.last_price = 0.0
+        self.on_tick = on_tick    # Called with (event time ms, price) on the receive thread, e.g. a recorder
+
+    def _connect_url(self) -> str:
+        return self.url
+
+    def _on_message(self, message: dict):
+        price = parse_price(message)
+        if price > 0:
+            self.last_price = price
+            if self.on_tick is not None:
+                # Trade time for trades; bookTicker carries none, so use the receive time
+                self.on_tick(int(message.get('T') or message.get('E') or time.time() * 1000), price)
+            self._publish(price)
+
+    def wait_for_prices(self, timeout: float) -> List[float]:
+        """Block until at least one update arrives; return all pending prices in order ([] on timeout)"""
+        return self.wait(timeout)
@@ -0,0 +1,180 @@
+"""
+Balance reconciliation for live trading
+The bot trades an allocation, not the whole account, so for each of its two assets it keeps
+    offset = account total (free + locked) - bot balance
+from a first account snapshot (journaled with the rest of the state). After that:
+- Fills are booked exactly once per exchange trade id, whichever arrives first: the REST order
+  response or the user-data stream's executionReport (quantity, quote quantity, commission)
+- Every outboundAccountPosition (pushed after each fill) and a periodic get_account snapshot are
+  compared with bot balance + offset; a divergence seen on two checks in a row is reported and
+  the bot balance corrected to the exchange
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from request_scheduler import ACCOUNT_WEIGHT
+from user_stream import UserDataStream
+
+# === Constants ===
+RECONCILE_INTERVAL = 300.0   # Seconds between full account snapshots
+RECONCILE_TOLERANCE = 1e-6   # Divergence ignored below this (exchange amounts have 8 decimals)
+BOOKED_TRADE_MEMORY = 10000  # Trade ids remembered for de-duplication
+
+
+class BalanceReconciler:
+    """Keeps a live bot's balances equal to what the exchange holds for it"""
+
+    def __init__(self, bot, interval: float = RECONCILE_INTERVAL, tolerance: float = RECONCILE_TOLERANCE):
+        self.bot = bot
+        self.config = bot.config
+        self.client = bot.client
+        self.logger = bot.logger
+        self.metrics = bot.metrics
+        self.interval = interval
+        self.tolerance = tolerance
+        self.assets = (self.config.base_asset, self.config.quote_asset)
+        self.stream: Optional[UserDataStream] = None
+        self._booked = set()
+        self._booked_order = deque()
+        self._pending: Dict[str, float] = {}    # asset -> divergence awaiting confirmation
+        self._last_snapshot = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # === Booking fills ===
+    def _balance_attr(self, asset: str) -> str:
+        return "crypto_balance" if asset == self.config.base_asset else "usdt_balance"
+
+    def book_fill(self, trade_id: Optional[int], side: str, quantity: float, quote_quantity: float,
+                  commission: float, commission_asset: Optional[str]) -> bool:
+        """Apply one fill to the bot's balances; False if this trade id was already booked"""
+        bot = self.bot
+        with self._lock:
+            if trade_id is not None and trade_id >= 0:
+                if trade_id in self._booked:
+                    return False
+                self._booked.add(trade_id)
+                self._booked_order.append(trade_id)
+                if len(self._booked_order) > BOOKED_TRADE_MEMORY:
+                    self._booked.discard(self._booked_order.popleft())
+            if side == "BUY":
+                bot.crypto_balance += quantity
+                bot.usdt_balance -= quote_quantity
+            else:
+                bot.crypto_balance -= quantity
+                bot.usdt_balance += quote_quantity
+            if commission_asset == self.config.base_asset:
+                bot.crypto_balance -= commission
+            elif commission_asset == self.config.quote_asset:
+                bot.usdt_balance -= commission
+            return True
+
+    def book_order(self, side: str, order: dict):
+        """Book the fills of a REST order response (FULL response type)"""
+        for fill in order.get('fills', []):
+            quantity = float(fill['qty'])
+            self.book_fill(fill.get('tradeId'), side, quantity, float(fill['price']) * quantity,
+                           float(fill.get('commission') or 0), fill.get('commissionAsset'))
+
+    # === Checks ===
+    def fetch_totals(self) -> Dict[str, float]:
+        """Free + locked per asset from one get_account call"""
+        account = self.bot.scheduler.call(self.client.get_account, weight=ACCOUNT_WEIGHT)
+        return {b['asset']: float(b['free']) + float(b['locked'])
+                for b in account.get('balances', []) if b['asset'] in self.assets}
+
+    def check(self, totals: Dict[str, float], source: str):
+        """Compare exchange totals with bot balance + offset; correct confirmed divergences"""
+        bot = self.bot
+        corrected = False
+        with self._lock:
+            offsets = bot.account_offsets
+            for asset, total in totals.items():
+                if asset not in self.assets or asset not in offsets:
+                    continue
+                attr = self._balance_attr(asset)
+                divergence = total - offsets[asset] - getattr(bot, attr)
+                if abs(divergence) <= self.tolerance:
+                    self._pending.pop(asset, None)
+                    continue
+                previous = self._pending.get(asset)
+                if previous is None or abs(divergence - previous) > self.tolerance:
+                    # A fill may still be in flight; wait for a second look before touching balances
+                    self._pending[asset] = divergence
+                    continue
+                self._pending.pop(asset)
+                setattr(bot, attr, getattr(bot, attr) + divergence)
+                corrected = True
+                self.metrics.inc("balance_corrections_total", asset=asset)
+                self.logger.log_warning(
+                    f"Balance divergence ({source}): {asset} {divergence:+.8f}, "
+                    f"corrected to {getattr(bot, attr):.8f}")
+        if corrected:
+            bot.save_state("RECONCILE")
+
+    def check_snapshot(self):
+        """Full account check (one weighted REST call)"""
+        self._last_snapshot = time.monotonic()
+        try:
+            self.check(self.fetch_totals(), "snapshot")
+        except Exception as e:
+            self.logger.log_warning(f"Account snapshot failed: {e}")
+
+    def maybe_check(self):
+        if time.monotonic() - self._last_snapshot >= self.interval:
+            self.check_snapshot()
+
+    def handle_event(self, event: dict):
+        """Apply one user-data event (fills are de-duplicated against the REST responses)"""
+        kind = event.get('e')
+        if kind == 'executionReport':
+            if event.get('s') != self.config.symbol or event.get('x') != 'TRADE':
+                return
+            quantity = float(event['l'])
+            quote = float(event['Y']) if event.get('Y') is not None else quantity * float(event['L'])
+            self.book_fill(event.get('t'), event['S'], quantity, quote, float(event.get('n') or 0), event.get('N'))
+        elif kind == 'outboundAccountPosition':
+            self.check({b['a']: float(b['f']) + float(b['l']) for b in event.get('B', [])}, "stream")
+
+    # === Lifecycle ===
+    def start(self, own_stream: bool = True):
+        """
+        Take the first account snapshot (records offsets on a fresh start, checks them on resume).
+        With own_stream, consume the user-data stream on a background thread; otherwise the caller
+        (limit mode, which already has a stream) passes events to handle_event().
+        """
+        bot = self.bot
+        totals = self.fetch_totals()
+        self._last_snapshot = time.monotonic()
+        missing = [a for a in self.assets if a not in bot.account_offsets]
+        if missing:
+            with self._lock:
+                for asset in missing:
+                    bot.account_offsets[asset] = totals.get(asset, 0.0) - getattr(bot, self._balance_attr(asset))
+            bot.save_state("RECONCILE")
+            self.logger.log_info("Reconciliation baseline | " + ", ".join(
+                f"{a}: account {totals.get(a, 0.0):.8f}, bot {getattr(bot, self._balance_attr(a)):.8f}" for a in missing))
+        else:
+            self.check(totals, "startup")
+        if own_stream:
+            self.stream = UserDataStream(self.client, base_url=self.config.user_stream_url, on_log=self.logger._write)
+            self.stream.start()
+            self._thread = threading.Thread(target=self._run, name="reconciler", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            for event in self.stream.wait_for_events(timeout=1.0):
+                self.handle_event(event)
+            self.maybe_check()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self.stream is not None:
+            self.stream.stop()
@@ -0,0 +1,168 @@
+"""
+Rate-limit-aware REST scheduler for the Asymmetric Grid Bot
+Binance limits request weight per IP per minute and answers 429 (slow down) and then 418 (IP ban)
+when it is exceeded. One scheduler per process sits in front of the Client calls:
+- Used weight comes from the X-MBX-USED-WEIGHT-1M header of every response, so the budget counts
+  every bot and process behind the same IP, not only our own requests
+- Price polls may use the lower part of the minute's budget; orders keep the headroom above it and
+  go first while any are waiting
+- A 429/418 stops every request until Retry-After plus a jittered exponential backoff has passed
+- The client's session is mounted on one keep-alive connection pool
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+# === Constants ===
+WEIGHT_LIMIT = 6000          # Spot REQUEST_WEIGHT per minute (exchangeInfo rateLimits)
+WEIGHT_WINDOW = 60           # Seconds; Binance resets the counter on the minute
+POLL_BUDGET = 0.6            # Polls wait once the window is this full...
+ORDER_BUDGET = 0.9           # ...orders only past this point
+PRIORITY_ORDER, PRIORITY_POLL = 0, 1
+ORDER_MAX_WAIT = 10.0        # A market order throttled longer than this is skipped (the price moved on)
+POOL_SIZE = 4                # Keep-alive connections per client session
+BACKOFF_BASE = 1.0           # Seconds, doubled per consecutive 429/418
+BACKOFF_MAX = 300.0
+MAX_SLEEP_STEP = 0.25        # Waiting requests re-check this often (orders may jump the queue)
+
+# Request weights of the endpoints the bot uses (Binance spot API docs)
+TICKER_WEIGHT = 2            # /api/v3/ticker/price?symbol=
+TICKER_BATCH_WEIGHT = 4      # /api/v3/ticker/price?symbols=[...]
+KLINES_WEIGHT = 2            # /api/v3/klines
+ORDER_WEIGHT = 1             # POST/DELETE /api/v3/order
+OPEN_ORDERS_WEIGHT = 6       # /api/v3/openOrders?symbol=
+ACCOUNT_WEIGHT = 20          # /api/v3/account
+
+USED_WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1M"
+THROTTLE_STATUSES = (418, 429)
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_MAX) -> float:
+    """Jittered exponential delay for the attempt-th consecutive failure (1, 2, ...)"""
+    delay = min(cap, base * 2 ** max(attempt - 1, 0))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class RequestThrottled(Exception):
+    """A request would have to wait longer than its caller allows"""
+
+
+class RequestScheduler:
+    """Admits REST calls against the shared per-minute weight budget"""
+
+    def __init__(self, weight_limit: int = WEIGHT_LIMIT, poll_budget: float = POLL_BUDGET,
+                 order_budget: float = ORDER_BUDGET, clock=None, metrics=None,
+                 on_log: Optional[Callable[[str, str], None]] = None):
+        self.weight_limit = weight_limit
+        self.poll_limit = weight_limit * poll_budget
+        self.order_limit = weight_limit * order_budget
+        self.clock = clock or time
+        self.metrics = metrics
+        self.on_log = on_log
+        self.enabled = True
+        self.used_weight = 0
+        self.blocked_until = 0.0
+        self._window = 0
+        self._strikes = 0             # Consecutive 429/418 responses
+        self._waiting_orders = 0
+        self._lock = threading.Lock()
+
+    def _log(self, level: str, message: str):
+        if self.on_log:
+            self.on_log(level, message)
+
+    def attach(self, client, pool_size: int = POOL_SIZE):
+        """Pool the client's keep-alive connections and read rate-limit headers from its responses"""
+        session = getattr(client, "session", None)
+        if session is None:
+            # Simulator / mock exchange: no rate limits to respect
+            self.enabled = False
+            return client
+        from requests.adapters import HTTPAdapter
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        if self._on_response not in session.hooks["response"]:
+            session.hooks["response"].append(self._on_response)
+        return client
+
+    # === Responses ===
+    def _on_response(self, response, *args, **kwargs):
+        now = self.clock.time()
+        used = response.headers.get(USED_WEIGHT_HEADER)
+        status = response.status_code
+        with self._lock:
+            self._roll_window(now)
+            if used is not None:
+                # Authoritative for the whole IP; replaces our own estimate
+                self.used_weight = int(used)
+            if status in THROTTLE_STATUSES:
+                self._strikes += 1
+                try:
+                    retry_after = float(response.headers.get("Retry-After", 0))
+                except ValueError:
+                    retry_after = 0.0
+                # Jitter on top of Retry-After so bots sharing an IP don't all resume together
+                delay = retry_after + backoff_delay(self._strikes)
+                self.blocked_until = max(self.blocked_until, now + delay)
+            elif status < 400:
+                self._strikes = 0
+        if status in THROTTLE_STATUSES:
+            if self.metrics is not None:
+                self.metrics.inc("rate_limited_total", status=str(status))
+            kind = "IP banned (418)" if status == 418 else "Rate limited (429)"
+            self._log("WARNING", f"{kind}: all requests paused for {delay:.1f}s")
+
+    def _roll_window(self, now: float):
+        window = int(now // WEIGHT_WINDOW)
+        if window != self._window:
+            self._window = window
+            self.used_weight = 0
+
+    # === Admission ===
+    def _wait_time(self, priority: int, weight: int, now: float) -> float:
+        """Seconds until this request may go out (0 = now); call with the lock held"""
+        self._roll_window(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if priority == PRIORITY_POLL and self._waiting_orders:
+            return MAX_SLEEP_STEP
+        limit = self.order_limit if priority == PRIORITY_ORDER else self.poll_limit
+        if self.used_weight + weight > limit:
+            return (self._window + 1) * WEIGHT_WINDOW - now
+        return 0.0
+
+    def acquire(self, priority: int = PRIORITY_POLL, weight: int = 1, max_wait: Optional[float] = None):
+        """Block until the request fits the budget; RequestThrottled if that takes longer than max_wait"""
+        if not self.enabled:
+            return
+        waited = 0.0
+        queued = False
+        try:
+            while True:
+                with self._lock:
+                    wait = self._wait_time(priority, weight, self.clock.time())
+                    if wait <= 0:
+                        self.used_weight += weight
+                        break
+                    if max_wait is not None and waited + wait > max_wait:
+                        raise RequestThrottled(f"request throttled for another {wait:.1f}s")
+                    if priority == PRIORITY_ORDER and not queued:
+                        self._waiting_orders += 1
+                        queued = True
+                step = min(wait, MAX_SLEEP_STEP)
+                self.clock.sleep(step)
+                waited += step
+        finally:
+            if queued:
+                with self._lock:
+                    self._waiting_orders -= 1
+        if waited and self.metrics is not None:
+            self.metrics.inc("throttled_requests_total", priority="order" if priority == PRIORITY_ORDER else "poll")
+            self.metrics.observe_ns("throttle_wait", int(waited * 1e9))
+
+    def call(self, func, *args, priority: int = PRIORITY_POLL, weight: int = 1,
+             max_wait: Optional[float] = None, **kwargs):
+        """Run one Client call once the budget admits it"""
+        self.acquire(priority, weight, max_wait)
+        return func(*args, **kwargs)
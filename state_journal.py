@@ -0,0 +1,238 @@
+"""
+Crash-safe state journal for the Asymmetric Grid Bot
+Every state transition is appended as one checksummed line holding only what changed since the
+previous record; every SNAPSHOT_EVERY records the full state (ledger lots included) is written to
+a snapshot (atomic replace, directory fsynced) and the journal is truncated. The first record
+after a snapshot or a restart carries the full state, so the journal alone can still rebuild it.
+A restart loads the snapshot and replays the journal tail, stopping at the first torn record.
+
+Journal line format: "<crc32 hex> <json>\n" where the JSON is
+    {"seq": n, "event": ..., "state": {...}}        full state
+    {"seq": n, "event": ..., "changes": [...]}      changes against record n - 1:
+        ["set", path, value], ["del", path] or ["splice", path, start, stop, items] (lists),
+        path being the list of keys from the top of the state
+"""
+
+import json
+import os
+import zlib
+from typing import Callable, List, Optional, Tuple
+
+# === Constants ===
+STATE_DIR = "state"
+SNAPSHOT_EVERY = 100     # Journal records between snapshots
+
+
+def encode_record(record: dict) -> bytes:
+    payload = json.dumps(record, separators=(',', ':')).encode()
+    return b"%08x %s\n" % (zlib.crc32(payload), payload)
+
+
+def decode_record(line: bytes) -> Optional[dict]:
+    """Parse one journal line; None if it is torn or corrupt"""
+    if not line.endswith(b"\n") or len(line) < 10 or line[8:9] != b" ":
+        return None
+    payload = line[9:-1]
+    try:
+        if int(line[:8], 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+def diff_state(old: dict, new: dict, path: Optional[list] = None) -> List[list]:
+    """Changes that turn old into new (nested dicts by key, lists as one splice)"""
+    path = path or []
+    changes = []
+    for key, value in new.items():
+        if key not in old:
+            changes.append(["set", path + [key], value])
+            continue
+        previous = old[key]
+        if previous == value:
+            continue
+        if isinstance(previous, dict) and isinstance(value, dict):
+            changes.extend(diff_state(previous, value, path + [key]))
+        elif isinstance(previous, list) and isinstance(value, list):
+            # Lots are appended at the back and consumed from the front: trim the common ends
+            start, old_end, new_end = 0, len(previous), len(value)
+            while start < min(old_end, new_end) and previous[start] == value[start]:
+                start += 1
+            while old_end > start and new_end > start and previous[old_end - 1] == value[new_end - 1]:
+                old_end -= 1
+                new_end -= 1
+            changes.append(["splice", path + [key], start, old_end, value[start:new_end]])
+        else:
+            changes.append(["set", path + [key], value])
+    changes.extend(["del", path + [key]] for key in old if key not in new)
+    return changes
+
+
+def apply_changes(state: dict, changes: List[list]):
+    """Apply diff_state() output to state in place"""
+    for change in changes:
+        op, path = change[0], change[1]
+        parent = state
+        for key in path[:-1]:
+            parent = parent[key]
+        key = path[-1]
+        if op == "set":
+            parent[key] = change[2]
+        elif op == "del":
+            parent.pop(key, None)
+        else:
+            start, stop, items = change[2:]
+            parent[key][start:stop] = items
+
+
+class StateJournal:
+    """
+    Append-only journal plus snapshot for one bot's state (a JSON dict)
+    Records are diffed against the previous state passed to append(), so callers pass a fresh
+    dict each time and don't modify it afterwards.
+    """
+
+    def __init__(self, name: str, directory: str = STATE_DIR, snapshot_every: int = SNAPSHOT_EVERY,
+                 fsync: bool = True, on_log: Optional[Callable[[str, str], None]] = None):
+        os.makedirs(directory, exist_ok=True)
+        self.journal_path = os.path.join(directory, f"{name}.journal")
+        self.snapshot_path = os.path.join(directory, f"{name}.snapshot.json")
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.on_log = on_log
+        self.seq = 0
+        self.state: Optional[dict] = None
+        self._since_snapshot = 0
+        self._full_next = True      # Next record carries the full state
+        self._fd: Optional[int] = None
+
+    def _log(self, level: str, message: str):
+        if self.on_log:
+            self.on_log(level, message)
+
+    def _open(self):
+        if self._fd is None:
+            self._fd = os.open(self.journal_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+
+    def _sync(self, fd: int):
+        if self.fsync:
+            os.fsync(fd)
+
+    def _sync_directory(self):
+        """Make a rename in the state directory durable (POSIX; Windows has no directory handles)"""
+        if self.fsync and hasattr(os, "O_DIRECTORY"):
+            fd = os.open(os.path.dirname(self.snapshot_path) or ".", os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    # === Recovery ===
+    def _read_snapshot(self) -> Tuple[int, Optional[dict]]:
+        try:
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+            return snapshot["seq"], snapshot["state"]
+        except FileNotFoundError:
+            return 0, None
+        except (ValueError, KeyError) as e:
+            # Snapshots are replaced atomically, so this means outside damage; fall back to the journal
+            self._log("WARNING", f"Ignoring unreadable state snapshot {self.snapshot_path}: {e}")
+            return 0, None
+
+    def load(self) -> Optional[dict]:
+        """Latest saved state (None if there is none); a torn journal tail is cut off"""
+        seq, state = self._read_snapshot()
+        replayed = 0
+        try:
+            with open(self.journal_path, "rb") as f:
+                offset = 0
+                for line in f:
+                    record = decode_record(line)
+                    if record is None:
+                        break
+                    # Records already folded into the snapshot survive a crash between the
+                    # snapshot rename and the journal truncation; skip them
+                    if record["seq"] > seq:
+                        if "state" in record:
+                            state = record["state"]
+                        elif state is not None and record["seq"] == seq + 1:
+                            apply_changes(state, record["changes"])
+                        else:
+                            # Changes against a record we don't have (e.g. the snapshot was lost)
+                            break
+                        seq = record["seq"]
+                        replayed += 1
+                    offset += len(line)
+                size = f.seek(0, os.SEEK_END)
+            if offset < size:
+                self._log("WARNING", f"State journal: discarded {size - offset} bytes of torn/corrupt tail")
+                with open(self.journal_path, "r+b") as f:
+                    f.truncate(offset)
+        except FileNotFoundError:
+            pass
+
+        self.seq = seq
+        self.state = state
+        self._since_snapshot = replayed
+        self._full_next = True
+        if state is not None:
+            self._log("INFO", f"State restored (seq {seq}, {replayed} journal records replayed)")
+            if replayed:
+                self.snapshot()
+        return state
+
+    # === Writing ===
+    def append(self, event: str, state: dict):
+        """Durably record a state transition (only what changed since the last one)"""
+        self.seq += 1
+        record = {"seq": self.seq, "event": event}
+        if self._full_next or self.state is None:
+            record["state"] = state
+            self._full_next = False
+        else:
+            record["changes"] = diff_state(self.state, state)
+        self.state = state
+        self._open()
+        os.write(self._fd, encode_record(record))
+        self._sync(self._fd)
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self):
+        """Write the current state to the snapshot file and empty the journal"""
+        if self.state is None:
+            return
+        tmp = f"{self.snapshot_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"seq": self.seq, "state": self.state}, f)
+            f.flush()
+            self._sync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        # The rename must be on disk before the journal records it replaces are dropped
+        self._sync_directory()
+        self._open()
+        os.ftruncate(self._fd, 0)
+        self._sync(self._fd)
+        self._since_snapshot = 0
+        self._full_next = True
+
+    def clear(self):
+        """Forget all saved state (fresh start)"""
+        self.close()
+        for path in (self.journal_path, self.snapshot_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.seq = 0
+        self.state = None
+        self._since_snapshot = 0
+        self._full_next = True
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,595 @@
+#!/usr/bin/env python3
+"""
+Multi-process supervisor for the Asymmetric Grid Bot
+Runs several DualTriggerBot strategies (different offsets, sizes or sub-accounts) as worker
+processes that share one market-data feed per symbol:
+- The supervisor owns the feed: one batched REST ticker request per interval for every symbol,
+  or one WebSocket stream per symbol (with the same REST fallback while a stream is stale)
+- Each price is published with its sequence number and timestamp into a shared-memory ring per
+  symbol; workers read it without locks (checksummed slots) and wake on a pipe, so every worker sees
+  the same prices and trigger checks run on as many cores as there are workers
+- Crashed workers are restarted with jittered backoff; each keeps its own process, exchange client,
+  log and state journal (BotConfig.instance), so a restart resumes instead of re-buying
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import select
+import signal
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+from rich import box
+from rich.table import Table
+
+from dashboard import Dashboard
+from metrics import Metrics, MetricsServer
+from price_stream import PriceStream
+from request_scheduler import TICKER_BATCH_WEIGHT, RequestScheduler, backoff_delay
+from asymmetric_grid_bot_v211 import (
+    BOT_NAME, BOT_VERSION, DASHBOARD_REFRESH_PER_SECOND, MAX_FAILURE_BACKOFF, POLL_INTERVAL, STREAM_STALE_AFTER,
+    BotConfig, DualTriggerBot, TradeLogger, binance_client, console, load_config,
+)
+
+# === Constants ===
+RING_CAPACITY = 1024        # Prices kept per symbol; a worker further behind skips to the oldest kept
+MAX_READERS = 64            # Worker heartbeat slots per ring
+SUPERVISE_INTERVAL = 1.0    # Seconds between worker checks (and stale-stream checks)
+WORKER_WAIT = 1.0           # Longest a worker sleeps before re-checking the ring and the stop flag
+HUNG_AFTER = 120.0          # Seconds without a worker heartbeat before it is reported as hung
+STABLE_AFTER = 60.0         # A worker up this long has its restart backoff reset
+STOP_TIMEOUT = 10.0         # Seconds workers get to close their journals before they are terminated
+# Workers start from a fresh interpreter: nothing (threads, locks, sockets, open logs) is inherited
+_CONTEXT = multiprocessing.get_context("spawn")
+
+# Ring layout: a 64-byte header, MAX_READERS reader slots, then RING_CAPACITY price slots.
+# Every field is an aligned 8-byte integer or double.
+_HEADER = struct.Struct("<qqqq")        # head sequence, capacity, closed flag, reader slots
+_READER = struct.Struct("<qqqq")        # pid, last sequence read, heartbeat (epoch ms), restarts
+_SLOT = struct.Struct("<qdqq")          # sequence, price, timestamp (epoch ms), CRC-32 of the first three
+_HEAD = struct.Struct("<q")
+_PAYLOAD = struct.Struct("<qdq")
+_READ_ATTEMPTS = 8          # Re-reads of a slot that is mid-write or not yet visible
+_PENDING = object()         # read result: the slot doesn't hold the sequence yet
+_HEADER_SIZE = 64
+_READERS_OFFSET = _HEADER_SIZE
+
+
+# === Shared Price Ring ===
+class PriceRing:
+    """
+    Single-writer, many-reader ring of (sequence, price, timestamp) in shared memory
+    Each slot carries a CRC-32 of its payload, and the payload carries its own sequence number. A
+    reader copies the slot once and keeps it only if the checksum matches and the sequence is the
+    one it asked for; an older sequence means the write is not visible yet, a newer one that the
+    writer lapped it. Nothing depends on the order in which the writer's stores become visible, so
+    this holds on weakly ordered CPUs (ARM, POWER) as well as x86-64. Readers never block the
+    writer or each other.
+    """
+
+    def __init__(self, name: Optional[str] = None, capacity: int = RING_CAPACITY, readers: int = MAX_READERS):
+        if name is None:
+            size = _READERS_OFFSET + readers * _READER.size + capacity * _SLOT.size
+            self.block = shared_memory.SharedMemory(create=True, size=size)
+            _HEADER.pack_into(self.block.buf, 0, 0, capacity, 0, readers)
+            self.owner = True
+        else:
+            self.block = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.buf = self.block.buf
+        _, self.capacity, _, self.readers = _HEADER.unpack_from(self.buf, 0)
+        self._slots_offset = _READERS_OFFSET + self.readers * _READER.size
+        self.sequence = self.head()
+        self.dropped = 0        # Prices a reader missed because the writer lapped it
+
+    @property
+    def name(self) -> str:
+        return self.block.name
+
+    # === Writer ===
+    def publish(self, price: float, timestamp_ms: int) -> int:
+        """Append one price (single writer only); returns its sequence number"""
+        sequence = self.sequence + 1
+        offset = self._slots_offset + (sequence % self.capacity) * _SLOT.size
+        buf = self.buf
+        payload = _PAYLOAD.pack(sequence, price, timestamp_ms)
+        _SLOT.pack_into(buf, offset, sequence, price, timestamp_ms, zlib.crc32(payload))
+        _HEAD.pack_into(buf, 0, sequence)      # Head: the header's first field
+        self.sequence = sequence
+        return sequence
+
+    def close_ring(self):
+        """Tell every reader to stop"""
+        _HEADER.pack_into(self.buf, 0, self.sequence, self.capacity, 1, self.readers)
+
+    # === Readers ===
+    def head(self) -> int:
+        return _HEADER.unpack_from(self.buf, 0)[0]
+
+    @property
+    def closed(self) -> bool:
+        return bool(_HEADER.unpack_from(self.buf, 0)[2])
+
+    def _read(self, sequence: int):
+        """(sequence, price, timestamp_ms); None if overwritten, _PENDING if not visible yet"""
+        offset = self._slots_offset + (sequence % self.capacity) * _SLOT.size
+        buf = self.buf
+        for _ in range(_READ_ATTEMPTS):
+            # One copy, checked as a whole: a torn copy fails the checksum whatever order it mixed
+            raw = bytes(buf[offset:offset + _SLOT.size])
+            stored, price, timestamp_ms, check = _SLOT.unpack(raw)
+            if check != zlib.crc32(raw[:_PAYLOAD.size]):
+                continue
+            if stored == sequence:
+                return stored, price, timestamp_ms
+            if stored > sequence:
+                return None
+        # Still torn or older: either our write isn't visible yet or the writer is lapping the slot
+        return None if self.head() - sequence >= self.capacity - 1 else _PENDING
+
+    def read(self, sequence: int) -> Optional[Tuple[int, float, int]]:
+        """(sequence, price, timestamp_ms), or None if that sequence was overwritten or isn't readable yet"""
+        entry = self._read(sequence)
+        return None if entry is _PENDING else entry
+
+    def since(self, last: int) -> List[Tuple[int, float, int]]:
+        """Every price published after sequence `last`, oldest first"""
+        head = self.head()
+        if head <= last:
+            return []
+        # The slot after head may be mid-write, so the oldest safe one is head - capacity + 2
+        start = max(last + 1, head - self.capacity + 2)
+        self.dropped += start - last - 1
+        entries = []
+        for sequence in range(start, head + 1):
+            entry = self._read(sequence)
+            if entry is _PENDING:
+                # The head became visible before the slot did; pick it up on the next call
+                break
+            if entry is None:
+                self.dropped += 1
+            else:
+                entries.append(entry)
+        return entries
+
+    def latest(self) -> Optional[Tuple[int, float, int]]:
+        head = self.head()
+        return self.read(head) if head else None
+
+    # === Reader heartbeats ===
+    def beat(self, slot: int, last: int, restarts: int = 0):
+        """A reader records its pid, progress and liveness in its own slot"""
+        _READER.pack_into(self.buf, _READERS_OFFSET + slot * _READER.size, os.getpid(), last,
+                          int(time.time() * 1000), restarts)
+
+    def reader_state(self, slot: int) -> Tuple[int, int, int, int]:
+        return _READER.unpack_from(self.buf, _READERS_OFFSET + slot * _READER.size)
+
+    def release(self):
+        """Unmap the block (and remove it, for the process that created it)"""
+        self.buf = None
+        self.block.close()
+        if self.owner:
+            self.block.unlink()
+
+
+# === Worker Process ===
+def _consume(bot: DualTriggerBot, ring: PriceRing, last: int) -> int:
+    """Check triggers on every price after `last` and return the newest sequence seen"""
+    entries = ring.since(last)
+    for entry in entries:
+        bot.check_triggers(entry[1])
+    if entries:
+        bot.publish_snapshot(entries[-1][1])
+        return entries[-1][0]
+    orders = bot.orders
+    if orders is not None and orders.in_flight is not None:
+        # Quiet symbol: book a finished order now, not whenever the next price arrives
+        orders.poll()
+    return last
+
+
+def _run_worker(config: BotConfig, ring_name: str, slot: int, wake, restarts: int):
+    """Worker entry point: one DualTriggerBot fed from the supervisor's ring instead of its own polls"""
+    # Ctrl+C reaches the whole process group; workers stop when the supervisor closes the ring
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    ring = PriceRing(ring_name)
+    wake_fd = wake.fileno()
+    bot = DualTriggerBot(config)
+    bot.logger.log_info(f"Supervised worker {config.instance} | pid {os.getpid()} | restarts {restarts}")
+    try:
+        latest = ring.latest()
+        while latest is None and not ring.closed:
+            select.select([wake_fd], [], [], WORKER_WAIT)
+            latest = ring.latest()
+        if latest is None:
+            return
+        last = latest[0]
+        ring.beat(slot, last, restarts)
+        if bot.resumed:
+            bot.logger.log_info(f"Resumed saved state | Ref: ${bot.reference_price:.2f} | {bot.trade_count} trades so far")
+        else:
+            bot.execute_initial_buy(latest[1])
+        if bot.reconciler is not None:
+            try:
+                bot.reconciler.start()
+            except Exception as e:
+                bot.logger.log_warning(f"Balance reconciliation disabled, account snapshot failed: {e}")
+                bot.reconciler = None
+        bot.check_triggers(latest[1])
+        bot.publish_snapshot(latest[1])
+
+        consecutive_failures = 0
+        while not ring.closed:
+            readable, _, _ = select.select([wake_fd], [], [], WORKER_WAIT)
+            if readable:
+                os.read(wake_fd, 4096)
+            try:
+                last = _consume(bot, ring, last)
+                consecutive_failures = 0
+            except Exception as e:
+                consecutive_failures += 1
+                bot.metrics.inc("loop_errors_total")
+                bot.logger.log_error(f"Loop error: {e}")
+                time.sleep(backoff_delay(consecutive_failures, 1.0, MAX_FAILURE_BACKOFF))
+            ring.beat(slot, last, restarts)
+        bot.logger.log_info(f"Supervisor stopped the worker | {ring.dropped} prices skipped while behind")
+    finally:
+        if bot.orders is not None:
+            bot.orders.close()
+        if bot.reconciler is not None:
+            bot.reconciler.stop()
+        if bot.journal is not None:
+            bot.journal.close()
+        bot.logger.close()
+        ring.release()
+
+
+@dataclass
+class Worker:
+    """Supervisor-side handle for one worker process"""
+    config: BotConfig
+    slot: int
+    process: Optional[multiprocessing.process.BaseProcess] = None
+    wake: Optional[int] = None          # Write end of the worker's wake pipe (non-blocking)
+    started: float = 0.0
+    restarts: int = 0
+    failures: int = 0                   # Consecutive short-lived runs (drives the restart backoff)
+    restart_at: float = 0.0
+    last_exit: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.config.symbol}/{self.config.instance}"
+
+
+# === Supervisor ===
+class Supervisor:
+    """One feed per symbol, one shared-memory ring per symbol, one process per strategy"""
+
+    def __init__(self, configs: List[BotConfig], feed: str = "rest", interval: float = POLL_INTERVAL,
+                 record: bool = False, capacity: int = RING_CAPACITY):
+        paper_trading = all(c.paper_trading for c in configs)
+        self.feed = feed
+        self.interval = interval
+        self.logger = TradeLogger("SUPERVISOR", paper_trading)
+        self.metrics = Metrics()
+        self.symbols = sorted({c.symbol for c in configs})
+        self._symbols_param = json.dumps(self.symbols, separators=(',', ':'))
+
+        # Public market data only: orders go through each worker's own client
+        self.client = binance_client()
+        self.scheduler = RequestScheduler(metrics=self.metrics, on_log=self.logger._write)
+        self.scheduler.attach(self.client)
+
+        self.rings: Dict[str, PriceRing] = {s: PriceRing(capacity=capacity) for s in self.symbols}
+        self._ring_locks = {s: threading.Lock() for s in self.symbols}
+        self.recorders = {}
+        if record:
+            from tick_store import TickRecorder
+            self.recorders = {s: TickRecorder(s) for s in self.symbols}
+        self.streams: Dict[str, PriceStream] = {}
+
+        self.workers: List[Worker] = []
+        slots: Dict[str, int] = {}
+        for config in configs:
+            slot = slots.get(config.symbol, 0)
+            if slot >= self.rings[config.symbol].readers:
+                raise ValueError(f"More than {self.rings[config.symbol].readers} workers on {config.symbol}")
+            slots[config.symbol] = slot + 1
+            self.workers.append(Worker(config, slot))
+        # Wake pipes per symbol, replaced (never mutated) under the ring lock when a worker restarts
+        self._wakes: Dict[str, Tuple[int, ...]] = {s: () for s in self.symbols}
+        self.stopping = False
+        self.logger.log_info(f"Supervisor initialized | {len(self.workers)} workers on {', '.join(self.symbols)}")
+
+    # === Market data ===
+    def publish(self, symbol: str, price: float, timestamp_ms: int):
+        """Write one price to the symbol's ring and wake its workers"""
+        with self._ring_locks[symbol]:
+            self.rings[symbol].publish(price, timestamp_ms)
+            for fd in self._wakes[symbol]:
+                try:
+                    os.write(fd, b"\0")
+                except (BlockingIOError, BrokenPipeError):
+                    # Already has a wake pending, or the worker is gone (its restart replaces the pipe)
+                    pass
+        recorder = self.recorders.get(symbol)
+        if recorder is not None:
+            recorder.append(timestamp_ms, price)
+
+    def fetch_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Latest price for the given symbols in one request"""
+        started = time.perf_counter_ns()
+        param = self._symbols_param if symbols == self.symbols else json.dumps(symbols, separators=(',', ':'))
+        try:
+            tickers = self.scheduler.call(self.client.get_symbol_ticker, weight=TICKER_BATCH_WEIGHT, symbols=param)
+            return {t['symbol']: float(t['price']) for t in tickers if t['symbol'] in self.rings}
+        except Exception as e:
+            self.metrics.inc("price_fetch_errors_total")
+            self.logger.log_error(f"Batched price fetch error: {e}")
+            return {}
+        finally:
+            self.metrics.observe_ns("price_fetch", time.perf_counter_ns() - started)
+
+    def poll(self, symbols: List[str]) -> bool:
+        prices = self.fetch_prices(symbols)
+        now_ms = int(time.time() * 1000)
+        for symbol, price in prices.items():
+            if price > 0:
+                self.publish(symbol, price, now_ms)
+        return bool(prices)
+
+    def start_streams(self, stream_type: str, base_url: str):
+        for symbol in self.symbols:
+            stream = PriceStream(symbol, stream_type=stream_type, base_url=base_url, on_log=self.logger._write,
+                                 on_tick=lambda timestamp_ms, price, symbol=symbol: self.publish(symbol, price, timestamp_ms))
+            stream.start()
+            self.streams[symbol] = stream
+
+    # === Workers ===
+    def start_worker(self, worker: Worker):
+        ring = self.rings[worker.config.symbol]
+        symbol = worker.config.symbol
+        reader, writer = _CONTEXT.Pipe(duplex=False)
+        os.set_blocking(writer.fileno(), False)
+        worker.process = _CONTEXT.Process(target=_run_worker, name=f"agb-{symbol}-{worker.config.instance}",
+                                          args=(worker.config, ring.name, worker.slot, reader, worker.restarts))
+        worker.process.start()
+        reader.close()
+        with self._ring_locks[symbol]:
+            wakes = [fd for fd in self._wakes[symbol] if fd != worker.wake]
+            if worker.wake is not None:
+                os.close(worker.wake)
+            worker.wake = os.dup(writer.fileno())
+            writer.close()
+            self._wakes[symbol] = tuple(wakes + [worker.wake])
+        worker.started = time.monotonic()
+        self.logger.log_info(f"Started {worker.name} (pid {worker.process.pid})")
+
+    def check_workers(self):
+        """Restart workers that exited, with backoff for ones that keep crashing"""
+        now = time.monotonic()
+        for worker in self.workers:
+            process = worker.process
+            if process is None or process.exitcode is None:
+                continue
+            if worker.restart_at == 0.0:
+                process.join()
+                worker.last_exit = process.exitcode
+                worker.failures = 1 if now - worker.started >= STABLE_AFTER else worker.failures + 1
+                delay = backoff_delay(worker.failures, 1.0, MAX_FAILURE_BACKOFF)
+                worker.restart_at = now + delay
+                self.metrics.inc("worker_exits_total", worker=worker.name)
+                self.logger.log_error(f"{worker.name} exited with code {process.exitcode}, restarting in {delay:.1f}s")
+            elif now >= worker.restart_at:
+                worker.restart_at = 0.0
+                worker.restarts += 1
+                self.start_worker(worker)
+
+    def render_status(self):
+        """Worker table: process, restarts, ring progress and heartbeat age"""
+        table = Table(title=f"🧩 {BOT_NAME} v{BOT_VERSION} - Supervisor ({len(self.workers)} workers)",
+                      box=box.ROUNDED, border_style="cyan")
+        for column in ("Worker", "PID", "State", "Restarts", "Last Seq", "Behind", "Heartbeat"):
+            if column == "Worker":
+                table.add_column(column, style="cyan", no_wrap=True)
+            else:
+                table.add_column(column, style="green", justify="right")
+        now_ms = int(time.time() * 1000)
+        for worker in self.workers:
+            ring = self.rings[worker.config.symbol]
+            pid, last, heartbeat, _ = ring.reader_state(worker.slot)
+            process = worker.process
+            if process is not None and process.exitcode is None:
+                age = (now_ms - heartbeat) / 1000 if heartbeat else None
+                state = "[red]hung[/red]" if age is not None and age > HUNG_AFTER else "running"
+            elif self.stopping:
+                age = None
+                state = "stopped"
+            else:
+                age = None
+                state = f"[yellow]restarting (exit {worker.last_exit})[/yellow]"
+            table.add_row(worker.name, str(process.pid if process else ""), state, str(worker.restarts),
+                          f"{last:,}", f"{ring.head() - last:,}" if heartbeat else "",
+                          f"{age:.1f}s ago" if age is not None else "")
+        return table
+
+    # === Main loop ===
+    def run(self, stream_type: str = "trade", stream_url: Optional[str] = None):
+        """Start the feeds and workers, then keep both alive until interrupted"""
+        self.logger.log_info(f"Starting supervisor | feed: {self.feed} | {len(self.workers)} workers")
+        if self.feed == "stream":
+            self.start_streams(stream_type, stream_url or self.workers[0].config.stream_url)
+        for worker in self.workers:
+            self.start_worker(worker)
+        consecutive_failures = 0
+        next_poll = 0.0
+        while True:
+            now = time.monotonic()
+            if now >= next_poll:
+                if self.feed == "stream":
+                    # Stale streams fall back to one batched REST request between them
+                    stale = [s for s, stream in self.streams.items() if stream.is_stale(STREAM_STALE_AFTER)]
+                    ok = self.poll(stale) if stale else True
+                    delay = self.interval
+                else:
+                    ok = self.poll(self.symbols)
+                    delay = self.interval
+                if ok:
+                    consecutive_failures = 0
+                else:
+                    consecutive_failures += 1
+                    delay = backoff_delay(consecutive_failures, self.interval, MAX_FAILURE_BACKOFF)
+                    self.logger.log_warning(f"Price fetch failed ({consecutive_failures} in a row), retrying in {delay:.1f}s")
+                next_poll = now + delay
+            self.check_workers()
+            time.sleep(max(0.0, min(SUPERVISE_INTERVAL, next_poll - time.monotonic())))
+
+    def stop_workers(self):
+        """Close the rings so workers journal their state and exit"""
+        self.stopping = True
+        for symbol, ring in self.rings.items():
+            with self._ring_locks[symbol]:
+                ring.close_ring()
+            for fd in self._wakes[symbol]:
+                try:
+                    os.write(fd, b"\0")
+                except OSError:
+                    pass
+        deadline = time.monotonic() + STOP_TIMEOUT
+        for worker in self.workers:
+            if worker.process is not None:
+                worker.process.join(max(0.0, deadline - time.monotonic()))
+                if worker.process.exitcode is None:
+                    self.logger.log_warning(f"{worker.name} did not stop in time, terminating")
+                    worker.process.terminate()
+                    worker.process.join()
+
+    def release(self):
+        """Stop the feeds and free the rings (after stop_workers)"""
+        for stream in self.streams.values():
+            stream.stop()
+        for recorder in self.recorders.values():
+            recorder.close()
+        for fds in self._wakes.values():
+            for fd in fds:
+                os.close(fd)
+        for ring in self.rings.values():
+            ring.release()
+        self.logger.log_info("Supervisor stopped")
+        self.logger.close()
+
+
+# === Configuration ===
+def load_workers(path: Optional[str], specs: List[str], paper_trading: bool) -> List[BotConfig]:
+    """
+    One BotConfig per worker from a JSON file and/or --worker SYMBOL:USDT[:NAME] arguments.
+    JSON format: {"workers": [{"symbol": "SOLUSDT", "initial_investment": 500, "instance": "tight",
+    "buy_offset": 0.005, ...}]}; any BotConfig field may be given, AGB_<FIELD> variables apply to all.
+    """
+    entries = []
+    if path:
+        with open(path) as f:
+            entries.extend(json.load(f).get("workers", []))
+    for spec in specs:
+        parts = spec.split(':')
+        if len(parts) not in (2, 3):
+            raise ValueError(f"Bad --worker '{spec}' (expected SYMBOL:USDT or SYMBOL:USDT:NAME)")
+        entry = {"symbol": parts[0], "initial_investment": float(parts[1])}
+        if len(parts) == 3:
+            entry["instance"] = parts[2]
+        entries.append(entry)
+    if not entries:
+        raise ValueError("No workers configured (use --config or --worker)")
+
+    configs = []
+    seen = set()
+    for index, entry in enumerate(entries):
+        entry = dict(entry, paper_trading=paper_trading, headless=True, metrics_port=0)
+        entry.setdefault("instance", f"w{index}")
+        config = load_config(overrides=entry)
+        if config.order_mode != "market":
+            raise ValueError(f"{config.symbol}/{config.instance}: supervised workers use market orders")
+        key = (config.symbol, config.instance)
+        if key in seen:
+            raise ValueError(f"Duplicate worker {config.symbol}/{config.instance} (instances need unique names)")
+        seen.add(key)
+        configs.append(config)
+
+    # Workers trading one account can't tell each other's fills from outside funds
+    accounts: Dict[str, int] = {}
+    for config in configs:
+        if not config.paper_trading:
+            accounts[config.api_key] = accounts.get(config.api_key, 0) + 1
+    for config in configs:
+        if not config.paper_trading and accounts[config.api_key] > 1:
+            config.reconcile_interval = 0.0
+    return configs
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run several grid strategies as worker processes sharing one price feed per symbol")
+    parser.add_argument("--config", help="JSON workers file")
+    parser.add_argument("--worker", action="append", default=[], metavar="SYMBOL:USDT[:NAME]",
+                        help="One strategy process, e.g. SOLUSDT:500:tight (repeatable)")
+    parser.add_argument("--live", action="store_true", help="Live trading (keys per worker, or BINANCE_API_KEY / BINANCE_API_SECRET)")
+    parser.add_argument("--feed", choices=["rest", "stream"], default="rest", help="Market data source")
+    parser.add_argument("--stream-type", choices=["trade", "bookTicker"], default="trade", help="WebSocket stream (--feed stream)")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="Seconds between batched price fetches")
+    parser.add_argument("--headless", action="store_true", help="Run without the live worker table")
+    parser.add_argument("--fresh", action="store_true", help="Discard every worker's saved state and re-split")
+    parser.add_argument("--metrics-port", type=int, default=0, help="Serve the supervisor's metrics on this local port")
+    parser.add_argument("--record", action="store_true", help="Record every published price to ticks/<SYMBOL>/")
+    args = parser.parse_args()
+
+    try:
+        configs = load_workers(args.config, args.worker, paper_trading=not args.live)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    for config in configs:
+        config.resume = not args.fresh
+
+    supervisor = Supervisor(configs, feed=args.feed, interval=args.interval, record=args.record)
+    # systemd/docker stop sends SIGTERM: shut down like Ctrl+C
+    signal.signal(signal.SIGTERM, _interrupt)
+    metrics_server = None
+    if args.metrics_port:
+        metrics_server = MetricsServer(supervisor.metrics, args.metrics_port)
+        metrics_server.start()
+    dashboard = None
+    if not args.headless:
+        dashboard = Dashboard(supervisor.render_status, console=console.rich, refresh_per_second=DASHBOARD_REFRESH_PER_SECOND)
+        dashboard.start()
+    try:
+        supervisor.run(stream_type=args.stream_type)
+    except KeyboardInterrupt:
+        if dashboard:
+            dashboard.stop()
+            dashboard = None
+        console.print("\n[yellow]Supervisor stopped, waiting for workers...[/yellow]")
+    finally:
+        if dashboard:
+            dashboard.stop()
+        if metrics_server:
+            metrics_server.stop()
+        supervisor.stop_workers()
+        console.print(supervisor.render_status())
+        supervisor.release()
+        if supervisor.metrics.has_data():
+            console.print(supervisor.metrics.summary_table())
+
+
+if __name__ == "__main__":
+    main()
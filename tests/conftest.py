@@ -0,0 +1,18 @@
+"""
+Shared fixtures for the test suite
+Tests run from a temporary directory so logs/, state/ and cache/ never land in the repo.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from asymmetric_grid_bot_v211 import BotConfig, DualTriggerBot
+from backtest import run_backtest
+from indicators import VolatilityEngine
+from mock_exchange import MockExchange
+from monte_carlo import simulate
+
+SYMBOL = "ETHUSDT"
+BAR_MS = 5_000
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def seeded_path(seed: int, n: int, sigma: float = 0.004) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 300 * np.exp(np.cumsum(rng.normal(0, sigma, n)))
+
+
+def paper_bot(clock=None, **fields) -> DualTriggerBot:
+    exchange = MockExchange(SYMBOL, "ETH", price=300.0, step_size=0.01, min_notional=5)
+    config = BotConfig("", "", SYMBOL, "ETH", "USDT", 1000.0, 50.0, True, headless=True, state_journal=False,
+                       **fields)
+    return DualTriggerBot(config, client=exchange, clock=clock)
+
+
+def replay(bot: DualTriggerBot, prices: np.ndarray, timestamps=None, clock=None):
+    if clock is not None:
+        clock.now = timestamps[0] / 1000
+    bot.execute_initial_buy(float(prices[0]))
+    for i in range(1, len(prices)):
+        if clock is not None:
+            clock.now = timestamps[i] / 1000
+        bot.check_triggers(float(prices[i]))
+
+
+def assert_same(bot: DualTriggerBot, result):
+    assert bot.trade_count == result.trade_count
+    assert bot.crypto_balance == result.crypto_balance
+    assert bot.usdt_balance == result.usdt_balance
+    assert bot.cumulative_profit == result.realized_pnl
+    assert bot.reference_price == result.reference_price
+
+
+@pytest.mark.parametrize("ladder_levels", [1, 3])
+def test_backtest_matches_paper_trading(ladder_levels):
+    prices = seeded_path(1, 20_000)
+    bot = paper_bot(ladder_levels=ladder_levels)
+    replay(bot, prices)
+    result = run_backtest(prices, initial_investment=1000.0, filters=bot.filters, ladder_levels=ladder_levels)
+    assert result.trade_count > 50
+    assert_same(bot, result)
+
+
+def test_backtest_matches_paper_trading_with_adaptive_offsets():
+    n = 20_000
+    rng = np.random.default_rng(2)
+    sigma = np.where((np.arange(n) // 4_000) % 2, 0.004, 0.0015)     # Calm and volatile regimes
+    prices = 300 * np.exp(np.cumsum(rng.normal(0, 1, n) * sigma))
+    timestamps = 1_700_000_000_000 + np.arange(n, dtype=np.int64) * BAR_MS
+    clock = FakeClock()
+    bot = paper_bot(clock=clock, adaptive_offsets=True, volatility_measure="ewma")
+    replay(bot, prices, timestamps, clock)
+    result = run_backtest(prices, timestamps, initial_investment=1000.0, filters=bot.filters,
+                          volatility=VolatilityEngine("ewma"))
+    assert result.trade_count > 50
+    assert_same(bot, result)
+
+
+def test_one_monte_carlo_lane_is_the_backtest():
+    s0 = 300.0
+    path = seeded_path(3, 20_000)
+    result = simulate([path.reshape(-1, 1)], s0, lanes=1, step_size=0.01, min_qty=0.01, min_notional=5.0)
+    backtest = run_backtest(np.r_[s0, path], step_size=0.01, min_qty=0.01, min_notional=5.0)
+    assert backtest.trade_count > 50
+    assert result.trades[0] == backtest.trade_count
+    assert result.final_equity[0] == pytest.approx(backtest.final_equity, rel=1e-12)
+    assert result.realized_pnl[0] == pytest.approx(backtest.realized_pnl, rel=1e-12)
+    # Block boundaries carry the lane state over unchanged
+    chunked = simulate([b.reshape(-1, 1) for b in np.array_split(path, 7)], s0, lanes=1,
+                       step_size=0.01, min_qty=0.01, min_notional=5.0)
+    assert chunked.trades[0] == result.trades[0]
+    assert chunked.final_equity[0] == result.final_equity[0]
@@ -0,0 +1,106 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from asymmetric_grid_bot_v211 import DEFAULT_TRADE_FRACTION, _parse_field, load_config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "bot.json"
+    path.write_text(json.dumps({"symbol": "solusdt", "initial_investment": 500, "poll_interval": 2.0,
+                                "ladder_levels": 2, "headless": False}))
+    return str(path)
+
+
+def test_later_sources_win(config_file):
+    env = {"AGB_POLL_INTERVAL": "3.5", "AGB_LADDER_LEVELS": "4", "AGB_HEADLESS": "yes"}
+    config = load_config(config_file, {"ladder_levels": 5, "poll_interval": None}, env=env)
+    assert config.ladder_levels == 5                 # CLI over environment over file
+    assert config.poll_interval == 3.5               # A None override (flag not given) is ignored
+    assert config.headless is True
+    assert config.initial_investment == 500.0        # File only
+
+
+def test_derived_and_default_values(config_file):
+    config = load_config(config_file, env={"BINANCE_API_KEY": "k"})
+    assert (config.symbol, config.base_asset, config.quote_asset) == ("SOLUSDT", "SOL", "USDT")
+    assert config.paper_trading is True
+    assert config.usdt_per_trade == 500.0 * DEFAULT_TRADE_FRACTION
+    assert config.api_key == "k" and config.api_secret == ""
+
+
+def test_environment_alone_is_enough():
+    env = {"AGB_SYMBOL": "BTCUSDT", "AGB_INITIAL_INVESTMENT": "1000", "AGB_PAPER_TRADING": "0"}
+    with pytest.raises(ValueError, match="api_key and api_secret"):
+        load_config(env=env)
+    config = load_config(env=dict(env, BINANCE_API_KEY="k", BINANCE_API_SECRET="s"))
+    assert config.paper_trading is False and config.initial_investment == 1000.0
+
+
+@pytest.mark.parametrize("raw, expected", [("true", True), (" On ", True), ("1", True), ("no", False),
+                                           ("OFF", False), ("0", False), (True, True), (0, False)])
+def test_bool_coercion(raw, expected):
+    assert _parse_field("headless", bool, raw) is expected
+
+
+def test_number_coercion():
+    assert _parse_field("poll_interval", float, "2.5") == 2.5
+    assert _parse_field("poll_interval", float, 3) == 3.0
+    assert _parse_field("ladder_levels", int, "3") == 3
+    assert isinstance(_parse_field("initial_investment", float, 500), float)
+
+
+@pytest.mark.parametrize("name, kind, raw, message", [
+    ("poll_interval", float, "abc", "poll_interval: expected float, got 'abc'"),
+    ("ladder_levels", int, "2.5", "ladder_levels: expected int, got '2.5'"),
+    ("headless", bool, "maybe", "headless: expected true/false, got 'maybe'"),
+    ("poll_interval", float, None, "poll_interval: expected float, got 'None'"),
+])
+def test_bad_values_name_the_field(name, kind, raw, message):
+    with pytest.raises(ValueError) as error:
+        _parse_field(name, kind, raw)
+    assert str(error.value) == message
+
+
+def test_bad_environment_value_is_reported(config_file):
+    with pytest.raises(ValueError, match="buy_offset: expected float, got 'abc'"):
+        load_config(config_file, env={"AGB_BUY_OFFSET": "abc"})
+
+
+@pytest.mark.parametrize("values, message", [
+    ({"initial_investment": 100}, "Missing symbol"),
+    ({"symbol": "SOLUSDT"}, "Missing initial_investment"),
+    ({"symbol": "SOLUSDT", "initial_investment": 100, "max_loss": 5}, "Unknown config keys: max_loss"),
+    ({"symbol": "SOLBTC", "initial_investment": 100}, "Can't derive base_asset"),
+    ({"symbol": "SOLUSDT", "initial_investment": 0}, "initial_investment must be positive"),
+])
+def test_missing_or_inconsistent_config(values, message):
+    with pytest.raises(ValueError, match=message):
+        load_config(overrides=values, env={})
+
+
+HEADLESS_START = """
+import sys
+import asymmetric_grid_bot_v211 as bot
+from mock_exchange import MockExchange
+config = bot.load_config(env={"AGB_SYMBOL": "SOLUSDT", "AGB_INITIAL_INVESTMENT": "1000", "AGB_STATE_JOURNAL": "0"})
+bot.console.plain = True
+trader = bot.DualTriggerBot(config, client=MockExchange("SOLUSDT", "SOL"))
+trader.execute_initial_buy(100.0)
+trader.check_triggers(98.0)
+print(sorted(name for name in sys.modules if name.split(".")[0] == "rich"))
+"""
+
+
+def test_headless_start_prints_plain_lines_without_rich():
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run([sys.executable, "-c", HEADLESS_START], env=env, capture_output=True, text=True, check=True)
+    lines = result.stdout.strip().splitlines()
+    assert lines[-1] == "[]"
+    assert "✓ BUY 0.505000 SOL @ $98.00 | Size: $49.50" in lines        # Markup stripped
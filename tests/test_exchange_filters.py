@@ -0,0 +1,54 @@
+import json
+import os
+import threading
+
+from exchange_filters import FilterCache, SymbolFilters, parse_symbol_filters
+
+
+def test_round_quantity_rounds_down_to_whole_steps():
+    filters = SymbolFilters("SOLUSDT", step_size=0.01)
+    assert filters.round_quantity(0.4999) == 0.49
+    assert filters.round_quantity(0.3) == 0.3       # 0.3 / 0.01 is not exactly 30 in floats
+    assert filters.round_quantity(5.0) == 5.0
+
+
+def test_sell_never_rounds_above_the_balance():
+    filters = SymbolFilters("SOLUSDT", step_size=0.001)
+    balance = 1.2345
+    assert filters.round_quantity(balance) <= balance
+
+
+def test_market_orders_use_the_market_lot_size_step():
+    filters = parse_symbol_filters({"symbol": "SOLUSDT", "filters": [
+        {"filterType": "LOT_SIZE", "stepSize": "0.01", "minQty": "0.01", "maxQty": "9000"},
+        {"filterType": "MARKET_LOT_SIZE", "stepSize": "0.1", "minQty": "0.1", "maxQty": "1000"},
+    ]})
+    assert filters.round_quantity(1.27) == 1.27
+    assert filters.round_quantity(1.27, market=True) == 1.2
+    assert filters.format_quantity(1.2, market=True) == "1.2"
+    assert filters.format_quantity(1.27) == "1.27"
+
+
+def test_concurrent_cache_saves_never_leave_a_torn_file(tmp_path):
+    path = tmp_path / "cache" / "exchange_filters.json"
+    errors = []
+
+    def save(worker):
+        cache = FilterCache(path=str(path))
+        try:
+            for n in range(30):
+                cache.update({"symbols": [{"symbol": f"W{worker}X{n}USDT", "filters": []}]})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with open(path) as f:
+        entries = json.load(f)
+    assert entries and all(symbol.endswith("USDT") for symbol in entries)
+    assert os.listdir(path.parent) == ["exchange_filters.json"]
@@ -0,0 +1,54 @@
+import pytest
+
+from grid_ladder import GridLadder
+
+
+@pytest.fixture
+def ladder():
+    ladder = GridLadder(3, 0.01, 0.015)
+    ladder.recenter(100.0)
+    return ladder
+
+
+def test_levels_are_geometric_and_sorted(ladder):
+    assert ladder.buy_levels == pytest.approx([100 * 0.99 ** 3, 100 * 0.99 ** 2, 99.0])
+    assert ladder.sell_levels == pytest.approx([101.5, 100 * 1.015 ** 2, 100 * 1.015 ** 3])
+
+
+def test_price_exactly_on_a_level_counts_it(ladder):
+    nearest, middle, deepest = ladder.buy_levels[2], ladder.buy_levels[1], ladder.buy_levels[0]
+    assert ladder.buys_crossed(nearest) == 1
+    assert ladder.buys_crossed(middle) == 2
+    assert ladder.buys_crossed(deepest) == 3
+    assert [ladder.sells_crossed(level) for level in ladder.sell_levels] == [1, 2, 3]
+
+
+def test_price_between_levels_counts_only_those_passed(ladder):
+    assert ladder.buys_crossed(99.5) == 0             # Inside the band
+    assert ladder.sells_crossed(100.5) == 0
+    assert ladder.buys_crossed((ladder.buy_levels[1] + ladder.buy_levels[2]) / 2) == 1
+    assert ladder.buys_crossed((ladder.buy_levels[0] + ladder.buy_levels[1]) / 2) == 2
+    assert ladder.sells_crossed((ladder.sell_levels[0] + ladder.sell_levels[1]) / 2) == 1
+    assert ladder.sells_crossed((ladder.sell_levels[1] + ladder.sell_levels[2]) / 2) == 2
+    # One ulp short of a level is not a crossing
+    assert ladder.buys_crossed(ladder.buy_levels[2] * (1 + 1e-15)) == 0
+    assert ladder.sells_crossed(ladder.sell_levels[0] * (1 - 1e-15)) == 0
+
+
+def test_price_beyond_the_last_level_counts_every_level(ladder):
+    assert ladder.buys_crossed(50.0) == 3
+    assert ladder.buys_crossed(0.0) == 3
+    assert ladder.sells_crossed(200.0) == 3
+
+
+def test_new_offsets_apply_at_the_next_recenter(ladder):
+    ladder.set_offsets(0.02, 0.02)
+    assert ladder.buys_crossed(98.5) == 1            # Old spacing until recentered
+    ladder.recenter(100.0)
+    assert ladder.buys_crossed(98.5) == 0
+    assert ladder.buys_crossed(98.0) == 1
+
+
+def test_a_ladder_needs_a_level():
+    with pytest.raises(ValueError):
+        GridLadder(0, 0.01, 0.015)
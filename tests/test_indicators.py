@@ -0,0 +1,69 @@
+import math
+
+import numpy as np
+import pytest
+
+from indicators import REALIZED_WINDOWS, VolatilityEngine, needs_rescale, scale_path
+
+
+def tape(seed: int, n: int):
+    """Irregular ticks (1-15 s apart, some minutes empty) with calm and volatile stretches"""
+    rng = np.random.default_rng(seed)
+    timestamps = 1_700_000_000_000 + np.cumsum(rng.integers(1_000, 15_000, n))
+    timestamps[n // 2:] += 5 * 60_000                                        # A gap of whole bars
+    sigma = np.where((np.arange(n) // 5_000) % 2, 0.003, 0.001)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 1, n) * sigma))
+    return timestamps, prices
+
+
+def rescales(closed, scales) -> list:
+    """Ticks where check_triggers() would re-place the triggers"""
+    events, in_use = [], 1.0
+    for i in np.flatnonzero(closed):
+        if needs_rescale(in_use, scales[i]):
+            in_use = scales[i]
+            events.append(int(i))
+    return events
+
+
+def test_realized_vol_matches_a_naive_window():
+    rng = np.random.default_rng(1)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0.0002, 0.002, 1_000)))
+    engine = VolatilityEngine("realized")
+    returns = []
+    for i, close in enumerate(closes):
+        engine.add_bar(close, close, close)
+        if i:
+            returns.append(math.log(close / closes[i - 1]))
+        # Before a window has filled, after it wraps, and across the buffer resum
+        if i in (5, 14, 15, 59, 200, 239, 240, 241, 480, 999):
+            for window in REALIZED_WINDOWS:
+                recent = np.asarray(returns[-window:])
+                # Root mean square of the returns: np.std plus the mean it takes out
+                expected = math.hypot(np.std(recent), np.mean(recent))
+                assert engine.realized_vol(window) == pytest.approx(expected, rel=1e-9)
+
+
+@pytest.mark.parametrize("measure", ["ewma", "atr", "realized"])
+def test_scale_path_matches_tick_by_tick_updates(measure):
+    timestamps, prices = tape(2, 30_000)
+    by_tick = VolatilityEngine(measure)
+    closed = np.zeros(len(prices), dtype=bool)
+    scales = np.ones(len(prices))
+    for i in range(1, len(prices)):
+        closed[i] = by_tick.update(int(timestamps[i]), float(prices[i]))
+        scales[i] = by_tick.scale()
+
+    batch = VolatilityEngine(measure)
+    batch_closed, batch_scales = scale_path(batch, timestamps, prices)
+    assert np.array_equal(batch_closed, closed)
+    assert np.array_equal(batch_scales, scales)
+    assert len(rescales(closed, scales)) > 5
+    assert rescales(batch_closed, batch_scales) == rescales(closed, scales)
+
+    # Left mid-bar exactly where update() would be: the next tick closes the same bar the same way
+    for slot in ("bars", "atr", "ewma_var", "baseline", "_bar_end", "_high", "_low", "_close", "_prev_close"):
+        assert getattr(batch, slot) == getattr(by_tick, slot)
+    after = int(timestamps[-1]) + 60_000
+    assert batch.update(after, 101.0) and by_tick.update(after, 101.0)
+    assert batch.scale() == by_tick.scale()
@@ -0,0 +1,109 @@
+import pytest
+
+from asymmetric_grid_bot_v211 import BotConfig, DualTriggerBot
+from limit_grid import LimitGridTrader
+from mock_exchange import MockExchange
+
+SYMBOL = "SOLUSDT"
+
+
+class IdleStream:
+    """Stands in for the user-data stream; events are fed to handle_event directly"""
+
+
+@pytest.fixture
+def grid(monkeypatch):
+    exchange = MockExchange(SYMBOL, "SOL", price=100.0, quote_balance=1000.0, min_notional=5)
+    events = []
+    monkeypatch.setattr(exchange, "_broadcast", lambda event, stream=None: events.append(event))
+    config = BotConfig("key", "secret", SYMBOL, "SOL", "USDT", 1000.0, 50.0, False, order_mode="limit",
+                       headless=True, state_journal=False, reconcile_interval=0)
+    bot = DualTriggerBot(config, client=exchange)
+    bot.execute_initial_buy(100.0)
+    trader = LimitGridTrader(bot, stream=IdleStream())
+
+    def pump():
+        # Events raised while handling one (cancel, re-place) are handled in order after it
+        while events:
+            trader.handle_event(events.pop(0))
+
+    trader.place_orders()
+    pump()
+    return exchange, bot, trader, pump
+
+
+def resting(exchange):
+    return sorted((o['side'], float(o['price'])) for o in exchange.get_open_orders(symbol=SYMBOL))
+
+
+def assert_books_balance(bot):
+    assert bot.ledger.position == pytest.approx(bot.crypto_balance, abs=1e-9)
+
+
+def test_full_fill_recenters_the_grid(grid):
+    exchange, bot, trader, pump = grid
+    assert resting(exchange) == [("BUY", 99.0), ("SELL", 101.5)]
+
+    exchange.set_price(98.9)
+    pump()
+
+    assert bot.trade_count == 1
+    assert bot.reference_price == 99.0
+    assert resting(exchange) == [("BUY", bot.filters.round_price(bot.buy_trigger)),
+                                 ("SELL", bot.filters.round_price(bot.sell_trigger))]
+    assert bot.buy_trigger < 99.0 < bot.sell_trigger
+    assert len(bot.ledger.entries) == 2
+    assert_books_balance(bot)
+
+
+def test_partial_fill_then_fill_is_one_trade(grid):
+    exchange, bot, trader, pump = grid
+    crypto = bot.crypto_balance
+    buy = trader.orders[trader.active["BUY"]]
+
+    exchange.set_price(98.9, liquidity=buy.quantity / 4)
+    pump()
+    assert bot.trade_count == 0
+    assert bot.crypto_balance > crypto
+    assert bot.reference_price == 100.0         # Not re-centred on a partial
+    assert trader.active["BUY"] == buy.client_order_id
+
+    exchange.set_price(98.9)
+    pump()
+    assert bot.trade_count == 1
+    assert bot.reference_price == 99.0
+    assert bot.ledger.entries[-1].quantity == pytest.approx(buy.filled_qty - buy.base_fee)
+    assert_books_balance(bot)
+
+
+def test_partial_fill_then_cancel_books_the_partial(grid):
+    exchange, bot, trader, pump = grid
+    sell = trader.orders[trader.active["SELL"]]
+
+    exchange.set_price(101.6, liquidity=sell.quantity / 4)
+    pump()
+    assert bot.trade_count == 0
+
+    # The buy fills; re-centring cancels the partly filled sell
+    exchange.set_price(98.9)
+    pump()
+
+    assert bot.trade_count == 2
+    sides = [entry.side for entry in bot.ledger.entries]
+    assert sides.count("SELL") == 1 and sides.count("BUY") == 2
+    assert sell.client_order_id not in trader.orders
+    assert bot.reference_price == 99.0          # Re-centred on the buy, not the cancelled sell
+    assert_books_balance(bot)
+
+
+def test_cancel_stale_cancels_only_foreign_grid_orders(grid):
+    exchange, bot, trader, pump = grid
+    exchange.order_limit_buy(symbol=SYMBOL, quantity="0.1", price="90.00", newClientOrderId="agbB1x1")
+    exchange.order_limit_buy(symbol=SYMBOL, quantity="0.1", price="90.00", newClientOrderId="manual1")
+
+    trader.cancel_stale()
+    pump()
+
+    ids = sorted(o['clientOrderId'] for o in exchange.get_open_orders(symbol=SYMBOL))
+    assert ids == sorted([trader.active["BUY"], trader.active["SELL"], "manual1"])
+    assert bot.trade_count == 0
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+import log_analytics
+from log_analytics import LogIndex
+
+NAME = "SOLUSDT_paper_dual_20260101_000000.log"
+
+
+def trade_line(minute: int, side: str, price: float, amount: float) -> str:
+    return (f"[2026-01-01 00:{minute:02d}:00] TRADE: {side} | Price: ${price:,.2f} | "
+            f"Amount: {amount:.6f} | Total: ${price * amount:,.2f}\n")
+
+
+@pytest.fixture
+def log():
+    os.makedirs("logs")
+    path = os.path.join("logs", NAME)
+    with open(path, "w") as f:
+        f.write("[2026-01-01 00:00:00] INFO: === Asymmetric Grid Bot ===\n")
+        f.write(trade_line(0, "INITIAL_BUY", 100.0, 1.0))
+        f.write(trade_line(1, "BUY", 90.0, 1.0))                # Average cost 95
+        f.write(trade_line(2, "SELL", 110.0, 1.0))              # +15
+    return path
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Every line handed to the parser"""
+    lines = []
+    parse_line = log_analytics.parse_line
+
+    def counting(line, json_lines):
+        lines.append(line)
+        return parse_line(line, json_lines)
+
+    monkeypatch.setattr(log_analytics, "parse_line", counting)
+    return lines
+
+
+def test_rerun_parses_only_appended_bytes(log, parsed):
+    index = LogIndex()
+    assert index.update() == (1, os.path.getsize(log))
+    assert len(parsed) == 4
+    assert index.runs()[0]["realized_pnl"] == pytest.approx(15.0)
+
+    parsed.clear()
+    assert LogIndex().update() == (0, 0)                          # Nothing new: nothing read
+    assert parsed == []
+
+    size = os.path.getsize(log)
+    appended = trade_line(3, "SELL", 120.0, 0.5)                  # +60 - 0.5 * 95 = +12.5
+    partial = trade_line(4, "BUY", 100.0, 1.0)
+    with open(log, "a") as f:
+        f.write(appended + partial[:20])                          # Writer caught mid-line
+    index = LogIndex()
+    assert index.update() == (1, len(appended))
+    assert parsed == [appended.rstrip("\n").encode()]
+    assert index.files[NAME]["offset"] == size + len(appended)
+
+    parsed.clear()
+    with open(log, "a") as f:
+        f.write(partial[20:])
+    index = LogIndex()
+    assert index.update() == (1, len(partial))
+    assert parsed == [partial.rstrip("\n").encode()]
+
+    stats = index.runs()[0]
+    assert stats["realized_pnl"] == pytest.approx(27.5)
+    assert (stats["buys"], stats["sells"], stats["initial_buys"]) == (2, 2, 1)
+    assert [t[4] for t in index.trades()] == ["INITIAL_BUY", "BUY", "SELL", "SELL", "BUY"]
+
+
+def test_incremental_index_matches_a_full_read(log):
+    LogIndex().update()
+    with open(log, "a") as f:
+        f.write(trade_line(3, "SELL", 120.0, 0.5))
+        f.write(trade_line(4, "BUY", 80.0, 2.0))
+        f.write(trade_line(5, "SELL", 105.0, 1.0))
+    incremental = LogIndex()
+    incremental.update()
+
+    fresh = LogIndex(index_dir=os.path.join("cache", "fresh_index"))
+    fresh.update()
+    assert incremental.runs() == fresh.runs()
+    assert list(incremental.trades()) == list(fresh.trades())
+
+
+def test_replaced_file_is_read_again(log, parsed):
+    LogIndex().update()
+    with open(log, "w") as f:                                     # Same name, new contents
+        f.write(trade_line(0, "INITIAL_BUY", 200.0, 1.0))
+        f.write(trade_line(1, "SELL", 210.0, 0.5))
+        f.write(trade_line(2, "SELL", 220.0, 0.25))
+        f.write(trade_line(3, "SELL", 230.0, 0.125))
+    parsed.clear()
+    index = LogIndex()
+    index.update()
+    assert len(parsed) == 4
+    assert index.runs()[0]["realized_pnl"] == pytest.approx(5.0 + 5.0 + 3.75)
@@ -0,0 +1,113 @@
+import pytest
+
+import order_pipeline
+from asymmetric_grid_bot_v211 import BotConfig, DualTriggerBot
+from mock_exchange import MockAPIError, MockExchange
+
+SYMBOL = "SOLUSDT"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+class FlakyExchange(MockExchange):
+    """Loses the answer to the next market order; lookups fail while `outage` is set"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.drop_next = None         # "after": the order executes, "before": it never arrives
+        self.outage = False
+
+    def create_order(self, **params):
+        drop, self.drop_next = self.drop_next, None
+        if drop == "before":
+            raise TimeoutError("read timed out")
+        response = super().create_order(**params)
+        if drop == "after":
+            raise TimeoutError("read timed out")
+        return response
+
+    def get_order(self, **params):
+        if self.outage:
+            raise MockAPIError(-1001, "Internal error; unable to process your request.")
+        return super().get_order(**params)
+
+    def market_orders(self) -> int:
+        return sum(o.order_type == "MARKET" for o in self.orders.values())
+
+
+@pytest.fixture
+def live():
+    clock = FakeClock()
+    exchange = FlakyExchange(SYMBOL, "SOL", price=100.0, quote_balance=1000.0)
+    config = BotConfig("key", "secret", SYMBOL, "SOL", "USDT", 1000.0, 50.0, False,
+                       headless=True, state_journal=False, reconcile_interval=0, async_orders=False)
+    bot = DualTriggerBot(config, client=exchange, clock=clock)
+    bot.execute_initial_buy(100.0)
+    return exchange, bot, clock
+
+
+def account_matches(exchange, bot) -> bool:
+    return (bot.crypto_balance == pytest.approx(exchange.free["SOL"] + exchange.locked["SOL"])
+            and bot.usdt_balance == pytest.approx(exchange.free["USDT"] + exchange.locked["USDT"]))
+
+
+def test_unknown_outcome_stays_disarmed_until_the_exchange_reports_the_fill(live):
+    exchange, bot, clock = live
+    exchange.drop_next = "after"
+    exchange.outage = True
+    exchange.set_price(98.0)
+    bot.check_triggers(98.0)
+
+    order = bot.orders.in_flight
+    assert order is not None and order.check_at > clock.now
+    assert bot.trade_count == 0
+    # Further crossings fire nothing while the first order may have traded
+    for price in (97.5, 97.0, 96.5):
+        exchange.set_price(price)
+        bot.check_triggers(price)
+    assert exchange.market_orders() == 2            # Initial split + the unresolved buy
+
+    exchange.outage = False
+    clock.sleep(order_pipeline.UNRESOLVED_RECHECK)
+    exchange.set_price(97.5)
+    bot.check_triggers(97.5)                       # Inside the band re-centred on 98.0
+
+    assert bot.orders.in_flight is None
+    assert bot.trade_count == 1
+    assert exchange.market_orders() == 2
+    # A looked-up order has no fills detail, so its base-asset commission is left to the reconciler
+    assert bot.usdt_balance == pytest.approx(exchange.free["USDT"] + exchange.locked["USDT"])
+    assert bot.crypto_balance - exchange.free["SOL"] == pytest.approx(0.0, abs=0.001)
+    assert "BUY" in bot.orders.templates            # Re-armed around the booked fill
+
+
+def test_order_confirmed_missing_rearms_the_trigger(live):
+    exchange, bot, clock = live
+    exchange.drop_next = "before"
+    exchange.outage = True
+    exchange.set_price(98.0)
+    bot.check_triggers(98.0)
+    assert bot.orders.in_flight is not None
+
+    exchange.outage = False
+    clock.sleep(order_pipeline.UNRESOLVED_RECHECK)
+    bot.check_triggers(98.0)                       # Lookup: -2013, never placed
+    assert bot.orders.in_flight is None
+    assert bot.trade_count == 0 and exchange.market_orders() == 1
+
+    clock.sleep(order_pipeline.FAILED_COOLDOWN)
+    bot.check_triggers(98.0)
+    assert bot.trade_count == 1 and exchange.market_orders() == 2
+    assert account_matches(exchange, bot)
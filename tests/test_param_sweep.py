@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from backtest import run_backtest
+from param_sweep import grid_samples, run_sweep
+
+
+def test_shared_memory_sweep_equals_serial_backtests():
+    rng = np.random.default_rng(1)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.003, 5_000)))
+    samples = grid_samples([0.005, 0.01], [0.01, 0.015], [0.05, 0.1])
+    results = run_sweep(prices, samples, step_size=0.001, min_qty=0.001, workers=2)
+
+    assert len(results) == len(samples)
+    assert [r.total_return for r in results] == sorted((r.total_return for r in results), reverse=True)
+    by_params = {(r.buy_offset, r.sell_offset, r.trade_fraction): r for r in results}
+    for buy, sell, fraction in samples:
+        serial = run_backtest(prices, initial_investment=1000.0, step_size=0.001, min_qty=0.001, fee_rate=0.001,
+                              buy_offset=buy, sell_offset=sell, trade_fraction=fraction)
+        swept = by_params[(buy, sell, fraction)]
+        assert swept.trade_count == serial.trade_count
+        assert swept.final_equity == serial.final_equity
+        assert swept.total_return == serial.total_return
+        assert swept.max_drawdown == serial.max_drawdown
+        assert swept.fees == serial.fees
+    assert any(r.trade_count for r in results)
+
+
+def test_unknown_sort_key_is_rejected():
+    with pytest.raises(ValueError, match="Unknown sort key"):
+        run_sweep(np.ones(10), grid_samples([0.01], [0.01], [0.05]), sort_by="sharpe")
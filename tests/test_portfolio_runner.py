@@ -0,0 +1,50 @@
+import asyncio
+
+import portfolio_runner
+from asymmetric_grid_bot_v211 import BotConfig
+from mock_exchange import MockExchange
+
+SYMBOL = "SOLUSDT"
+
+
+def make_runner(monkeypatch, exchange):
+    monkeypatch.setattr(portfolio_runner, "binance_client", lambda *args, **kwargs: exchange)
+    config = BotConfig("key", "secret", SYMBOL, "SOL", "USDT", 1000.0, 50.0, False,
+                       headless=True, state_journal=False, reconcile_interval=0)
+    return portfolio_runner.PortfolioRunner([config], paper_trading=False, api_key="key", api_secret="secret")
+
+
+async def settle(runner):
+    while runner._tasks:
+        await asyncio.gather(*list(runner._tasks))
+
+
+def test_fill_is_booked_after_price_returns_inside_the_band(monkeypatch):
+    exchange = MockExchange(SYMBOL, "SOL", price=100.0, quote_balance=1000.0)
+    runner = make_runner(monkeypatch, exchange)
+    bot = runner.bots[SYMBOL]
+
+    async def scenario():
+        bot.execute_initial_buy(100.0)
+        crypto = bot.crypto_balance
+        exchange.set_price(98.0)
+        runner.dispatch(SYMBOL, 98.0)
+        await settle(runner)
+        assert bot.orders.in_flight is not None
+        assert bot.orders._idle.wait(5.0)       # The exchange has filled it
+
+        # Inside both the old (99-101.5) and the re-centred (97.02-99.47) band: no trigger crosses
+        exchange.set_price(99.2)
+        for _ in range(3):
+            runner.dispatch(SYMBOL, 99.2)
+            await settle(runner)
+        return crypto
+
+    try:
+        crypto_before = asyncio.run(scenario())
+        assert bot.orders.in_flight is None
+        assert bot.trade_count == 1
+        assert bot.crypto_balance > crypto_before
+        assert bot.reference_price == 98.0
+    finally:
+        runner.shutdown()
@@ -0,0 +1,160 @@
+import json
+import threading
+import time
+
+import pytest
+from websockets.sync.server import serve
+
+import asymmetric_grid_bot_v211 as grid_bot
+import price_stream
+from asymmetric_grid_bot_v211 import BotConfig, DualTriggerBot
+from mock_exchange import MockExchange
+from price_stream import PriceStream, ReconnectingStream
+
+SYMBOL = "SOLUSDT"
+
+
+class FakeServer:
+    """Local WebSocket server; `handler(connection, n)` serves the n-th connection (from 1)"""
+
+    def __init__(self, handler):
+        self.connections = 0
+        self._handler = handler
+        self._server = serve(self._handle, "127.0.0.1", 0)
+        self.url = f"ws://127.0.0.1:{self._server.socket.getsockname()[1]}/ws"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def _handle(self, connection):
+        self.connections += 1
+        self._handler(connection, self.connections)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._thread.join(5)
+
+
+def trade(price: float) -> str:
+    return json.dumps({"e": "trade", "s": SYMBOL, "p": f"{price:.2f}", "T": int(time.time() * 1000)})
+
+
+def wait_until(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_reconnecting_stream_is_abstract():
+    with pytest.raises(TypeError):
+        ReconnectingStream("incomplete")
+
+
+def record_backoff(monkeypatch, stream) -> list:
+    """Delays the stream waits before reconnecting (jitter disabled)"""
+    delays = []
+    monkeypatch.setattr(price_stream.random, "uniform", lambda low, high: high)
+    real_wait = stream._stop.wait
+    monkeypatch.setattr(stream._stop, "wait", lambda delay=None: delays.append(delay) or real_wait(delay))
+    return delays
+
+
+def test_reconnects_with_doubling_backoff(monkeypatch):
+    def handler(connection, n):
+        # Drop the first three connections straight away, then serve a price
+        if n > 3:
+            connection.send(trade(101.0))
+            time.sleep(0.5)
+
+    logs = []
+    with FakeServer(handler) as server:
+        stream = PriceStream(SYMBOL, base_url=server.url, on_log=lambda level, message: logs.append(message),
+                             initial_backoff=0.02, max_backoff=0.05)
+        delays = record_backoff(monkeypatch, stream)
+        stream.start()
+        try:
+            prices = stream.wait_for_prices(timeout=5.0)
+        finally:
+            stream.stop()
+
+    assert prices == [101.0]
+    assert server.connections == 4
+    assert stream.reconnect_count == 3
+    assert delays == [0.02, 0.04, 0.05]         # Doubled, capped at max_backoff
+    assert sum("reconnecting in" in message for message in logs) == 3
+
+
+def test_backoff_resets_after_a_message(monkeypatch):
+    def handler(connection, n):
+        connection.send(trade(100.0 + n))
+
+    with FakeServer(handler) as server:
+        stream = PriceStream(SYMBOL, base_url=server.url, initial_backoff=0.02, max_backoff=1.0)
+        delays = record_backoff(monkeypatch, stream)
+        stream.start()
+        try:
+            assert wait_until(lambda: len(delays) >= 3)
+        finally:
+            stream.stop()
+
+    # Every connection delivered a price, so the backoff never grew
+    assert delays[:3] == [0.02, 0.02, 0.02]
+
+
+def test_stale_detection():
+    def handler(connection, n):
+        connection.send(trade(100.0))
+        time.sleep(2.0)         # Connected, but silent
+
+    with FakeServer(handler) as server:
+        stream = PriceStream(SYMBOL, base_url=server.url)
+        assert stream.is_stale(0.2)             # Nothing received yet
+        stream.start()
+        try:
+            assert stream.wait_for_prices(timeout=5.0) == [100.0]
+            assert not stream.is_stale(0.2)
+            assert wait_until(lambda: stream.is_stale(0.2), timeout=1.0)
+            assert stream.connected.is_set()
+        finally:
+            stream.stop()
+
+
+def test_rest_fallback_polls_at_poll_interval_until_the_stream_recovers(monkeypatch):
+    monkeypatch.setattr(grid_bot, "STREAM_STALE_AFTER", 0.3)
+
+    def handler(connection, n):
+        time.sleep(1.0)         # Stale past STREAM_STALE_AFTER, then recovers
+        connection.send(trade(123.0))
+        time.sleep(1.0)
+
+    with FakeServer(handler) as server:
+        config = BotConfig("key", "secret", SYMBOL, "SOL", "USDT", 1000.0, 50.0, False, price_feed="stream",
+                           stream_url=server.url, poll_interval=0.05, headless=True, state_journal=False,
+                           reconcile_interval=0)
+        bot = DualTriggerBot(config, client=MockExchange(SYMBOL, "SOL", price=100.0))
+        polls = []
+        seen = []
+
+        def rest_price():
+            polls.append(time.monotonic())
+            return 100.0
+
+        def check_triggers(price):
+            seen.append(price)
+            if price == 123.0:
+                raise KeyboardInterrupt
+
+        bot.get_current_price = rest_price
+        bot.check_triggers = check_triggers
+        with pytest.raises(KeyboardInterrupt):
+            bot._run_streaming()
+
+    # ~0.7s of fallback at 0.05s, not one poll per STREAM_STALE_AFTER
+    assert len(polls) >= 5
+    assert max(b - a for a, b in zip(polls, polls[1:])) < 0.3
+    assert seen[-1] == 123.0 and set(seen[:-1]) == {100.0}
@@ -0,0 +1,104 @@
+import pytest
+
+from asymmetric_grid_bot_v211 import BotConfig, DualTriggerBot
+from mock_exchange import MockExchange
+
+SYMBOL = "SOLUSDT"
+
+
+@pytest.fixture
+def live(monkeypatch):
+    # The account holds more than the bot's allocation, so the offsets are non-zero
+    exchange = MockExchange(SYMBOL, "SOL", price=100.0, base_balance=3.0, quote_balance=5000.0, min_notional=5)
+    events = []
+    monkeypatch.setattr(exchange, "_broadcast", lambda event, stream=None: events.append(event))
+    config = BotConfig("key", "secret", SYMBOL, "SOL", "USDT", 1000.0, 50.0, False,
+                       headless=True, state_journal=False, reconcile_interval=3600)
+    bot = DualTriggerBot(config, client=exchange)
+    bot.execute_initial_buy(100.0)
+    bot.reconciler.start(own_stream=False)
+    events.clear()
+    yield exchange, bot, events
+    bot.orders.close()
+
+
+def divergence(exchange, bot):
+    totals = {b['asset']: float(b['free']) + float(b['locked']) for b in exchange.get_account()['balances']}
+    return (totals["SOL"] - bot.account_offsets["SOL"] - bot.crypto_balance,
+            totals["USDT"] - bot.account_offsets["USDT"] - bot.usdt_balance)
+
+
+def trade_reports(events):
+    return [e for e in events if e.get('e') == 'executionReport' and e.get('x') == 'TRADE']
+
+
+@pytest.mark.parametrize("stream_first", [False, True])
+def test_fill_from_rest_and_stream_is_booked_once(live, stream_first):
+    exchange, bot, events = live
+    reconciler = bot.reconciler
+    crypto = bot.crypto_balance
+    response = exchange.order_market_buy(symbol=SYMBOL, quantity="0.5", newClientOrderId="agmBtest1")
+    assert trade_reports(events) and all(fill['tradeId'] >= 0 for fill in response['fills'])
+
+    if stream_first:
+        for event in events:
+            reconciler.handle_event(event)
+        reconciler.book_order("BUY", response)
+    else:
+        reconciler.book_order("BUY", response)
+        for event in events:
+            reconciler.handle_event(event)
+
+    commission = sum(float(fill['commission']) for fill in response['fills'])
+    assert bot.crypto_balance == pytest.approx(crypto + 0.5 - commission)
+    assert divergence(exchange, bot) == pytest.approx((0.0, 0.0), abs=1e-9)
+
+
+def test_market_order_through_the_bot_matches_the_account(live):
+    exchange, bot, events = live
+    exchange.set_price(98.0)
+    bot.check_triggers(98.0)
+    bot.orders.close()          # Waits for the worker and books the response
+    for event in events:
+        bot.reconciler.handle_event(event)
+
+    assert bot.trade_count == 1
+    assert divergence(exchange, bot) == pytest.approx((0.0, 0.0), abs=1e-9)
+    assert not bot.metrics.counters.get(("balance_corrections_total", (("asset", "SOL"),)))
+
+
+def test_divergence_is_corrected_after_two_matching_checks(live):
+    exchange, bot, events = live
+    reconciler = bot.reconciler
+    crypto = bot.crypto_balance
+    exchange.free["SOL"] -= 0.05        # Moved outside the bot (e.g. a manual withdrawal)
+    position = exchange._account_position()
+
+    reconciler.handle_event(position)
+    assert bot.crypto_balance == crypto         # One look could be a fill still in flight
+    assert reconciler._pending["SOL"] == pytest.approx(-0.05)
+
+    reconciler.check_snapshot()
+    assert bot.crypto_balance == pytest.approx(crypto - 0.05)
+    assert "SOL" not in reconciler._pending
+    assert divergence(exchange, bot) == pytest.approx((0.0, 0.0), abs=1e-9)
+
+
+def test_divergence_that_changes_between_checks_is_not_corrected(live):
+    exchange, bot, events = live
+    reconciler = bot.reconciler
+    crypto = bot.crypto_balance
+
+    exchange.free["SOL"] -= 0.05
+    reconciler.check_snapshot()
+    exchange.free["SOL"] += 0.05        # The fill landed: back in line
+    reconciler.check_snapshot()
+    assert bot.crypto_balance == crypto
+    assert "SOL" not in reconciler._pending
+
+    exchange.free["SOL"] -= 0.05
+    reconciler.check_snapshot()
+    exchange.free["SOL"] -= 0.02        # Still moving
+    reconciler.check_snapshot()
+    assert bot.crypto_balance == crypto
+    assert reconciler._pending["SOL"] == pytest.approx(-0.07)
@@ -0,0 +1,95 @@
+import pytest
+
+import request_scheduler
+from request_scheduler import (PRIORITY_ORDER, PRIORITY_POLL, USED_WEIGHT_HEADER, WEIGHT_WINDOW, RequestScheduler,
+                               RequestThrottled)
+
+START = 1_000 * WEIGHT_WINDOW        # On a minute boundary
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = float(START)
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+class Response:
+    def __init__(self, status_code: int = 200, **headers):
+        self.status_code = status_code
+        self.headers = headers
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(request_scheduler.random, "uniform", lambda low, high: high)    # No jitter
+    clock = FakeClock()
+    return RequestScheduler(weight_limit=100, clock=clock), clock
+
+
+def test_admits_up_to_each_priority_budget(scheduler):
+    scheduler, clock = scheduler
+    for _ in range(6):
+        scheduler.acquire(PRIORITY_POLL, weight=10, max_wait=0)           # Polls: 60% of 100
+    with pytest.raises(RequestThrottled):
+        scheduler.acquire(PRIORITY_POLL, weight=1, max_wait=0)
+    scheduler.acquire(PRIORITY_ORDER, weight=30, max_wait=0)              # Orders: up to 90
+    with pytest.raises(RequestThrottled):
+        scheduler.acquire(PRIORITY_ORDER, weight=1, max_wait=0)
+    assert scheduler.used_weight == 90
+    assert clock.now == START                                            # Refusals never slept
+
+
+def test_refused_request_waits_for_the_next_window(scheduler):
+    scheduler, clock = scheduler
+    clock.now += 45
+    scheduler.acquire(PRIORITY_POLL, weight=60)
+    with pytest.raises(RequestThrottled):
+        scheduler.acquire(PRIORITY_POLL, weight=2, max_wait=10)           # 15 s to the reset
+    scheduler.acquire(PRIORITY_POLL, weight=2)
+    assert clock.now == pytest.approx(START + WEIGHT_WINDOW)
+    assert scheduler.used_weight == 2
+
+
+def test_used_weight_header_replaces_the_estimate(scheduler):
+    scheduler, clock = scheduler
+    scheduler.acquire(weight=1)
+    scheduler._on_response(Response(**{USED_WEIGHT_HEADER: "59"}))       # Another process on the IP
+    with pytest.raises(RequestThrottled):
+        scheduler.acquire(PRIORITY_POLL, weight=2, max_wait=0)
+    scheduler.acquire(PRIORITY_ORDER, weight=2, max_wait=0)
+
+
+@pytest.mark.parametrize("status", [429, 418])
+def test_throttle_status_pauses_every_request_for_retry_after(scheduler, status):
+    scheduler, clock = scheduler
+    scheduler._on_response(Response(status, **{"Retry-After": "3"}))
+    assert scheduler.blocked_until == START + 3 + 1.0                     # Retry-After + first backoff step
+    with pytest.raises(RequestThrottled):
+        scheduler.acquire(PRIORITY_ORDER, weight=1, max_wait=3.5)         # Orders wait too
+    scheduler.acquire(PRIORITY_POLL, weight=1)
+    assert clock.now == pytest.approx(START + 4)
+
+
+def test_backoff_grows_with_consecutive_throttles_and_resets_on_success(scheduler):
+    scheduler, clock = scheduler
+    scheduler._on_response(Response(429, **{"Retry-After": "1"}))
+    scheduler._on_response(Response(418, **{"Retry-After": "10"}))
+    assert scheduler.blocked_until == START + 10 + 2.0
+    scheduler._on_response(Response(429))                                 # No header: backoff alone
+    assert scheduler.blocked_until == START + 12                          # Never shortened
+    clock.now += 12
+    scheduler._on_response(Response(200))
+    scheduler._on_response(Response(429, **{"Retry-After": "bogus"}))
+    assert scheduler.blocked_until == START + 12 + 1.0
+
+
+def test_disabled_scheduler_admits_everything():
+    scheduler = RequestScheduler(weight_limit=1, clock=FakeClock())
+    scheduler.attach(object())                                            # No session: mock exchange
+    for _ in range(10):
+        scheduler.acquire(weight=5, max_wait=0)
@@ -0,0 +1,140 @@
+import json
+import os
+
+from asymmetric_grid_bot_v211 import BotConfig, DualTriggerBot
+from mock_exchange import MockExchange
+from state_journal import StateJournal, apply_changes, decode_record, diff_state
+
+SYMBOL = "SOLUSDT"
+
+
+def state(n: int) -> dict:
+    """A bot-like state after n trades: scalars, a nested ledger and a growing list of lots"""
+    return {
+        "crypto_balance": 5.0 + n * 0.1, "usdt_balance": 500.0 - n * 10.0, "trade_count": n,
+        "account_offsets": {"SOL": 3.0, "USDT": 4000.0},
+        "ledger": {"realized_pnl": n * 0.5, "lots": [[0.1, 10.0, float(i)] for i in range(n + 1)]},
+    }
+
+
+def records(journal) -> list:
+    with open(journal.journal_path, "rb") as f:
+        return [decode_record(line) for line in f]
+
+
+def write_states(count: int, snapshot_every: int = 100) -> StateJournal:
+    journal = StateJournal(SYMBOL, snapshot_every=snapshot_every, fsync=False)
+    for n in range(1, count + 1):
+        journal.append("BUY", state(n))
+    journal.close()
+    return journal
+
+
+def test_diff_and_apply_round_trip():
+    old = state(3)
+    new = state(4)
+    new["ledger"]["lots"] = new["ledger"]["lots"][2:]      # Oldest lots consumed by a sell
+    new["account_offsets"]["BNB"] = 1.0
+    del new["trade_count"]
+    changes = diff_state(old, new)
+    apply_changes(old, changes)
+    assert old == new
+    assert diff_state(new, new) == []
+
+
+def test_records_after_the_first_hold_only_the_changes():
+    journal = write_states(5)
+    saved = records(journal)
+    assert saved[0]["state"] == state(1)
+    for record in saved[1:]:
+        assert "state" not in record
+        # One lot appended, not the whole list
+        splice = [c for c in record["changes"] if c[0] == "splice"]
+        n = record["seq"]
+        assert splice == [["splice", ["ledger", "lots"], n, n, [[0.1, 10.0, float(n)]]]]
+        assert not any(c[1][0] == "account_offsets" for c in record["changes"])
+    assert StateJournal(SYMBOL).load() == state(5)
+
+
+def test_torn_last_line_is_discarded():
+    journal = write_states(4)
+    size = os.path.getsize(journal.journal_path)
+    with open(journal.journal_path, "ab") as f:
+        f.write(b"0badf00d {\"seq\": 5, \"event\": \"SE")       # Crash mid-write
+
+    restored = StateJournal(SYMBOL, fsync=False)
+    assert restored.load() == state(4)
+    assert restored.seq == 4
+    # Replayed into a fresh snapshot; the torn tail is gone with the rest of the journal
+    assert os.path.getsize(journal.journal_path) < size
+
+
+def test_crc_bad_last_line_is_discarded():
+    journal = write_states(4)
+    with open(journal.journal_path, "rb") as f:
+        lines = f.readlines()
+    lines[-1] = lines[-1].replace(b'"BUY"', b'"BUZ"')
+    with open(journal.journal_path, "wb") as f:
+        f.writelines(lines)
+
+    assert decode_record(lines[-1]) is None
+    assert StateJournal(SYMBOL, fsync=False).load() == state(3)
+
+
+def test_resume_from_snapshot_and_journal_tail():
+    journal = write_states(5, snapshot_every=3)
+    with open(journal.snapshot_path) as f:
+        snapshot = json.load(f)
+    assert snapshot == {"seq": 3, "state": state(3)}
+    # The journal restarts with a full record after the snapshot
+    tail = records(journal)
+    assert [r["seq"] for r in tail] == [4, 5]
+    assert "state" in tail[0] and "changes" in tail[1]
+
+    restored = StateJournal(SYMBOL, snapshot_every=3, fsync=False)
+    assert restored.load() == state(5)
+    restored.append("SELL", state(6))
+    restored.close()
+    assert StateJournal(SYMBOL).load() == state(6)
+
+
+def test_journal_alone_rebuilds_state_when_the_snapshot_is_lost():
+    journal = write_states(5, snapshot_every=3)
+    os.remove(journal.snapshot_path)
+    assert StateJournal(SYMBOL, fsync=False).load() == state(5)
+
+
+def test_changes_without_their_base_are_not_applied():
+    journal = write_states(3)
+    with open(journal.journal_path, "rb") as f:
+        lines = f.readlines()
+    with open(journal.journal_path, "wb") as f:
+        f.writelines(lines[1:])             # Full first record lost
+    assert StateJournal(SYMBOL, fsync=False).load() is None
+
+
+def test_bot_resumes_balances_ledger_and_offsets():
+    exchange = MockExchange(SYMBOL, "SOL", price=100.0, quote_balance=1000.0)
+    config = BotConfig("key", "secret", SYMBOL, "SOL", "USDT", 1000.0, 50.0, False,
+                       headless=True, reconcile_interval=0)
+    bot = DualTriggerBot(config, client=exchange)
+    bot.execute_initial_buy(100.0)
+    bot.account_offsets["SOL"] = 1.5
+    bot.ledger.buy(0.2, 98.0, 19.6)
+    bot.save_state("BUY")
+    bot.account_offsets["SOL"] = 2.0        # Changed in place: must still be journaled
+    bot.ledger.sell(0.1, 101.0, 10.1)
+    bot.save_state("SELL")
+    bot.orders.close()
+    bot.journal.close()
+
+    resumed = DualTriggerBot(config, client=exchange)
+    try:
+        assert resumed.resumed
+        assert resumed.crypto_balance == bot.crypto_balance
+        assert resumed.usdt_balance == bot.usdt_balance
+        assert resumed.account_offsets == {"SOL": 2.0}
+        assert resumed.ledger.to_dict() == bot.ledger.to_dict()
+    finally:
+        resumed.orders.close()
+        resumed.journal.close()
@@ -0,0 +1,102 @@
+import struct
+
+import pytest
+
+from asymmetric_grid_bot_v211 import BotConfig, DualTriggerBot
+from mock_exchange import MockExchange
+from supervisor import _SLOT, PriceRing, _consume
+
+
+@pytest.fixture
+def ring():
+    ring = PriceRing(capacity=8, readers=2)
+    reader = PriceRing(ring.name)
+    yield ring, reader
+    reader.release()
+    ring.release()
+
+
+def slot_offset(ring, sequence: int) -> int:
+    return ring._slots_offset + (sequence % ring.capacity) * _SLOT.size
+
+
+def test_readers_see_every_price_in_order(ring):
+    writer, reader = ring
+    for n in range(1, 6):
+        writer.publish(100.0 + n, 1000 * n)
+    assert reader.since(0) == [(n, 100.0 + n, 1000 * n) for n in range(1, 6)]
+    assert reader.since(5) == []
+    assert reader.latest() == (5, 105.0, 5000)
+    assert reader.dropped == 0
+
+
+def test_lapped_reader_skips_to_the_oldest_safe_slot(ring):
+    writer, reader = ring
+    for n in range(1, 21):
+        writer.publish(float(n), n)
+    entries = reader.since(0)
+    assert [e[0] for e in entries] == list(range(14, 21))
+    assert reader.dropped == 13
+    assert reader.read(5) is None                # Overwritten by sequence 13
+
+
+def test_slot_not_yet_visible_is_retried_not_dropped(ring):
+    writer, reader = ring
+    for n in range(1, 9):
+        writer.publish(float(n), n)
+    offset = slot_offset(writer, 9)
+    stale = bytes(writer.buf[offset:offset + _SLOT.size])     # Still holds sequence 1
+    writer.publish(9.0, 9)
+    fresh = bytes(writer.buf[offset:offset + _SLOT.size])
+
+    # A weakly ordered CPU can show the new head before the slot's new contents
+    writer.buf[offset:offset + _SLOT.size] = stale
+    assert [e[0] for e in reader.since(7)] == [8]
+    assert reader.dropped == 0
+    writer.buf[offset:offset + _SLOT.size] = fresh
+    assert reader.since(8) == [(9, 9.0, 9)]
+    assert reader.dropped == 0
+
+
+def test_torn_slot_is_rejected(ring):
+    writer, reader = ring
+    writer.publish(100.0, 1)
+    writer.publish(101.0, 2)
+    offset = slot_offset(writer, 2)
+    # New sequence with the price bytes of another write: the checksum no longer matches
+    writer.buf[offset + 8:offset + 16] = struct.pack("<d", 123.0)
+    assert reader.read(2) is None
+    assert reader.since(1) == []
+    assert reader.dropped == 0                  # Not lapped: picked up once the write lands
+
+
+def test_close_ring_stops_readers(ring):
+    writer, reader = ring
+    writer.publish(100.0, 1)
+    assert not reader.closed
+    writer.close_ring()
+    assert reader.closed
+    assert reader.head() == 1
+
+
+def test_worker_books_a_finished_order_without_a_new_price(ring):
+    writer, reader = ring
+    exchange = MockExchange("SOLUSDT", "SOL", price=100.0, quote_balance=1000.0)
+    config = BotConfig("key", "secret", "SOLUSDT", "SOL", "USDT", 1000.0, 50.0, False,
+                       headless=True, state_journal=False, reconcile_interval=0)
+    bot = DualTriggerBot(config, client=exchange)
+    try:
+        bot.execute_initial_buy(100.0)
+        exchange.set_price(98.0)
+        writer.publish(98.0, 1)
+        last = _consume(bot, reader, 0)
+        assert last == 1 and bot.orders.in_flight is not None
+        assert bot.orders._idle.wait(5.0)
+
+        # Wake timeout on a quiet symbol: nothing new in the ring
+        assert _consume(bot, reader, last) == 1
+        assert bot.orders.in_flight is None
+        assert bot.trade_count == 1
+        assert bot.reference_price == 98.0
+    finally:
+        bot.orders.close()
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pytest
+
+from tick_store import INDEX_FILE, INDEX_STRIDE, PRICE_FILE, TS_FILE, TickRecorder, TickStore, symbol_dir
+
+SYMBOL = "SOLUSDT"
+ROWS = 3 * INDEX_STRIDE + 5
+
+
+def record(timestamps, prices) -> str:
+    recorder = TickRecorder(SYMBOL)
+    for ts, price in zip(timestamps, prices):
+        recorder.append(int(ts), float(price))
+    recorder.close()
+    return symbol_dir(SYMBOL)
+
+
+@pytest.fixture
+def tape():
+    rng = np.random.default_rng(1)
+    # Repeated timestamps, some of them running across index block edges
+    timestamps = 1_700_000_000_000 + np.cumsum(rng.integers(0, 3, ROWS))
+    timestamps[INDEX_STRIDE - 3:INDEX_STRIDE + 3] = timestamps[INDEX_STRIDE - 3]
+    prices = 100 + np.cumsum(rng.normal(0, 0.01, ROWS))
+    return timestamps, prices
+
+
+def test_locate_matches_a_full_search_at_block_edges(tape):
+    timestamps, prices = tape
+    store = TickStore(record(timestamps, prices))
+    assert len(store) == ROWS
+    assert np.array_equal(store.index, timestamps[::INDEX_STRIDE])
+    probes = {int(timestamps[0]) - 1, int(timestamps[-1]), int(timestamps[-1]) + 1}
+    for row in range(0, ROWS, INDEX_STRIDE):
+        for offset in (-1, 0, 1):
+            if 0 <= row + offset < ROWS:
+                ts = int(timestamps[row + offset])
+                probes.update((ts - 1, ts, ts + 1))
+    for ts in sorted(probes):
+        assert store.locate(ts) == np.searchsorted(timestamps, ts, side="left"), ts
+
+
+def test_range_is_half_open(tape):
+    timestamps, prices = tape
+    store = TickStore(record(timestamps, prices))
+    start, end = int(timestamps[INDEX_STRIDE]), int(timestamps[2 * INDEX_STRIDE + 7])
+    ts, px = store.range(start, end)
+    expected = (timestamps >= start) & (timestamps < end)
+    assert np.array_equal(ts, timestamps[expected])
+    assert np.array_equal(px, prices[expected])
+    assert len(store.range(int(timestamps[-1]) + 1)[0]) == 0
+    assert len(store.range(None, int(timestamps[0]))[0]) == 0
+
+
+def test_torn_tail_is_cut_and_recording_resumes(tape):
+    timestamps, prices = tape
+    path = record(timestamps, prices)
+    ts_path, price_path, index_path = (os.path.join(path, name) for name in (TS_FILE, PRICE_FILE, INDEX_FILE))
+    # Crash mid-flush: the price landed, the last timestamp only in part, the newest index entry not at all
+    with open(ts_path, "r+b") as f:
+        f.truncate(os.path.getsize(ts_path) - 3)
+    with open(index_path, "r+b") as f:
+        f.truncate(os.path.getsize(index_path) - 8)
+
+    # Readers never see the partial row
+    store = TickStore(path)
+    assert len(store) == ROWS - 1
+    assert np.array_equal(store.prices, prices[:-1])
+    del store
+
+    recorder = TickRecorder(SYMBOL)
+    assert recorder.rows == ROWS - 1
+    assert recorder.last_ts == timestamps[-2]
+    assert os.path.getsize(ts_path) == os.path.getsize(price_path) == (ROWS - 1) * 8
+    recorder.append(int(timestamps[-1]), 123.0)
+    recorder.close()
+
+    store = TickStore(path)
+    assert len(store) == ROWS
+    assert np.array_equal(store.timestamps, timestamps)
+    assert np.array_equal(store.prices, np.r_[prices[:-1], 123.0])
+    assert np.array_equal(store.index, timestamps[::INDEX_STRIDE])
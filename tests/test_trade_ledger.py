@@ -0,0 +1,29 @@
+import csv
+
+import pytest
+
+from trade_ledger import LedgerEntry, TradeLedger
+
+
+def test_write_csv_exports_recent_trades_oldest_first(tmp_path):
+    ledger = TradeLedger(capacity=2)
+    ledger.buy(1.0, 100.0, 100.0, timestamp=1.0)
+    ledger.buy(1.0, 90.0, 90.0, 0.1, timestamp=2.0)
+    ledger.sell(1.5, 110.0, 165.0, 0.2, timestamp=4.0)
+    path = tmp_path / "ledger.csv"
+    ledger.write_csv(str(path))
+
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(LedgerEntry.__slots__)
+    assert [row[1] for row in rows[1:]] == ["BUY", "SELL"]       # Capacity keeps the last two
+    sell = dict(zip(rows[0], rows[2]))
+    assert float(sell["realized_pnl"]) == pytest.approx(165.0 - 100.0 - 45.0)
+
+
+def test_unrealized_pnl_is_against_cost_basis():
+    ledger = TradeLedger("average")
+    ledger.buy(2.0, 100.0, 201.0)
+    assert ledger.unrealized_pnl(110.0) == pytest.approx(220.0 - 201.0)
+    ledger.sell(2.0, 110.0, 220.0)
+    assert ledger.unrealized_pnl(120.0) == 0.0
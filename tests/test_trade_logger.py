@@ -0,0 +1,69 @@
+import json
+import threading
+
+import pytest
+
+from asymmetric_grid_bot_v211 import TradeLogger
+
+TRADES = 2_000
+
+
+class TrackedLogger(TradeLogger):
+    """Remembers every file it opened, in order"""
+
+    def _open_new_file(self):
+        super()._open_new_file()
+        self.__dict__.setdefault("files", []).append(self.log_file)
+
+
+def trades_in(paths) -> list:
+    entries = []
+    for path in paths:
+        with open(path) as f:
+            entries.extend(json.loads(line) for line in f)
+    return [e for e in entries if e["level"] == "TRADE"]
+
+
+@pytest.mark.parametrize("background", [True, False])
+def test_every_trade_is_written_in_order(background):
+    logger = TrackedLogger("SOLUSDT", True, background=background, json_lines=True, batch_size=64)
+    for n in range(TRADES):
+        logger.log_trade("BUY" if n % 2 else "SELL", 100.0 + n, 0.5, 50.0 + n)
+    logger.close()
+    logger.close()                                   # Idempotent (atexit calls it again)
+
+    trades = trades_in(logger.files)
+    assert [t["price"] for t in trades] == [100.0 + n for n in range(TRADES)]
+    assert trades[0]["side"] == "SELL" and trades[1]["side"] == "BUY"
+
+
+def test_size_rotation_loses_nothing():
+    logger = TrackedLogger("SOLUSDT", True, json_lines=True, max_bytes=16_384, batch_size=64)
+    for n in range(TRADES):
+        logger.log_trade("BUY", 100.0 + n, 0.5, 50.0)
+    logger.close()
+
+    assert len(logger.files) > 5
+    assert len(set(logger.files)) == len(logger.files)      # Same-second rotations get a suffix
+    assert [t["price"] for t in trades_in(logger.files)] == [100.0 + n for n in range(TRADES)]
+
+
+def test_trades_from_several_threads_are_all_written():
+    logger = TrackedLogger("SOLUSDT", True, json_lines=True, batch_size=64)
+
+    def writer(thread: int):
+        for n in range(500):
+            logger.log_trade("BUY", float(thread), 0.5, float(n))
+
+    threads = [threading.Thread(target=writer, args=(t,)) for t in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    logger.close()
+
+    trades = trades_in(logger.files)
+    assert len(trades) == 2_000
+    for thread in range(4):
+        # Each thread's own trades keep their order
+        assert [t["total"] for t in trades if t["price"] == thread] == [float(n) for n in range(500)]
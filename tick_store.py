@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Compact tick recorder and memory-mapped replay format for the Asymmetric Grid Bot
+One directory per symbol holding fixed-width little-endian columns, 16 bytes per tick:
+    ts.i64       int64 milliseconds since the epoch (non-decreasing)
+    price.f64    float64 price
+    index.i64    timestamp of every INDEX_STRIDE-th row (sparse index for time-range seeks)
+    meta.json    symbol and layout
+Columns have no header, so readers map them straight into NumPy arrays without copying.
+
+Usage:
+    python3 tick_store.py ticks/SOLUSDT                               # summary
+    python3 tick_store.py ticks/SOLUSDT --start 2026-01-01 --end 2026-01-02 --csv day.csv
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+import numpy as np
+
+# === Constants ===
+TICK_DIR = "ticks"
+INDEX_STRIDE = 4096              # Rows per sparse-index entry
+FLUSH_ROWS = 4096                # Buffered ticks before a write
+FLUSH_INTERVAL = 5.0             # Max seconds a tick waits in the buffer
+FORMAT_VERSION = 1
+TS_FILE, PRICE_FILE, INDEX_FILE, META_FILE = "ts.i64", "price.f64", "index.i64", "meta.json"
+TS_DTYPE, PRICE_DTYPE = np.dtype("<i8"), np.dtype("<f8")
+
+
+def symbol_dir(symbol: str, directory: str = TICK_DIR) -> str:
+    return os.path.join(directory, symbol.upper())
+
+
+# === Recorder ===
+class TickRecorder:
+    """
+    Appends (timestamp ms, price) ticks for one symbol
+    Ticks are buffered and written in blocks; safe to call from several threads (stream + REST)
+    """
+
+    def __init__(self, symbol: str, directory: str = TICK_DIR, flush_rows: int = FLUSH_ROWS,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.symbol = symbol.upper()
+        self.path = symbol_dir(symbol, directory)
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        os.makedirs(self.path, exist_ok=True)
+        meta_path = os.path.join(self.path, META_FILE)
+        if not os.path.exists(meta_path):
+            with open(meta_path, "w") as f:
+                json.dump({"symbol": self.symbol, "version": FORMAT_VERSION, "index_stride": INDEX_STRIDE,
+                           "columns": {"ts": TS_DTYPE.str, "price": PRICE_DTYPE.str}}, f)
+
+        self.rows = self._repair()
+        self.last_ts = self._last_timestamp()
+        self._ts_file = open(os.path.join(self.path, TS_FILE), "ab")
+        self._price_file = open(os.path.join(self.path, PRICE_FILE), "ab")
+        self._index_file = open(os.path.join(self.path, INDEX_FILE), "ab")
+        self._ts = array("q")
+        self._prices = array("d")
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def _repair(self) -> int:
+        """Cut columns to a common length (a crash can leave one ahead) and rebuild the index tail"""
+        ts_path = os.path.join(self.path, TS_FILE)
+        price_path = os.path.join(self.path, PRICE_FILE)
+        index_path = os.path.join(self.path, INDEX_FILE)
+        sizes = [os.path.getsize(p) // 8 if os.path.exists(p) else 0 for p in (ts_path, price_path)]
+        rows = min(sizes)
+        for p in (ts_path, price_path):
+            if os.path.exists(p) and os.path.getsize(p) != rows * 8:
+                with open(p, "r+b") as f:
+                    f.truncate(rows * 8)
+        entries = (rows + INDEX_STRIDE - 1) // INDEX_STRIDE
+        if not os.path.exists(index_path) or os.path.getsize(index_path) != entries * 8:
+            if rows:
+                timestamps = np.memmap(ts_path, dtype=TS_DTYPE, mode="r", shape=(rows,))
+                np.ascontiguousarray(timestamps[::INDEX_STRIDE]).tofile(index_path)
+                del timestamps
+            else:
+                open(index_path, "wb").close()
+        return rows
+
+    def _last_timestamp(self) -> int:
+        if not self.rows:
+            return 0
+        with open(os.path.join(self.path, TS_FILE), "rb") as f:
+            f.seek((self.rows - 1) * 8)
+            return int(np.frombuffer(f.read(8), dtype=TS_DTYPE)[0])
+
+    def append(self, ts_ms: int, price: float):
+        """Record one tick; out-of-order timestamps are clamped so the column stays sorted"""
+        with self._lock:
+            if ts_ms < self.last_ts:
+                ts_ms = self.last_ts
+            self.last_ts = ts_ms
+            self._ts.append(ts_ms)
+            self._prices.append(price)
+            if len(self._ts) >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def _flush(self):
+        if self._ts:
+            # Index entries for every stride boundary this block crosses
+            first_row = self.rows
+            start = (-first_row) % INDEX_STRIDE
+            if start < len(self._ts):
+                self._index_file.write(self._ts[start::INDEX_STRIDE].tobytes())
+            # Prices before timestamps: a torn write leaves ts short, never a ts without a price
+            self._price_file.write(self._prices.tobytes())
+            self._ts_file.write(self._ts.tobytes())
+            for f in (self._price_file, self._ts_file, self._index_file):
+                f.flush()
+            self.rows += len(self._ts)
+            self._ts = array("q")
+            self._prices = array("d")
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            if self._ts_file.closed:
+                return
+            self._flush()
+            for f in (self._ts_file, self._price_file, self._index_file):
+                f.close()
+
+
+# === Reader ===
+class TickStore:
+    """Zero-copy, read-only view of a symbol's recorded ticks"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.stride = self.meta.get("index_stride", INDEX_STRIDE)
+        ts_path = os.path.join(path, TS_FILE)
+        price_path = os.path.join(path, PRICE_FILE)
+        rows = min(os.path.getsize(ts_path), os.path.getsize(price_path)) // 8
+        self.timestamps = self._map(ts_path, TS_DTYPE, rows)
+        self.prices = self._map(price_path, PRICE_DTYPE, rows)
+        index_path = os.path.join(path, INDEX_FILE)
+        entries = min(os.path.getsize(index_path) // 8, (rows + self.stride - 1) // self.stride)
+        # The sparse index is small (1/4096 of the ticks): keep it in memory
+        self.index = np.fromfile(index_path, dtype=TS_DTYPE, count=entries) if entries else np.empty(0, TS_DTYPE)
+
+    @staticmethod
+    def _map(path: str, dtype: np.dtype, rows: int) -> np.ndarray:
+        if rows == 0:
+            return np.empty(0, dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+
+    @classmethod
+    def open(cls, symbol: str, directory: str = TICK_DIR) -> "TickStore":
+        return cls(symbol_dir(symbol, directory))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def locate(self, ts_ms: int) -> int:
+        """First row with timestamp >= ts_ms, touching only one index block of the ts column"""
+        n = len(self.timestamps)
+        block = int(np.searchsorted(self.index, ts_ms, side="left"))
+        lo = max(block - 1, 0) * self.stride
+        hi = min(block * self.stride + 1, n) if block < len(self.index) else n
+        return lo + int(np.searchsorted(self.timestamps[lo:hi], ts_ms, side="left"))
+
+    def range(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, prices) views for start_ms <= ts < end_ms (None = open-ended)"""
+        lo = 0 if start_ms is None else self.locate(start_ms)
+        hi = len(self.timestamps) if end_ms is None else self.locate(end_ms)
+        return self.timestamps[lo:hi], self.prices[lo:hi]
+
+
+def is_tick_store(path: str) -> bool:
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, META_FILE))
+
+
+def _parse_time(value: Optional[str]) -> Optional[int]:
+    """Epoch milliseconds or an ISO date/time (UTC)"""
+    if value is None:
+        return None
+    if value.isdigit():
+        return int(value)
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or export a recorded tick store")
+    parser.add_argument("path", help="Tick directory (e.g. ticks/SOLUSDT)")
+    parser.add_argument("--start", help="Range start (epoch ms or ISO time, UTC)")
+    parser.add_argument("--end", help="Range end, exclusive (epoch ms or ISO time, UTC)")
+    parser.add_argument("--csv", help="Write the selected range to this CSV (timestamp,price)")
+    args = parser.parse_args()
+
+    store = TickStore(args.path)
+    timestamps, prices = store.range(_parse_time(args.start), _parse_time(args.end))
+    fmt = lambda ms: datetime.fromtimestamp(ms / 1000, timezone.utc).isoformat(timespec="milliseconds")
+    print(f"{store.meta['symbol']}: {len(store):,} ticks stored, {os.path.getsize(os.path.join(args.path, TS_FILE)) * 2 / 1e6:,.1f} MB")
+    if len(timestamps):
+        print(f"Selected {len(timestamps):,} ticks from {fmt(timestamps[0])} to {fmt(timestamps[-1])}, "
+              f"price {prices.min():,.4f} .. {prices.max():,.4f}")
+    else:
+        print("Selected 0 ticks")
+    if args.csv:
+        np.savetxt(args.csv, np.column_stack([timestamps, prices]), delimiter=",",
+                   header="timestamp,price", comments="", fmt=["%d", "%.8f"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+In-memory trade ledger for the Asymmetric Grid Bot
+Matches sells against the lots bought before them (FIFO, or a single average-cost position) to give
+a cost-basis realized P&L, including fees. Every statistic is a running total updated once per
+trade, so reading them never rescans history:
+    realized P&L, win rate (profitable sells), average holding time per unit sold, max drawdown,
+    fees, volume
+Memory stays bounded on long runs: the last `capacity` trades are kept in a ring buffer, and when
+more than `max_lots` lots are open the two oldest are merged into one at their combined cost.
+"""
+
+import csv
+import time
+from collections import deque
+from typing import Deque, Iterator, Optional
+
+# === Constants ===
+COST_METHODS = ("fifo", "average")
+RECENT_TRADES = 1000        # Trades kept for the dashboard and exports
+MAX_LOTS = 256              # Open lots before the oldest are merged
+DUST_QTY = 1e-12            # Lot remainders below this are dropped
+
+
+class Lot:
+    """Quantity still held from one buy and what it cost (fees included)"""
+    __slots__ = ("quantity", "cost", "opened")
+
+    def __init__(self, quantity: float, cost: float, opened: float):
+        self.quantity = quantity
+        self.cost = cost
+        self.opened = opened
+
+
+class LedgerEntry:
+    """One trade as booked by the ledger"""
+    __slots__ = ("timestamp", "side", "price", "quantity", "quote", "fee", "realized_pnl", "holding")
+
+    def __init__(self, timestamp: float, side: str, price: float, quantity: float, quote: float,
+                 fee: float, realized_pnl: float = 0.0, holding: float = 0.0):
+        self.timestamp = timestamp
+        self.side = side
+        self.price = price
+        self.quantity = quantity
+        self.quote = quote              # Cost of a buy / proceeds of a sell, after fees
+        self.fee = fee
+        self.realized_pnl = realized_pnl
+        self.holding = holding          # Sells: average seconds the sold units were held
+
+    def as_row(self) -> list:
+        return [getattr(self, name) for name in self.__slots__]
+
+
+class TradeLedger:
+    """Cost-basis bookkeeping with O(1) statistics (amortized O(1) per FIFO sell)"""
+
+    def __init__(self, method: str = "fifo", capacity: int = RECENT_TRADES, max_lots: int = MAX_LOTS, clock=None):
+        if method not in COST_METHODS:
+            raise ValueError(f"Unknown cost method '{method}' (expected one of {COST_METHODS})")
+        self.method = method
+        self.max_lots = max_lots
+        self.clock = clock or time
+        self.entries: Deque[LedgerEntry] = deque(maxlen=capacity)
+        self.lots: Deque[Lot] = deque()
+        # Average cost: one position whose opening time is the quantity-weighted average
+        self.position = 0.0
+        self.cost_basis = 0.0
+        self._opened = 0.0
+        # Running statistics
+        self.realized_pnl = 0.0
+        self.fees = 0.0
+        self.volume = 0.0
+        self.buys = 0
+        self.sells = 0
+        self.wins = 0
+        self.sold_quantity = 0.0
+        self.held_seconds = 0.0         # Sum over sold units of quantity * time held
+        self.unmatched_quantity = 0.0   # Sold without a known lot (booked at zero P&L)
+        self.peak_equity = 0.0
+        self.max_drawdown = 0.0
+
+    # === Booking ===
+    def buy(self, quantity: float, price: float, cost: float, fee: float = 0.0,
+            timestamp: Optional[float] = None, equity: Optional[float] = None) -> LedgerEntry:
+        """Open a lot: quantity received (after base-asset fees) for cost quote spent (after quote fees)"""
+        now = self.clock.time() if timestamp is None else timestamp
+        if self.method == "fifo":
+            self.lots.append(Lot(quantity, cost, now))
+            if len(self.lots) > self.max_lots:
+                oldest, second = self.lots.popleft(), self.lots[0]
+                total = oldest.quantity + second.quantity
+                second.opened = (oldest.opened * oldest.quantity + second.opened * second.quantity) / total
+                second.quantity = total
+                second.cost += oldest.cost
+        if self.position + quantity > 0:
+            self._opened = (self._opened * self.position + now * quantity) / (self.position + quantity)
+        self.position += quantity
+        self.cost_basis += cost
+        self.buys += 1
+        self.fees += fee
+        self.volume += cost
+        entry = LedgerEntry(now, "BUY", price, quantity, cost, fee)
+        self.entries.append(entry)
+        if equity is not None:
+            self.mark(equity)
+        return entry
+
+    def sell(self, quantity: float, price: float, proceeds: float, fee: float = 0.0,
+             timestamp: Optional[float] = None, equity: Optional[float] = None) -> LedgerEntry:
+        """Close quantity (including any base-asset fee) for proceeds quote received (after quote fees)"""
+        now = self.clock.time() if timestamp is None else timestamp
+        matched = min(quantity, self.position)
+        if self.method == "fifo":
+            cost, held = self._consume_lots(matched, now)
+        elif self.position > 0:
+            cost = self.cost_basis * matched / self.position
+            held = (now - self._opened) * matched
+        else:
+            cost = held = 0.0
+        self.position -= matched
+        self.cost_basis = max(self.cost_basis - cost, 0.0)
+        if self.position <= DUST_QTY:
+            self.position = self.cost_basis = 0.0
+            self.lots.clear()
+        unmatched = quantity - matched
+        if unmatched > DUST_QTY:
+            # No known cost for these units: book them at the sale price
+            self.unmatched_quantity += unmatched
+            cost += proceeds * unmatched / quantity
+
+        realized = proceeds - cost
+        self.realized_pnl += realized
+        self.sells += 1
+        self.wins += realized > 0
+        self.fees += fee
+        self.volume += proceeds
+        self.sold_quantity += matched
+        self.held_seconds += held
+        entry = LedgerEntry(now, "SELL", price, quantity, proceeds, fee, realized, held / matched if matched else 0.0)
+        self.entries.append(entry)
+        if equity is not None:
+            self.mark(equity)
+        return entry
+
+    def _consume_lots(self, quantity: float, now: float):
+        """Take quantity from the oldest lots; (cost of what was taken, quantity * seconds held)"""
+        cost = held = 0.0
+        lots = self.lots
+        while quantity > DUST_QTY and lots:
+            lot = lots[0]
+            if lot.quantity <= quantity + DUST_QTY:
+                taken, taken_cost = lot.quantity, lot.cost
+                lots.popleft()
+            else:
+                taken = quantity
+                taken_cost = lot.cost * taken / lot.quantity
+                lot.quantity -= taken
+                lot.cost -= taken_cost
+            cost += taken_cost
+            held += (now - lot.opened) * taken
+            quantity -= taken
+        return cost, held
+
+    def seed(self, quantity: float, price: float, timestamp: Optional[float] = None):
+        """Start from an existing position (e.g. a state saved before the ledger existed)"""
+        if quantity > 0:
+            now = self.clock.time() if timestamp is None else timestamp
+            if self.method == "fifo":
+                self.lots.append(Lot(quantity, quantity * price, now))
+            self.position, self.cost_basis, self._opened = quantity, quantity * price, now
+
+    def mark(self, equity: float):
+        """Update the drawdown with the current portfolio value"""
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+        elif self.peak_equity > 0:
+            drawdown = 1 - equity / self.peak_equity
+            if drawdown > self.max_drawdown:
+                self.max_drawdown = drawdown
+
+    # === Statistics ===
+    @property
+    def average_cost(self) -> float:
+        return self.cost_basis / self.position if self.position > 0 else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.sells if self.sells else 0.0
+
+    @property
+    def average_holding(self) -> float:
+        """Average seconds a sold unit was held"""
+        return self.held_seconds / self.sold_quantity if self.sold_quantity > 0 else 0.0
+
+    def unrealized_pnl(self, price: float) -> float:
+        return self.position * price - self.cost_basis
+
+    # === Persistence ===
+    def to_dict(self) -> dict:
+        """Open lots and running totals (not the recent-trade buffer, which the trade log already has)"""
+        return {
+            "method": self.method,
+            "lots": [[lot.quantity, lot.cost, lot.opened] for lot in self.lots],
+            "position": self.position, "cost_basis": self.cost_basis, "opened": self._opened,
+            "realized_pnl": self.realized_pnl, "fees": self.fees, "volume": self.volume,
+            "buys": self.buys, "sells": self.sells, "wins": self.wins, "sold_quantity": self.sold_quantity,
+            "held_seconds": self.held_seconds, "unmatched_quantity": self.unmatched_quantity,
+            "peak_equity": self.peak_equity, "max_drawdown": self.max_drawdown,
+        }
+
+    def load(self, state: dict):
+        """Restore what to_dict() saved; lots saved under another cost method collapse into one position"""
+        self.lots = deque(Lot(*lot) for lot in state.get("lots", []))
+        self._opened = state.get("opened", 0.0)
+        for name in ("position", "cost_basis", "realized_pnl", "fees", "volume", "buys", "sells", "wins",
+                     "sold_quantity", "held_seconds", "unmatched_quantity", "peak_equity", "max_drawdown"):
+            if name in state:
+                setattr(self, name, state[name])
+        if self.method == "fifo" and not self.lots and self.position > 0:
+            self.lots.append(Lot(self.position, self.cost_basis, self._opened))
+        elif self.method == "average":
+            self.lots.clear()
+
+    # === Export ===
+    def rows(self) -> Iterator[list]:
+        for entry in self.entries:
+            yield entry.as_row()
+
+    def write_csv(self, path: str):
+        """Write the recent trades, oldest first"""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(LedgerEntry.__slots__)
+            writer.writerows(self.rows())
@@ -0,0 +1,43 @@
+"""
+User-data stream for the Asymmetric Grid Bot
+Delivers executionReport / outboundAccountPosition events so fills are pushed, not polled
+"""
+
+from typing import Callable, List, Optional
+
+from price_stream import ReconnectingStream, STREAM_URL
+
+LISTEN_KEY_KEEPALIVE = 30 * 60      # Binance expires listen keys after 60 minutes without a keepalive
+USER_EVENT_TYPES = ("executionReport", "outboundAccountPosition", "balanceUpdate")
+
+
+class UserDataStream(ReconnectingStream):
+    """Account events for the API key behind `client`"""
+    idle_interval = LISTEN_KEY_KEEPALIVE
+
+    def __init__(self, client, base_url: str = STREAM_URL,
+                 on_log: Optional[Callable[[str, str], None]] = None,
+                 initial_backoff: float = 1.0, max_backoff: float = 60.0):
+        super().__init__("user-data-stream", on_log, initial_backoff, max_backoff)
+        self.client = client
+        self.base_url = base_url.rstrip('/')
+        self.listen_key: Optional[str] = None
+
+    def _connect_url(self) -> str:
+        # A fresh listen key on every (re)connect; the old one may have expired
+        self.listen_key = self.client.stream_get_listen_key()
+        return f"{self.base_url}/{self.listen_key}"
+
+    def _on_idle(self):
+        try:
+            self.client.stream_keepalive(self.listen_key)
+        except Exception as e:
+            self._log("WARNING", f"Listen key keepalive failed: {e}")
+
+    def _on_message(self, message: dict):
+        if message.get('e') in USER_EVENT_TYPES:
+            self._publish(message)
+
+    def wait_for_events(self, timeout: float) -> List[dict]:
+        """Block until at least one event arrives; return all pending events in order ([] on timeout)"""
+        return self.wait(timeout)